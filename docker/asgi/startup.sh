@@ -0,0 +1,13 @@
+#!/bin/bash
+
+cd /geoapi/src/
+
+# Wait for the PostgreSQL database to be ready
+echo "Waiting for PostgreSQL to be ready..."
+until pg_isready -h postgis -p 5432 -d geoserver
+do
+  sleep 1
+done
+
+# Read-only async endpoints (ASGI) next to the Flask API
+exec poetry run python asgi.py
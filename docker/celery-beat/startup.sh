@@ -0,0 +1,6 @@
+#!/bin/bash
+
+cd /geoapi/src/
+
+# A single scheduler for every worker: it must not be scaled.
+poetry run celery -A api beat --loglevel=INFO --schedule=/tmp/celerybeat-schedule
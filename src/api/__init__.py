@@ -3,8 +3,10 @@ from flask_restx import Api
 
 from .geoserver.endpoints import namespace as geoserver_ns
 from .postgis.endpoints import namespace as postgis_ns
+from .query.endpoints import namespace as query_ns
 from .status.endpoints import namespace as status_ns
 from .styles.endpoints import namespace as styles_ns
+from .tiles.endpoints import namespace as tiles_ns
 
 blueprint = Blueprint("api", __name__)
 api = Api(blueprint)
@@ -13,3 +15,5 @@ api.add_namespace(status_ns, path="/status")
 api.add_namespace(geoserver_ns, path="/geoserver")
 api.add_namespace(styles_ns, path="/styles")
 api.add_namespace(postgis_ns, path="/postgis")
+api.add_namespace(tiles_ns, path="/tiles")
+api.add_namespace(query_ns, path="/query")
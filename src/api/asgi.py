@@ -0,0 +1,149 @@
+from sqlalchemy.exc import DatabaseError
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from api.query.core import collect_features
+from api.query.marshal import group_filters, query_features_parser
+from api.status.core import standard_response
+from api.status.marshal import page_parser
+from utils.async_postgis_interface import AsyncPostGIS
+
+postgis = AsyncPostGIS()
+
+
+def parse_query(request, parser) -> dict:
+    """
+    Analiza los parámetros de consulta de una solicitud ASGI con los argumentos de
+    un parser de Flask-RESTX, aplicando sus tipos, valores por defecto y opciones.
+
+    Args:
+        request (Request): Solicitud de Starlette.
+        parser (RequestParser): Parser de Flask-RESTX.
+
+    Returns:
+        dict: Diccionario de kwargs.
+
+    Raises:
+        ValueError: Si algún parámetro es inválido.
+
+    """
+    kwargs = {}
+    for arg in parser.args:
+        value = request.query_params.get(arg.name)
+        if value is None:
+            if arg.required:
+                raise ValueError(f"Missing required parameter '{arg.name}'.")
+            kwargs[arg.dest] = arg.default
+            continue
+        value = arg.type(value)
+        if arg.choices and value not in arg.choices:
+            raise ValueError(f"'{value}' is not a valid choice for '{arg.name}'.")
+        kwargs[arg.dest] = value
+    return kwargs
+
+
+def bad_request(message: str) -> JSONResponse:
+    return JSONResponse({"message": message}, status_code=400)
+
+
+async def process_status(request):
+    """
+    Obtiene el registro de estado de un proceso por su ID.
+    """
+    id = request.path_params["id"]
+    record = await postgis.run(lambda db: db.get_log_record(id=id))
+    return JSONResponse(
+        record
+        or standard_response(
+            id=id,
+            endpoint="status/process/status",
+            status=400,
+            message=f"Record '{id}' doesn't exist.",
+        )
+    )
+
+
+async def batch_status(request):
+    """
+    Obtiene el registro de estado de un batch por su ID.
+    """
+    id = request.path_params["id"]
+    record = await postgis.run(lambda db: db.get_batch_record(id=id))
+    return JSONResponse(
+        record
+        or standard_response(
+            id=id,
+            endpoint="status/batch/status",
+            status=400,
+            message=f"Batch '{id}' doesn't exist.",
+        )
+    )
+
+
+async def batch_geometries(request):
+    """
+    Obtiene una página de los IDs de geometrías de un batch.
+    """
+    id = request.path_params["id"]
+    try:
+        kwargs = parse_query(request, page_parser)
+    except ValueError as error:
+        return bad_request(str(error))
+    page = await postgis.run(lambda db: db.get_batch_geometries(id=id, **kwargs))
+    return JSONResponse(
+        page
+        or standard_response(
+            id=id,
+            endpoint="status/batch/geometries",
+            status=400,
+            message=f"Batch '{id}' doesn't exist.",
+        )
+    )
+
+
+async def layer_statistics(request):
+    """
+    Obtiene las estadísticas de una capa.
+    """
+    layer = request.path_params["layer"]
+    statistics = await postgis.run(lambda db: db.get_layer_statistics(layer=layer))
+    return JSONResponse(
+        statistics
+        or standard_response(
+            endpoint="status/layer/statistics",
+            layer=layer,
+            status=400,
+            message=f"Layer '{layer}' doesn't exist.",
+        )
+    )
+
+
+async def layer_features(request):
+    """
+    Obtiene una página de geometrías de una capa en formato GeoJSON.
+    """
+    layer = request.path_params["layer"]
+    try:
+        kwargs = group_filters(parse_query(request, query_features_parser))
+    except ValueError as error:
+        return bad_request(str(error))
+    try:
+        result = await postgis.run(
+            lambda db: collect_features(db, layer=layer, **kwargs)
+        )
+    except DatabaseError as error:
+        return bad_request(str(error.orig).strip())
+    if result is None:
+        return JSONResponse(
+            {"message": f"Layer '{layer}' doesn't exist."}, status_code=404
+        )
+    return JSONResponse(result)
+
+
+routes = [
+    Route("/status/record/{id:int}", process_status),
+    Route("/status/batch/{id:int}", batch_status),
+    Route("/status/batch/{id:int}/geometries", batch_geometries),
+    Route("/status/layer/{layer:str}", layer_statistics),
+    Route("/query/layer/{layer:str}/features", layer_features),
+]
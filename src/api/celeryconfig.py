@@ -1,3 +1,5 @@
+from celery.schedules import crontab
+
 from utils.config import settings
 
 task_serializer = "json"
@@ -10,4 +12,30 @@ broker_transport_options = {"visibility_timeout": 3600 * 6}
 imports = (
     "api.geoserver.tasks",
     "api.postgis.tasks",
+    "api.status.tasks",
+    "api.styles.tasks",
+    "api.tiles.tasks",
 )
+
+beat_schedule = {
+    "maintain-log-partitions": {
+        "task": "api.status.tasks.task_maintain_log_partitions",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "compact-layer-statistics": {
+        "task": "api.status.tasks.task_compact_layer_statistics",
+        "schedule": crontab(minute="*/10"),
+    },
+    "sweep-publish-queue": {
+        "task": "api.geoserver.tasks.task_sweep_publish_queue",
+        "schedule": crontab(minute="*/5"),
+    },
+    "reconcile-layers": {
+        "task": "api.geoserver.tasks.task_reconcile_layers",
+        "schedule": crontab(minute="*/15"),
+    },
+    "prune-tiles": {
+        "task": "api.tiles.tasks.task_prune_tiles",
+        "schedule": crontab(minute=30),
+    },
+}
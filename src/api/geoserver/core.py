@@ -1,31 +1,106 @@
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from werkzeug.datastructures import FileStorage
-from werkzeug.exceptions import Conflict
+from werkzeug.exceptions import BadGateway, Conflict
 
 from api.logger import Logger, core_exception_logger
-from api.utils import generate_batch
+from api.tiles.core import dirty_extents, invalidate_tiles, truncate_gwc
+from api.utils import bulk_errors, generate_batch
 from models.tables import Layers
+from utils.async_geoserver_interface import AsyncGeoserver
+from utils.config import settings
 from utils.geoserver_interface import Geoserver
 from utils.postgis_interface import PostGIS
 
 geoserver = Geoserver()
+async_geoserver = AsyncGeoserver()
+
+RECONCILIATION_ENDPOINT = "geoserver/reconciliation"
+
+# Demora de la publicación en Geoserver de los batches agregados a una capa, desde el
+# último agregado y desde el primero pendiente; 0 publica cada agregado de inmediato.
+PUBLISH_DELAY = float(getattr(settings, "GEOSERVER_PUBLISH_DELAY", 5))
+PUBLISH_MAX_DELAY = float(getattr(settings, "GEOSERVER_PUBLISH_MAX_DELAY", 60))
+
+
+def layer_registry(layer: str) -> dict:
+    """
+    Obtiene el estado de una capa desde el registro de capas. Si su estado de
+    publicación aún no se conoce (capas previas al registro, hasta la primera
+    conciliación), lo consulta en Geoserver.
+    """
+    registry = PostGIS().get_layer_registry(layer) or {
+        "in_postgis": False,
+        "published": False,
+    }
+    if registry["published"] is None:
+        registry["published"] = layer in geoserver.list_layers()
+    return registry
 
 
 def verify_layer_exists(layer: str):
-    if layer not in geoserver.list_layers():
+    registry = layer_registry(layer)
+    if not registry["published"]:
         raise Conflict(f"Layer {layer} doesn't exist on Geoserver.")
-    with PostGIS() as postgis:
-        if layer not in postgis.list_layers():
-            raise Conflict(f"Layer {layer} doesn't exist on Postgis.")
+    if not registry["in_postgis"]:
+        raise Conflict(f"Layer {layer} doesn't exist on Postgis.")
 
 
 def verify_layer_not_exists(layer: str):
-    if layer in geoserver.list_layers():
+    registry = layer_registry(layer)
+    if registry["published"]:
         raise Conflict(f"Layer '{layer}' already exists on Geoserver.")
+    if registry["in_postgis"]:
+        raise Conflict(f"Layer '{layer}' already exists on Postgis.")
+
+
+def publish_layer(
+    layer: str,
+    batches: Optional[List[int]] = None,
+    logger: Optional[Logger] = None,
+    **kwargs,
+) -> Optional[float]:
+    """
+    Actualiza en Geoserver la extensión de una capa luego de agregarle batches, y
+    trunca en GeoWebCache las teselas que cubren esos batches.
+
+    Sin `batches`, publica juntas las solicitudes pendientes de la capa (ver
+    `PostGIS.request_publish`), si ya se cumplió su demora. Si la actualización
+    falla, las solicitudes vuelven a quedar pendientes.
+
+    Args:
+        layer (str): Nombre de la capa.
+        batches (Optional[List[int]]): IDs de los batches agregados (por defecto: las
+            solicitudes pendientes).
+        log (Logs): Objeto Logs existente para mantener un registro de las operaciones (opcional).
+
+    Returns:
+        Optional[float]: Segundos restantes hasta la publicación de las solicitudes
+            pendientes, si aún no se cumplió su demora.
+
+    """
+    queued = batches is None
     with PostGIS() as postgis:
-        if layer in postgis.list_layers():
-            raise Conflict(f"Layer '{layer}' already exists on Postgis.")
+        if queued:
+            batches, due_in = postgis.claim_publish(layer)
+            if batches is None:
+                return due_in
+        # Consulta bbox de la layer desde sus estadísticas.
+        bbox = (postgis.get_layer_statistics(layer) or {}).get("bbox") or {}
+        extents = dirty_extents(postgis, batches=batches, logger=logger)
+        # Actualiza la extensión de la capa en Geoserver, conservando estilo y caché.
+        try:
+            geoserver.update_layer(layer=layer, **bbox)
+        except Exception:
+            if queued:
+                postgis.request_publish(layer, batches, delay=0, max_delay=0)
+            raise
+        postgis.register_layer(layer, published=True, **bbox)
+    if logger:
+        logger.message_append("Geoserver layer updated.")
+    # Trunca en GeoWebCache solo las teselas que cubren los nuevos batches.
+    truncate_gwc(extents, logger=logger)
+    return None
 
 
 @core_exception_logger
@@ -102,6 +177,9 @@ def kml_to_create_layer(
         )
         new_layer.batches.append(new_batch)
         postgis.session.add(new_layer)
+        postgis.session.flush()
+        # Genera versiones generalizadas de las geometrías.
+        postgis.generalize_batches(new_batch.id)
         # Genera View.
         postgis.create_view(layer)
         # Consulta bbox de la layer.
@@ -118,6 +196,8 @@ def kml_to_create_layer(
         layer=layer,
         **bbox,
     )
+    with PostGIS() as postgis:
+        postgis.register_layer(layer, published=True, **bbox)
     if logger:
         logger.message_append("Geoserver layer created.")
 
@@ -142,7 +222,7 @@ def kml_to_append_layer(
     error_handle: Optional[str] = "skip",
     logger: Optional[Logger] = None,
     **kwargs,
-) -> None:
+) -> Optional[float]:
     """
     Agrega datos de un archivo KML a una capa existente en GeoServer y los ingresa en la base de datos de PostGIS.
 
@@ -167,7 +247,9 @@ def kml_to_append_layer(
         log (Logs): Objeto Logs existente para mantener un registro de las operaciones (opcional).
 
     Returns:
-        None
+        Optional[float]: Segundos hasta la publicación en Geoserver, si hay que
+            programarla (ver `publish_layer`); o None si ya está programada o se
+            publicó de inmediato (GEOSERVER_PUBLISH_DELAY=0).
 
     """
     with PostGIS() as postgis:
@@ -193,24 +275,31 @@ def kml_to_append_layer(
         )
         append_layer.batches.append(new_batch)
         postgis.session.add(append_layer)
-        # Consulta bbox de la layer.
-        bbox = postgis.bbox(layer)
+        postgis.session.flush()
+        # Genera versiones generalizadas de las geometrías.
+        postgis.generalize_batches(new_batch.id)
+        # Actualiza View con los niveles de generalización vigentes.
+        postgis.create_view(layer, if_exists="replace")
         batch_id = new_batch.id
     # Fin de operaciones en DB.
+    invalidate_tiles(layer)
     if logger:
         logger.keep_track(
             batch_id=batch_id,
             message_append="PostGIS KML ingested. PostGIS view updated.",
         )
-    geoserver.delete_layer(
-        layer=layer,
-    )
-    geoserver.push_layer(
-        layer=layer,
-        **bbox,
-    )
+    if not PUBLISH_DELAY:
+        publish_layer(layer=layer, batches=[batch_id], logger=logger)
+        return None
+    # Encola la publicación, para que varios agregados seguidos a la misma capa se
+    # publiquen en Geoserver una sola vez (ver publish_layer).
+    with PostGIS() as postgis:
+        due_in = postgis.request_publish(
+            layer, [batch_id], delay=PUBLISH_DELAY, max_delay=PUBLISH_MAX_DELAY
+        )
     if logger:
-        logger.message_append("Geoserver layer updated.")
+        logger.message_append("Geoserver layer update queued.")
+    return due_in
 
 
 @core_exception_logger
@@ -246,15 +335,212 @@ def delete_layer(
             layer=layer, if_not_exists=error_handle, cascade=delete_geometries
         )
     # Fin de operaciones en DB.
+    invalidate_tiles(layer)
     if logger:
         logger.keep_track(
-            message_append="View deleted." + "Geometries deleted."
-            if delete_geometries
-            else "",
+            message_append=(
+                "View deleted." + "Geometries deleted." if delete_geometries else ""
+            ),
         )
     geoserver.delete_layer(layer=layer, if_not_exists=error_handle)
+    with PostGIS() as postgis:
+        postgis.register_layer(
+            layer,
+            published=False,
+            style=None,
+            minx=None,
+            miny=None,
+            maxx=None,
+            maxy=None,
+        )
     if logger:
         logger.keep_track(
             message_append="Geoserver layer deleted. "
             + f"Postgis layer {'and geometries ' if delete_geometries else ''}deleted.",
         )
+
+
+@core_exception_logger
+def republish_layers(
+    layers: Optional[List[str]] = None,
+    json: Optional[dict] = None,
+    logger: Optional[Logger] = None,
+    **kwargs,
+) -> None:
+    """
+    Republica en GeoServer una serie de capas de PostGIS, en forma concurrente.
+
+    Cada capa se actualiza en el lugar con la extensión de sus estadísticas (ver
+    `Geoserver.update_layer`), conservando su estilo, y se vuelve a crear si ya no
+    existe en GeoServer (ej: luego de un cambio de datastore).
+
+    Args:
+        layers (Optional[List[str]]): Nombres de las capas (por defecto: todas las
+            capas de PostGIS).
+        json (Optional[dict]): JSON asociado a la operación (opcional).
+        log (Logs): Objeto Logs existente para mantener un registro de las operaciones (opcional).
+
+    Raises:
+        BadGateway: Si falló la publicación de alguna capa.
+
+    Returns:
+        None
+
+    """
+    with PostGIS() as postgis:
+        layers = layers or postgis.list_layers()
+        bboxes = {
+            layer: (postgis.get_layer_statistics(layer) or {}).get("bbox") or {}
+            for layer in layers
+        }
+    results = async_geoserver.bulk(
+        lambda: [
+            async_geoserver.update_layer(layer=layer, **bboxes[layer])
+            for layer in layers
+        ]
+    )
+    errors = bulk_errors(layers, results)
+    with PostGIS() as postgis:
+        for layer in layers:
+            if layer not in errors:
+                postgis.register_layer(layer, published=True, **bboxes[layer])
+    if logger:
+        logger.keep_track(
+            message_append=f"{len(layers) - len(errors)} Geoserver layers republished."
+        )
+    if errors:
+        raise BadGateway(
+            "Geoserver layers failed: "
+            + ", ".join(f"{layer} ({error})" for layer, error in errors.items())
+        )
+
+
+@core_exception_logger
+def reconcile_layers(
+    fix: bool = getattr(settings, "RECONCILE_FIX", False),
+    json: Optional[dict] = None,
+    logger: Optional[Logger] = None,
+    **kwargs,
+) -> dict:
+    """
+    Concilia las capas de PostGIS con las publicadas en GeoServer.
+
+    Obtiene en una sola pasada los listados de capas, vistas y capas publicadas, y
+    clasifica las diferencias:
+
+    - "missing_views": capas con geometrías y sin vista.
+    - "unpublished": capas con vista que no están publicadas en GeoServer.
+    - "orphan_featuretypes": featureTypes del datastore cuya tabla o vista nativa
+      (`nativeName`) no existe en PostGIS.
+    - "custom_layers": featureTypes del datastore publicados con otro nombre que su
+      vista nativa (ej: `view_push_to_layer`).
+    - "foreign_layers": capas del espacio de trabajo de otros almacenes.
+    - "orphan_views": vistas sin capa en PostGIS ni en GeoServer.
+    - "empty_layers": capas sin geometrías ni vista.
+
+    Con `fix`, crea las vistas faltantes, publica las capas no publicadas y elimina
+    de GeoServer los featureTypes huérfanos, en forma concurrente. El resto de las
+    diferencias solo se informan, ya que pueden ser intencionales. Por último,
+    concilia el registro de capas con el resultado (ver
+    `PostGIS.reconcile_layer_registry`).
+
+    Args:
+        fix (bool): Corrige las diferencias (por defecto: RECONCILE_FIX o False).
+        json (Optional[dict]): JSON asociado a la operación (opcional).
+        log (Logs): Objeto Logs existente para mantener un registro de las operaciones (opcional).
+
+    Raises:
+        BadGateway: Si falló la verificación o la corrección de alguna capa en
+            GeoServer.
+
+    Returns:
+        dict: Informe de la conciliación.
+
+    """
+    with PostGIS() as postgis:
+        started_at = postgis.clock_timestamp()
+        published = set(geoserver.fetch_layers())
+        featuretypes = set(geoserver.fetch_featuretypes())
+        features = postgis.layer_features()
+        views = set(postgis.list_views())
+        layers = set(features)
+        missing_views = {layer for layer in layers - views if features[layer]}
+        unpublished = ((views & layers) | missing_views) - published
+        # Las capas sin vista del mismo nombre solo son huérfanas si pertenecen al
+        # datastore y su tabla o vista nativa tampoco existe.
+        candidates = sorted((published - views - missing_views) & featuretypes)
+        definitions = async_geoserver.bulk(
+            lambda: [
+                async_geoserver.get_featuretype(layer=layer) for layer in candidates
+            ]
+        )
+        errors = bulk_errors(candidates, definitions)
+        natives = {
+            layer: definition.get("nativeName") or layer
+            for layer, definition in zip(candidates, definitions)
+            if layer not in errors
+        }
+        report = {
+            "missing_views": sorted(missing_views),
+            "unpublished": sorted(unpublished),
+            "orphan_featuretypes": sorted(
+                layer for layer, native in natives.items() if native not in views
+            ),
+            "custom_layers": sorted(
+                layer for layer, native in natives.items() if native in views
+            ),
+            "foreign_layers": sorted(published - views - missing_views - featuretypes),
+            "orphan_views": sorted(views - layers - published - set(natives.values())),
+            "empty_layers": sorted(layers - views - missing_views),
+            "fixed": bool(fix),
+            "errors": errors,
+        }
+        if fix:
+            for layer in report["missing_views"]:
+                postgis.create_view(layer=layer)
+            bboxes = {
+                layer: (postgis.get_layer_statistics(layer) or {}).get("bbox") or {}
+                for layer in report["unpublished"]
+            }
+            names = report["unpublished"] + report["orphan_featuretypes"]
+            results = async_geoserver.bulk(
+                lambda: [
+                    async_geoserver.update_layer(layer=layer, **bboxes[layer])
+                    for layer in report["unpublished"]
+                ]
+                + [
+                    async_geoserver.delete_layer(layer=layer, if_not_exists="ignore")
+                    for layer in report["orphan_featuretypes"]
+                ]
+            )
+            fix_errors = bulk_errors(names, results)
+            report["errors"].update(fix_errors)
+            for layer in report["unpublished"]:
+                if layer not in fix_errors:
+                    published.add(layer)
+                    postgis.register_layer(layer, published=True, **bboxes[layer])
+            for layer in report["orphan_featuretypes"]:
+                if layer not in fix_errors:
+                    published.discard(layer)
+        report["registry"] = postgis.reconcile_layer_registry(
+            sorted(published), started_at
+        )
+    report["counts"] = {
+        key: len(value) for key, value in report.items() if isinstance(value, list)
+    }
+    if logger:
+        logger.keep_track(
+            json={**(json or {}), "report": report},
+            message_append=", ".join(
+                f"{count} {key.replace('_', ' ')}"
+                for key, count in report["counts"].items()
+            ),
+        )
+    if report["errors"]:
+        raise BadGateway(
+            "Geoserver layers failed: "
+            + ", ".join(
+                f"{layer} ({error})" for layer, error in report["errors"].items()
+            )
+        )
+    return report
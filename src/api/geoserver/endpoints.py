@@ -1,8 +1,10 @@
 from api.logger import EndpointServer, Logger, debug_metadata
-from api.utils import temp_remove, temp_store
+from api.utils import is_true, parse_bulk_kwargs, temp_remove, temp_store
+from utils.postgis_interface import PostGIS
 
 from . import namespace
 from .core import (  # get_log_response,; temp_remove,; temp_store,
+    RECONCILIATION_ENDPOINT,
     verify_layer_exists,
     verify_layer_not_exists,
 )
@@ -10,9 +12,17 @@ from .marshal import (
     delete_layer_parser,
     download_kml_parser,
     parse_kwargs,
+    reconcile_layers_parser,
+    republish_layers_parser,
     upload_kml_parser,
 )
-from .tasks import task_delete_layer, task_kml_to_append_layer, task_kml_to_create_layer
+from .tasks import (
+    task_delete_layer,
+    task_kml_to_append_layer,
+    task_kml_to_create_layer,
+    task_reconcile_layers,
+    task_republish_layers,
+)
 
 
 @namespace.route("/kml/form/create")
@@ -280,3 +290,85 @@ class DeleteLayer(EndpointServer):
         with Logger(**self.job_received(**kwargs)) as logger:
             task_delete_layer.delay(**kwargs, log_id=logger.log.id)
             return logger.log_response()
+
+
+@namespace.route("/layer/form/republish")
+class RepublishLayers(EndpointServer):
+    """
+    Republicación masiva de capas.
+
+    Republica en GeoServer, en forma concurrente, una serie de capas de PostGIS.
+    """
+
+    @namespace.doc("Bulk layer republish.")
+    @namespace.expect(republish_layers_parser, validate=True)
+    def put(self):
+        """
+        Republica en GeoServer una serie de capas, conservando sus estilos.
+
+        ---
+        ### parameters:
+          - __layers__: Nombres de las capas separados por comas (por defecto: todas las capas de PostGIS).
+          - __metadata__: Metadatos.
+        ---
+        ### responses:
+          - __200__: Republicación iniciada. (OK)
+          - __400__: Datos de solicitud inválidos. (Solicitud incorrecta)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+
+        """
+        kwargs = parse_bulk_kwargs(republish_layers_parser)
+        with Logger(**self.job_received(**kwargs)) as logger:
+            task_republish_layers.delay(**kwargs, log_id=logger.log.id)
+            return logger.log_response()
+
+
+@namespace.route("/reconciliation")
+class Reconciliation(EndpointServer):
+    """
+    Conciliación de capas entre PostGIS y GeoServer.
+
+    Consulta el último informe de conciliación o inicia una nueva conciliación.
+    """
+
+    @namespace.doc("Last reconciliation report.")
+    def get(self):
+        """
+        Obtiene el registro de la última conciliación finalizada, con el informe en su
+        metadata.
+
+        ---
+        ### responses:
+          - __200__: Registro obtenido correctamente. (OK)
+          - __404__: Aún no hay conciliaciones finalizadas. (No encontrado)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+
+        """
+        with PostGIS() as postgis:
+            record = postgis.get_last_log_record(endpoint=RECONCILIATION_ENDPOINT)
+        return record or ({"message": "No reconciliation report yet."}, 404)
+
+    @namespace.doc("Layer reconciliation.")
+    @namespace.expect(reconcile_layers_parser, validate=True)
+    def put(self):
+        """
+        Inicia una conciliación de capas entre PostGIS y GeoServer.
+
+        ---
+        ### parameters:
+          - __fix__: Corrige las diferencias además de informarlas (por defecto: false).
+          - __metadata__: Metadatos.
+        ---
+        ### responses:
+          - __200__: Conciliación iniciada. (OK)
+          - __400__: Datos de solicitud inválidos. (Solicitud incorrecta)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+
+        """
+        kwargs = parse_bulk_kwargs(reconcile_layers_parser)
+        kwargs["fix"] = is_true(kwargs["fix"])
+        with Logger(
+            **{**self.job_received(**kwargs), "endpoint": RECONCILIATION_ENDPOINT}
+        ) as logger:
+            task_reconcile_layers.delay(**kwargs, log_id=logger.log.id)
+            return logger.log_response()
@@ -9,6 +9,7 @@ from api.utils import (
     form_maker,
     is_true,
     kml_read_error_handle,
+    name_list,
 )
 from utils.general import clean_nones
 
@@ -110,3 +111,33 @@ delete_layer_parser = form_maker(
     base_arguments["metadata"],
     layer_error_handle,
 )
+
+republish_layers = reqparse.Argument(
+    "layers",
+    dest="layers",
+    location="form",
+    type=name_list,
+    required=False,
+    help="Comma separated list of layers to republish (default: all).",
+)
+
+republish_layers_parser = form_maker(
+    republish_layers,
+    base_arguments["metadata"],
+)
+
+reconcile_fix = reqparse.Argument(
+    "fix",
+    dest="fix",
+    location="form",
+    type=str,
+    required=False,
+    default="false",
+    choices=["true", "false"],
+    help="Fix the differences besides reporting them.",
+)
+
+reconcile_layers_parser = form_maker(
+    reconcile_fix,
+    base_arguments["metadata"],
+)
@@ -1,9 +1,19 @@
 from api.celery import app
 from api.logger import Logger
 from api.utils import temp_remove
+from utils.postgis_interface import PostGIS
 
 from .core import kml_to_append_layer  # get_log,; temp_remove,
-from .core import delete_layer, kml_to_create_layer
+from .core import (
+    PUBLISH_DELAY,
+    PUBLISH_MAX_DELAY,
+    RECONCILIATION_ENDPOINT,
+    delete_layer,
+    kml_to_create_layer,
+    publish_layer,
+    reconcile_layers,
+    republish_layers,
+)
 
 # Log status codes pueden ser abstraidos a un archivo de configuración. [Lea]
 
@@ -26,7 +36,7 @@ def task_kml_to_create_layer(*args, **kwargs):
     Returns:
         None
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         kml_to_create_layer(*args, **kwargs, logger=logger)
         temp_remove(kwargs["file"])
@@ -52,14 +62,64 @@ def task_kml_to_append_layer(*args, **kwargs):
     Returns:
         None
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
-        kml_to_append_layer(*args, **kwargs, logger=logger)
+        due_in = kml_to_append_layer(*args, **kwargs, logger=logger)
         temp_remove(kwargs["file"])
+        if due_in is not None:
+            task_publish_layer.apply_async(
+                kwargs={"layer": kwargs["layer"]}, countdown=due_in
+            )
         if logger.log.status == 205:
             logger.keep_track(message_append="Success", status=210)
 
 
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_publish_layer(self, *args, **kwargs):
+    """
+    Tarea asincrónica para publicar en Geoserver los batches agregados a una capa.
+
+    Se programa al agregar batches a una capa (ver `PostGIS.request_publish`), por lo
+    que varios agregados seguidos comparten una única actualización de la capa. Si la
+    demora de las solicitudes pendientes se extendió por un agregado posterior, se
+    vuelve a programar para ese momento. Si falla, se reintenta luego de
+    GEOSERVER_PUBLISH_DELAY segundos.
+
+    Args:
+        *args: Argumentos posicionales no especificados.
+        **kwargs: Argumentos clave que deben incluir "layer".
+
+    Returns:
+        None
+    """
+    try:
+        due_in = publish_layer(*args, **kwargs)
+    except Exception as error:
+        raise self.retry(exc=error, countdown=PUBLISH_DELAY)
+    if due_in is not None:
+        task_publish_layer.apply_async(kwargs=kwargs, countdown=due_in)
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_sweep_publish_queue(*args, **kwargs):
+    """
+    Tarea periódica que vuelve a programar las publicaciones pendientes vencidas.
+
+    Una publicación queda pendiente sin tarea programada si su tarea se perdió (ej:
+    un worker que se detuvo) o agotó sus reintentos. Se consideran vencidas las
+    solicitudes que superaron su demora por más de GEOSERVER_PUBLISH_MAX_DELAY
+    segundos, para no duplicar las tareas en curso.
+
+    Returns:
+        List[str]: Capas cuya publicación se volvió a programar.
+    """
+    with PostGIS() as postgis:
+        layers = postgis.list_overdue_publishes(overdue=PUBLISH_MAX_DELAY)
+    for layer in layers:
+        task_publish_layer.apply_async(kwargs={"layer": layer})
+    return layers
+
+
 @app.task(bind=True, max_retries=3, retry_backoff=1)
 def task_delete_layer(*args, **kwargs):
     """
@@ -78,8 +138,67 @@ def task_delete_layer(*args, **kwargs):
     Returns:
         None
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         delete_layer(*args, **kwargs, logger=logger)
         if logger.log.status == 205:
             logger.keep_track(message_append="Success", status=210)
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_republish_layers(*args, **kwargs):
+    """
+    Tarea asincrónica para republicar capas en GeoServer.
+
+    Esta tarea republica en forma concurrente una serie de capas (o todas las capas de
+    PostGIS) y actualiza el estado del registro de registro. Si el estado del registro
+    está en 205 (procesamiento), lo actualiza a 210 (éxito) una vez que se completa
+    la tarea.
+
+    Args:
+        *args: Argumentos posicionales no especificados.
+        **kwargs: Argumentos clave que deben incluir "log_id" y otros necesarios para
+            la función republish_layers.
+
+    Returns:
+        None
+    """
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
+        logger.keep_track(message="Processing.", status=205)
+        republish_layers(*args, **kwargs, logger=logger)
+        if logger.log.status == 205:
+            logger.keep_track(message_append="Success", status=210)
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_reconcile_layers(*args, **kwargs):
+    """
+    Tarea asincrónica de conciliación de capas entre PostGIS y GeoServer.
+
+    Se ejecuta periódicamente (ver celeryconfig) o a pedido desde el endpoint de
+    conciliación. Las ejecuciones periódicas no tienen un log previo, por lo que lo
+    crean al iniciar. El informe queda en la metadata del log.
+
+    Args:
+        *args: Argumentos posicionales no especificados.
+        **kwargs: Argumentos clave para la función reconcile_layers, y "log_id" si la
+            ejecución fue solicitada desde el endpoint.
+
+    Returns:
+        None
+    """
+    log = (
+        {"log_id": kwargs["log_id"]}
+        if "log_id" in kwargs
+        else {
+            "endpoint": RECONCILIATION_ENDPOINT,
+            "status": 200,
+            "message": "Received.",
+            "json": {},
+        }
+    )
+    with Logger(**log, buffered=True) as logger:
+        logger.keep_track(message="Processing.", status=205)
+        reconcile_layers(*args, **kwargs, logger=logger)
+        if logger.log.status == 205:
+            logger.keep_track(message_append="Success", status=210)
@@ -1,11 +1,13 @@
 import json
 import os
+import time
 from typing import Tuple, Union
 
 from flask_restx import Resource
 from werkzeug.exceptions import BadGateway, Conflict
 
 from models.tables import Logs
+from utils.config import settings
 from utils.general import clean_nones
 from utils.postgis_interface import PostGIS
 
@@ -29,8 +31,34 @@ class EndpointServer(Resource):
 
 
 class Logger(PostGIS):
-    def __init__(self, *args, **kwargs):
+    """
+    Registro de seguimiento de un proceso en la tabla de logs.
+
+    En modo `buffered`, los cambios de mensaje se acumulan en memoria y se escriben en
+    un único UPDATE cuando cambia el estado, cuando pasaron `flush_interval` segundos
+    desde la última escritura o al cerrar el contexto. Los cambios de estado se
+    escriben siempre de inmediato, por lo que la progresión observada en
+    `/status/record/<id>` es la misma que sin buffer.
+
+    Args:
+        buffered (bool): Activa la escritura diferida (por defecto: False).
+        flush_interval (float): Segundos máximos entre escrituras en modo `buffered`
+            (por defecto: LOGGER_FLUSH_INTERVAL o 5).
+        **kwargs: Valores iniciales del log, o `log_id` de un log existente.
+
+    """
+
+    def __init__(
+        self,
+        *args,
+        buffered: bool = False,
+        flush_interval: float = float(getattr(settings, "LOGGER_FLUSH_INTERVAL", 5)),
+        **kwargs,
+    ):
         super().__init__()
+        self._buffered = buffered
+        self._flush_interval = flush_interval
+        self._flushed_at = time.monotonic()
         self._log = (
             self.get_log(id=kwargs["log_id"])
             if isinstance(kwargs.get("log_id"), int)
@@ -59,10 +87,27 @@ class Logger(PostGIS):
             Logs: El registro actualizado en la base de datos.
 
         """
+        transition = "status" in kwargs and kwargs["status"] != self.log.status
         self.log.update(**kwargs)
         if "message_append" in kwargs:
             self.message_append(append=kwargs["message_append"])
+        if (
+            not self._buffered
+            or transition
+            or time.monotonic() - self._flushed_at >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """
+        Escribe en la base de datos los cambios pendientes del log.
+
+        Returns:
+            None: No se retorna ningún valor.
+
+        """
         self.session.commit()
+        self._flushed_at = time.monotonic()
 
     def message_append(self, append: str):
         """
@@ -80,7 +125,21 @@ class Logger(PostGIS):
             if self.log.message
             else append.strip(".") + "."
         )
-        self.session.commit()
+        if not self._buffered:
+            self.flush()
+
+    def progress_deleted(self, deleted: int):
+        """
+        Informa en el registro del log el avance de una eliminación por fragmentos.
+
+        Args:
+            deleted (int): Cantidad de geometrías eliminadas hasta el momento.
+
+        Returns:
+            None: No se retorna ningún valor.
+
+        """
+        self.keep_track(message=f"Processing. {deleted} geometries deleted so far.")
 
     def log_response(self) -> Tuple[dict, int]:
         """
@@ -155,9 +214,11 @@ def debug_metadata(**kwargs) -> dict:
     """
     return clean_nones(
         {
-            key: value
-            if key not in ["file"]
-            else str([os.path.basename(element) for element in value])
+            key: (
+                value
+                if key not in ["file"]
+                else str([os.path.basename(element) for element in value])
+            )
             for key, value in kwargs.items()
             if key not in ["logger"]
         }
@@ -1,8 +1,10 @@
-from typing import List, Optional, Union
+from typing import Generator, List, Optional, Union
+from xml.sax.saxutils import escape
 
 from werkzeug.datastructures import FileStorage
 
 from api.logger import Logger, core_exception_logger
+from api.tiles.core import dirty_extents, invalidate_tiles, truncate_gwc
 from api.utils import generate_batch
 from utils.geoserver_interface import Geoserver
 from utils.postgis_interface import PostGIS
@@ -76,6 +78,7 @@ def kml_to_create_batch(
         )
         postgis.session.add(new_batch)
         postgis.session.flush()
+        postgis.generalize_batches(new_batch.id)
         batch_id = new_batch.id
     # Fin de operaciones en DB.
     if logger:
@@ -108,7 +111,9 @@ def view_push_to_layer(
     with PostGIS() as postgis:
         new_layer = postgis.get_or_create_layer(name=layer)
         postgis.session.add(new_layer)
+        bbox = postgis.bbox(view)
     # Fin de operaciones en DB.
+    invalidate_tiles(layer)
     if logger:
         logger.keep_track(
             message_append="View created.",
@@ -117,8 +122,10 @@ def view_push_to_layer(
         layer=layer,
         view=view,
         if_exists=error_handle,
-        **postgis.bbox(view),
+        **bbox,
     )
+    with PostGIS() as postgis:
+        postgis.register_layer(layer, published=True, **bbox)
     if logger:
         logger.keep_track(
             message_append="Geoserver layer created.",
@@ -147,9 +154,17 @@ def delete_geometries(
 
     """
     with PostGIS() as postgis:
-        count = postgis.drop_geometries(ids)
+        layers = postgis.list_geometry_layers(ids)
+        extents = dirty_extents(postgis, geometries=ids, logger=logger)
+        count = postgis.drop_geometries(
+            ids,
+            on_progress=logger.progress_deleted if logger else None,
+        )
+    invalidate_tiles(layers)
+    truncate_gwc(extents, logger=logger)
     if logger:
         logger.keep_track(
+            message="Processing.",
             message_append=f"Postgis deleted {count} geometries.",
         )
 
@@ -178,8 +193,125 @@ def delete_batches(
 
     """
     with PostGIS() as postgis:
-        count = postgis.drop_batches(ids, cascade=cascade)
+        layers = postgis.list_batch_layers(ids)
+        extents = dirty_extents(postgis, batches=ids, logger=logger)
+        count = postgis.drop_batches(
+            ids,
+            cascade=cascade,
+            on_progress=logger.progress_deleted if logger else None,
+        )
+    invalidate_tiles(layers)
+    truncate_gwc(extents, logger=logger)
     if logger:
         logger.keep_track(
+            message="Processing.",
             message_append=f"Postgis deleted {count} geometries.",
         )
+
+
+def view_exists(layer: str) -> bool:
+    """
+    Verifica si existe en PostGIS la vista de una capa.
+
+    Args:
+    - layer (str): Nombre de la capa.
+
+    Returns:
+    - bool: True si la vista existe, False en caso contrario.
+
+    """
+    with PostGIS() as postgis:
+        return layer in postgis.list_views()
+
+
+def export_layer_geojson(layer: str) -> Generator[str, None, None]:
+    """
+    Exporta las geometrías de una capa como un FeatureCollection GeoJSON.
+
+    Las features se arman en PostGIS con `ST_AsGeoJSON` y se recorren con un
+    cursor del lado del servidor, por lo que el contenido se entrega en fragmentos
+    sin cargar la capa completa en memoria.
+
+    Args:
+    - layer (str): Nombre de la capa (vista) a exportar.
+
+    Yields:
+    - str: Fragmentos del documento GeoJSON.
+
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+    separator = ""
+    with PostGIS() as postgis:
+        properties = ", ".join(
+            "'{}', view.\"{}\"".format(column.replace("'", "''"), column)
+            for column in postgis.list_view_columns(layer, geometries=False)
+        )
+        for chunk in postgis.stream_view(
+            layer,
+            columns="json_build_object("
+            "'type', 'Feature', "
+            "'geometry', ST_AsGeoJSON(view.geometry)::json, "
+            f"'properties', json_build_object({properties})"
+            ")::text AS feature",
+        ):
+            yield separator + ",".join(row.feature for row in chunk)
+            separator = ","
+    yield "]}"
+
+
+def export_layer_kml(layer: str) -> Generator[str, None, None]:
+    """
+    Exporta las geometrías de una capa como un documento KML.
+
+    Cada fila de la vista se convierte en un Placemark, con la geometría generada
+    en PostGIS con `ST_AsKML` y el resto de los atributos como ExtendedData. Las
+    filas se recorren con un cursor del lado del servidor.
+
+    Args:
+    - layer (str): Nombre de la capa (vista) a exportar.
+
+    Yields:
+    - str: Fragmentos del documento KML.
+
+    """
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<kml xmlns="http://www.opengis.net/kml/2.2">'
+        f"<Document><name>{escape(layer)}</name>"
+    )
+    with PostGIS() as postgis:
+        attributes = "".join(
+            f'view."{column}", '
+            for column in postgis.list_view_columns(layer, geometries=False)
+        )
+        for chunk in postgis.stream_view(
+            layer, columns=f"{attributes}ST_AsKML(view.geometry) AS kml"
+        ):
+            yield "".join(kml_placemark(row._mapping) for row in chunk)
+    yield "</Document></kml>"
+
+
+def kml_placemark(row: dict) -> str:
+    """
+    Arma un Placemark KML a partir de una fila de una vista de capa.
+
+    Args:
+    - row (dict): Fila de la vista, con la geometría ya convertida en la columna `kml`.
+
+    Returns:
+    - str: Placemark KML.
+
+    """
+    extended_data = "".join(
+        f'<Data name="{escape(str(key))}"><value>{escape(str(value))}</value></Data>'
+        for key, value in row.items()
+        if key not in ["nombre", "descripción", "kml"] and value is not None
+    )
+    return (
+        "<Placemark>"
+        f"<name>{escape(row['nombre'] or '')}</name>"
+        f"<description>{escape(row['descripción'] or '')}</description>"
+        f"<ExtendedData>{extended_data}</ExtendedData>"
+        f"{row['kml']}"
+        "</Placemark>"
+    )
@@ -1,10 +1,16 @@
+from flask import Response, stream_with_context
+from flask_restx import Resource
+from werkzeug.utils import secure_filename
+
 from api.logger import EndpointServer, Logger, debug_metadata
 from api.utils import temp_remove, temp_store
 
 from . import namespace
+from .core import export_layer_geojson, export_layer_kml, view_exists
 from .marshal import (
     delete_batch_parser,
     delete_geometry_parser,
+    export_layer_parser,
     kml_to_geometries_parser,
     parse_ids,
     parse_kwargs,
@@ -222,3 +228,47 @@ class DeleteBatch(EndpointServer):
         with Logger(**self.job_received(**kwargs)) as logger:
             task_delete_batches.delay(**kwargs, log_id=logger.log.id)
             return logger.log_response()
+
+
+@namespace.route("/layer/<string:layer>/export")
+class LayerExport(Resource):
+    """
+    Exporta todas las geometrías de una capa.
+    """
+
+    formats = {
+        "geojson": (export_layer_geojson, "application/geo+json", "geojson"),
+        "kml": (export_layer_kml, "application/vnd.google-earth.kml+xml", "kml"),
+    }
+
+    @namespace.doc("Layer export.")
+    @namespace.expect(export_layer_parser, validate=True)
+    def get(self, layer):
+        """
+        Exporta las geometrías de una capa en formato GeoJSON o KML.
+
+        La respuesta se transmite en fragmentos a medida que se leen de PostGIS.
+
+        ---
+        ### parameters:
+          - __layer__ (requerido): El nombre de la capa a exportar.
+          - __format__: Formato de salida (opciones: "geojson", "kml").
+        ---
+        ### responses:
+          - __200__: Exportación exitosa. (OK)
+          - __404__: La capa no existe. (No encontrado)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        export, mimetype, extension = self.formats[
+            export_layer_parser.parse_args().format
+        ]
+        if not view_exists(layer):
+            namespace.abort(404, f"Layer '{layer}' doesn't exist.")
+        return Response(
+            stream_with_context(export(layer)),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": "attachment; "
+                f'filename="{secure_filename(layer) or "layer"}.{extension}"'
+            },
+        )
@@ -111,6 +111,16 @@ missing_batch_error_handle = reqparse.Argument(
     choices=["fail", "ignore"],
 )
 
+export_format = reqparse.Argument(
+    "format",
+    dest="format",
+    location="args",
+    type=str,
+    required=False,
+    default="geojson",
+    choices=["geojson", "kml"],
+)
+
 cascade = reqparse.Argument(
     "cascade",
     dest="cascade",
@@ -154,3 +164,7 @@ delete_batch_parser = form_maker(
     cascade,
     missing_batch_error_handle,
 )
+
+export_layer_parser = form_maker(
+    export_format,
+)
@@ -27,7 +27,7 @@ def task_kml_to_create_batch(*args, **kwargs):
     Returns:
         None
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         kml_to_create_batch(*args, **kwargs, logger=logger)
         temp_remove(kwargs["file"])
@@ -45,7 +45,7 @@ def task_view_push_to_layer(*args, **kwargs):
     - kwargs: Argumentos clave-valor.
 
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         view_push_to_layer(*args, **kwargs, logger=logger)
         if logger.log.status == 205:
@@ -62,7 +62,7 @@ def task_delete_geometries(*args, **kwargs):
     - kwargs: Argumentos clave-valor.
 
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         delete_geometries(**kwargs, logger=logger)
         if logger.log.status == 205:
@@ -79,7 +79,7 @@ def task_delete_batches(*args, **kwargs):
     - kwargs: Argumentos clave-valor.
 
     """
-    with Logger(log_id=kwargs["log_id"]) as logger:
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
         logger.keep_track(message="Processing.", status=205)
         delete_batches(**kwargs, logger=logger)
         if logger.log.status == 205:
@@ -0,0 +1,12 @@
+from flask_restx import Namespace
+
+from utils.postgis_interface import PostGIS
+
+postgis = PostGIS()
+
+
+namespace = Namespace(
+    "Query",
+    description=f"Endpoints para consultar geometrías en Postgis ({postgis.host}) "
+    f"{'&#9989;' if postgis.status else '&#9940;'}.",
+)
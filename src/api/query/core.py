@@ -0,0 +1,137 @@
+import json
+from typing import List, Literal, Optional
+
+from api.utils import batch_arguments
+from models.tables import Geometries
+from utils.config import settings
+from utils.general import clean_nones
+from utils.postgis_interface import PostGIS
+
+
+def query_features(
+    layer: str,
+    bbox: Optional[List[float]] = None,
+    intersects: Optional[str] = None,
+    filters: Optional[dict] = None,
+    metadata: Optional[dict] = None,
+    after: int = 0,
+    limit: int = 100,
+    count: Literal["auto", "exact", "none"] = "auto",
+    **kwargs,
+) -> Optional[dict]:
+    """
+    Consulta una página de geometrías de una capa como FeatureCollection GeoJSON.
+
+    La paginación es por clave: cada página devuelve las geometrías con id mayor a
+    `after`, y el campo `next` indica el valor a utilizar para la página siguiente.
+
+    Args:
+        layer (str): Nombre de la capa.
+        bbox (Optional[List[float]]): Envolvente [minx, miny, maxx, maxy].
+        intersects (Optional[str]): Geometría WKT o GeoJSON a intersectar.
+        filters (Optional[dict]): Valores exactos de atributos del batch.
+        metadata (Optional[dict]): Objeto JSON que debe estar contenido en la metadata
+            del batch.
+        after (int): Último id de geometría de la página anterior (por defecto: 0).
+        limit (int): Tamaño de la página (por defecto: 100).
+        count (Literal["auto", "exact", "none"]): Estrategia de conteo del total.
+            "auto" utiliza la estimación del planificador para resultados grandes.
+
+    Returns:
+        Optional[dict]: FeatureCollection con la página, o None si la capa no existe.
+
+    """
+    with PostGIS() as postgis:
+        return collect_features(
+            postgis,
+            layer=layer,
+            bbox=bbox,
+            intersects=intersects,
+            filters=filters,
+            metadata=metadata,
+            after=after,
+            limit=limit,
+            count=count,
+        )
+
+
+def collect_features(
+    postgis: PostGIS,
+    layer: str,
+    bbox: Optional[List[float]] = None,
+    intersects: Optional[str] = None,
+    filters: Optional[dict] = None,
+    metadata: Optional[dict] = None,
+    after: int = 0,
+    limit: int = 100,
+    count: Literal["auto", "exact", "none"] = "auto",
+) -> Optional[dict]:
+    """
+    Arma la FeatureCollection de `query_features` utilizando la sesión de un objeto
+    PostGIS existente (ej: uno ligado a una sesión asincrónica).
+
+    Args:
+        postgis (PostGIS): Interfaz con la sesión a utilizar.
+        (ver `query_features` para el resto de los argumentos)
+
+    Returns:
+        Optional[dict]: FeatureCollection con la página, o None si la capa no existe.
+
+    """
+    if not postgis.get_layer(name=layer):
+        return None
+    query = postgis.query_layer_geometries(
+        layer=layer,
+        bbox=bbox,
+        intersects=intersects,
+        filters=filters,
+        metadata=metadata,
+    )
+    rows = query.filter(Geometries.id > after).limit(limit).all()
+    if count == "none":
+        total, estimated = None, None
+    elif count == "exact":
+        total, estimated = query.order_by(None).count(), False
+    else:
+        total, estimated = postgis.count(
+            query,
+            exact_limit=getattr(settings, "QUERY_EXACT_COUNT_LIMIT", 10000),
+        )
+    return clean_nones(
+        {
+            "type": "FeatureCollection",
+            "features": [feature(row) for row in rows],
+            "count": total,
+            "count_estimated": estimated,
+            "next": rows[-1].id if len(rows) == limit else None,
+        }
+    )
+
+
+def feature(row) -> dict:
+    """
+    Convierte una fila de la consulta de geometrías en una feature GeoJSON.
+
+    Args:
+        row: Fila con id, name, description, geojson y Batches.
+
+    Returns:
+        dict: Feature GeoJSON.
+
+    """
+    return {
+        "type": "Feature",
+        "id": row.id,
+        "geometry": json.loads(row.geojson),
+        "properties": clean_nones(
+            {
+                "nombre": row.name,
+                "descripción": row.description,
+                "batch": row.Batches.id,
+                **{
+                    attribute: getattr(row.Batches, attribute)
+                    for attribute in batch_arguments.keys()
+                },
+            }
+        ),
+    }
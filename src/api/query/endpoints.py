@@ -0,0 +1,48 @@
+from flask_restx import Resource
+from sqlalchemy.exc import DatabaseError
+
+from . import namespace
+from .core import query_features
+from .marshal import parse_kwargs, query_features_parser
+
+
+@namespace.route("/layer/<string:layer>/features")
+class LayerFeatures(Resource):
+    """
+    Consulta de geometrías de una capa.
+
+    Filtra las geometrías de una capa por envolvente, intersección y atributos.
+    """
+
+    @namespace.doc("Layer features query.")
+    @namespace.expect(query_features_parser, validate=True)
+    def get(self, layer):
+        """
+        Obtiene una página de geometrías de una capa en formato GeoJSON.
+
+        ---
+        ### parameters:
+          - __layer__ (requerido): El nombre de la capa.
+          - __bbox__: Envolvente con el formato "minx,miny,maxx,maxy".
+          - __intersects__: Geometría WKT o GeoJSON que deben intersectar los resultados.
+          - __obra__, __operatoria__, __provincia__, __departamento__, __municipio__,
+            __localidad__, __estado__, __descripcion__, __cantidad__, __categoria__,
+            __ente__, __fuente__: Filtros exactos por atributos del batch.
+          - __metadata__: Objeto JSON que debe estar contenido en la metadata del batch.
+          - __after__: Id de la última geometría de la página anterior (valor `next`).
+          - __limit__: Tamaño de página (máximo 1000).
+          - __count__: Conteo del total (opciones: "auto", "exact", "none").
+        ---
+        ### responses:
+          - __200__: Consulta exitosa. (OK)
+          - __400__: Datos de solicitud inválidos. (Solicitud incorrecta)
+          - __404__: La capa no existe. (No encontrado)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        try:
+            result = query_features(layer=layer, **parse_kwargs(query_features_parser))
+        except DatabaseError as error:
+            namespace.abort(400, str(error.orig).strip())
+        if result is None:
+            namespace.abort(404, f"Layer '{layer}' doesn't exist.")
+        return result
@@ -0,0 +1,123 @@
+from flask_restx import reqparse
+
+from api.utils import batch_arguments, form_maker, int_up_to_n, json_object
+from utils.general import clean_nones
+
+
+def parse_bbox(value: str) -> list:
+    """
+    Valida una envolvente con el formato "minx,miny,maxx,maxy".
+    """
+    try:
+        bbox = [float(element) for element in value.split(",")]
+    except ValueError:
+        raise ValueError(f"'{value}' must be four comma separated numbers.")
+    if len(bbox) != 4:
+        raise ValueError(f"'{value}' must be four comma separated numbers.")
+    return bbox
+
+
+def parse_kwargs(parser):
+    """
+    Analiza los argumentos proporcionados por un parser y los devuelve como un diccionario de kwargs.
+
+    Los atributos de batch se agrupan en `filters`.
+
+    Args:
+        parser (RequestParser): Parser de Flask-RESTX.
+
+    Returns:
+        dict: Diccionario de kwargs generado a partir de los argumentos.
+
+    """
+    form = parser.parse_args()
+    return group_filters({arg.dest: getattr(form, arg.dest) for arg in parser.args})
+
+
+def group_filters(kwargs: dict) -> dict:
+    """
+    Agrupa los atributos de batch de un diccionario de kwargs en `filters`.
+    """
+    kwargs["filters"] = clean_nones(
+        {key: kwargs.pop(key, None) for key in batch_arguments.keys()}
+    )
+    return clean_nones(kwargs)
+
+
+bbox = reqparse.Argument(
+    "bbox",
+    dest="bbox",
+    location="args",
+    type=parse_bbox,
+    required=False,
+    help="Bounding box as 'minx,miny,maxx,maxy'.",
+)
+
+intersects = reqparse.Argument(
+    "intersects",
+    dest="intersects",
+    location="args",
+    type=str,
+    required=False,
+    help="WKT or GeoJSON geometry the features must intersect.",
+)
+
+metadata = reqparse.Argument(
+    "metadata",
+    dest="metadata",
+    location="args",
+    type=json_object,
+    required=False,
+    help="JSON object the batch metadata must contain.",
+)
+
+after = reqparse.Argument(
+    "after",
+    dest="after",
+    location="args",
+    type=int,
+    required=False,
+    default=0,
+    help="Return features with id greater than this value.",
+)
+
+limit = reqparse.Argument(
+    "limit",
+    dest="limit",
+    location="args",
+    type=int_up_to_n(1000),
+    required=False,
+    default=100,
+    help="Page size. Must be between 1 and 1000.",
+)
+
+count = reqparse.Argument(
+    "count",
+    dest="count",
+    location="args",
+    type=str,
+    required=False,
+    default="auto",
+    choices=["auto", "exact", "none"],
+)
+
+batch_filters = {
+    name: reqparse.Argument(
+        name,
+        dest=name,
+        location="args",
+        type=str,
+        required=False,
+    )
+    for name in batch_arguments.keys()
+}
+
+query_features_parser = form_maker(
+    bbox,
+    intersects,
+    *batch_filters.values(),
+    metadata,
+    after,
+    limit,
+    count,
+)
@@ -1,4 +1,4 @@
-from models.tables import Logs
+from models.tables import Batches, Logs
 from utils.postgis_interface import PostGIS
 
 
@@ -40,3 +40,78 @@ def get_batch_record(id: int):
     """
     with PostGIS() as postgis:
         return postgis.get_batch_record(id=id)
+
+
+def get_batch_geometries(id: int, after: int = 0, limit: int = 100):
+    """
+    Obtiene una página de los IDs de geometrías de un batch.
+
+    Args:
+        id (int): ID del batch.
+        after (int): Último id de la página anterior.
+        limit (int): Tamaño de la página.
+
+    Returns:
+        dict: IDs de geometrías y el id a utilizar para la página siguiente, o None si
+            el batch no existe.
+    """
+    with PostGIS() as postgis:
+        return postgis.get_batch_geometries(id=id, after=after, limit=limit)
+
+
+def get_layer_statistics(layer: str):
+    """
+    Obtiene las estadísticas de una capa.
+
+    Args:
+        layer (str): Nombre de la capa.
+
+    Returns:
+        dict: Estadísticas de la capa, o None si la capa no existe.
+    """
+    with PostGIS() as postgis:
+        return postgis.get_layer_statistics(layer=layer)
+
+
+def search_records(metadata: dict, after: int = 0, limit: int = 100):
+    """
+    Busca registros de estado de procesos por su metadata.
+
+    Args:
+        metadata (dict): Objeto JSON que debe estar contenido en la metadata.
+        after (int): Último id de la página anterior.
+        limit (int): Tamaño de la página.
+
+    Returns:
+        dict: Registros encontrados y el id a utilizar para la página siguiente.
+    """
+    with PostGIS() as postgis:
+        logs = postgis.filter_by_metadata(
+            Logs, metadata=metadata, after=after, limit=limit
+        )
+        return {
+            "records": [{"id": log.id, **log.record} for log in logs],
+            "next": logs[-1].id if len(logs) == limit else None,
+        }
+
+
+def search_batches(metadata: dict, after: int = 0, limit: int = 100):
+    """
+    Busca registros de batches por su metadata.
+
+    Args:
+        metadata (dict): Objeto JSON que debe estar contenido en la metadata.
+        after (int): Último id de la página anterior.
+        limit (int): Tamaño de la página.
+
+    Returns:
+        dict: Batches encontrados y el id a utilizar para la página siguiente.
+    """
+    with PostGIS() as postgis:
+        batches = postgis.filter_by_metadata(
+            Batches, metadata=metadata, after=after, limit=limit
+        )
+        return {
+            "batches": [batch.record for batch in batches],
+            "next": batches[-1].id if len(batches) == limit else None,
+        }
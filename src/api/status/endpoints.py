@@ -3,7 +3,16 @@ from flask_restx import Resource
 from utils.geoserver_interface import Geoserver
 
 from . import namespace
-from .core import get_batch_record, get_log_record, standard_response
+from .core import (
+    get_batch_geometries,
+    get_batch_record,
+    get_layer_statistics,
+    get_log_record,
+    search_batches,
+    search_records,
+    standard_response,
+)
+from .marshal import metadata_search_parser, page_parser
 
 geoserver = Geoserver()
 
@@ -104,3 +113,121 @@ class BatchStatus(Resource):
             status=400,
             message=f"Batch '{id}' doesn't exist.",
         )
+
+
+@namespace.route("/batch/<int:id>/geometries")
+class BatchGeometries(Resource):
+    """
+    Geometrías del batch.
+
+    Lista paginada de los IDs de geometrías de un batch.
+    """
+
+    @namespace.doc("Batch geometries.")
+    @namespace.expect(page_parser, validate=True)
+    def get(self, id):
+        """
+        Obtiene una página de los IDs de geometrías de un batch.
+
+        ---
+        ### parameters:
+          - __id__ (requerido): ID del batch.
+          - __after__: Id de la última geometría de la página anterior (valor `next`).
+          - __limit__: Tamaño de página (máximo 1000).
+        ### responses:
+          - __200__: IDs de geometrías obtenidos correctamente.
+          - __400__: Datos de solicitud inválidos.
+          - __500__: Error interno del servidor.
+        """
+        return get_batch_geometries(id=id, **page_parser.parse_args()) or (
+            standard_response(
+                id=id,
+                endpoint=self.endpoint.replace("_", "/").lower(),
+                status=400,
+                message=f"Batch '{id}' doesn't exist.",
+            )
+        )
+
+
+@namespace.route("/layer/<string:layer>")
+class LayerStatistics(Resource):
+    """
+    Estadísticas de la capa.
+
+    Obtiene las estadísticas de una capa, mantenidas en forma incremental.
+    """
+
+    @namespace.doc("Layer statistics.")
+    def get(self, layer):
+        """
+        Obtiene las estadísticas de una capa: cantidad de geometrías (total y por
+        tipo), área total (m²), longitud total de las líneas (m), cantidad de vértices
+        y extensión.
+
+        ---
+        ### parameters:
+          - __layer__ (requerido): Nombre de la capa.
+        ### responses:
+          - __200__: Estadísticas obtenidas correctamente.
+          - __500__: Error interno del servidor.
+        """
+        return get_layer_statistics(layer=layer) or standard_response(
+            endpoint=self.endpoint.replace("_", "/").lower(),
+            layer=layer,
+            status=400,
+            message=f"Layer '{layer}' doesn't exist.",
+        )
+
+
+@namespace.route("/records")
+class SearchRecords(Resource):
+    """
+    Búsqueda de procesos.
+
+    Busca registros de estado de procesos según su metadata.
+    """
+
+    @namespace.doc("Search process records.")
+    @namespace.expect(metadata_search_parser, validate=True)
+    def get(self):
+        """
+        Busca registros de estado de procesos cuya metadata contenga un objeto JSON.
+
+        ---
+        ### parameters:
+          - __metadata__ (requerido): Objeto JSON, ej: {"layer": "obras"}.
+          - __after__: Id del último registro de la página anterior (valor `next`).
+          - __limit__: Tamaño de página (máximo 1000).
+        ### responses:
+          - __200__: Registros obtenidos correctamente.
+          - __400__: Datos de solicitud inválidos.
+          - __500__: Error interno del servidor.
+        """
+        return search_records(**metadata_search_parser.parse_args())
+
+
+@namespace.route("/batches")
+class SearchBatches(Resource):
+    """
+    Búsqueda de batches.
+
+    Busca registros de batches según su metadata.
+    """
+
+    @namespace.doc("Search batches.")
+    @namespace.expect(metadata_search_parser, validate=True)
+    def get(self):
+        """
+        Busca batches cuya metadata contenga un objeto JSON.
+
+        ---
+        ### parameters:
+          - __metadata__ (requerido): Objeto JSON, ej: {"expediente": "1234"}.
+          - __after__: Id del último batch de la página anterior (valor `next`).
+          - __limit__: Tamaño de página (máximo 1000).
+        ### responses:
+          - __200__: Batches obtenidos correctamente.
+          - __400__: Datos de solicitud inválidos.
+          - __500__: Error interno del servidor.
+        """
+        return search_batches(**metadata_search_parser.parse_args())
@@ -0,0 +1,43 @@
+from flask_restx import reqparse
+
+from api.utils import form_maker, int_up_to_n, json_object
+
+metadata = reqparse.Argument(
+    "metadata",
+    dest="metadata",
+    location="args",
+    type=json_object,
+    required=True,
+    help="JSON object the metadata must contain.",
+)
+
+after = reqparse.Argument(
+    "after",
+    dest="after",
+    location="args",
+    type=int,
+    required=False,
+    default=0,
+    help="Return records with id greater than this value.",
+)
+
+limit = reqparse.Argument(
+    "limit",
+    dest="limit",
+    location="args",
+    type=int_up_to_n(1000),
+    required=False,
+    default=100,
+    help="Page size. Must be between 1 and 1000.",
+)
+
+metadata_search_parser = form_maker(
+    metadata,
+    after,
+    limit,
+)
+
+page_parser = form_maker(
+    after,
+    limit,
+)
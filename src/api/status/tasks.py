@@ -0,0 +1,32 @@
+from api.celery import app
+from utils.postgis_interface import PostGIS
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_maintain_log_partitions(*args, **kwargs):
+    """
+    Tarea periódica de mantenimiento de las particiones de logs.
+
+    Crea las particiones de los meses próximos y archiva en archivos comprimidos las
+    particiones anteriores al período de retención (ver LOGS_RETENTION_MONTHS).
+
+    Returns:
+        dict: Particiones creadas y archivos generados.
+    """
+    with PostGIS() as postgis:
+        return postgis.maintain_log_partitions()
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_compact_layer_statistics(*args, **kwargs):
+    """
+    Tarea periódica de compactación de las estadísticas de capas.
+
+    Suma las filas de variación de cada capa en una sola y recalcula la extensión de
+    las capas de las que se eliminaron geometrías.
+
+    Returns:
+        int: Cantidad de capas compactadas.
+    """
+    with PostGIS() as postgis:
+        return postgis.compact_layer_statistics()
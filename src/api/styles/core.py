@@ -1,13 +1,25 @@
-from typing import Literal, Optional, Union
+import glob
+import os
+from typing import List, Literal, Optional, Union
 
 from requests.exceptions import HTTPError
 from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import BadGateway
+from werkzeug.utils import secure_filename
 
 from api.logger import Logger, core_exception_logger
+from api.utils import bulk_errors
+from utils.async_geoserver_interface import AsyncGeoserver
+from utils.config import PROJECT_DIR, settings
 from utils.geoserver_interface import Geoserver
+from utils.postgis_interface import PostGIS
 from utils.sld_interface import SLD
 
 geoserver = Geoserver()
+async_geoserver = AsyncGeoserver()
+
+# Directorio con los archivos SLD que se cargan en forma masiva.
+STYLES_DIR = getattr(settings, "STYLES_DIR", os.path.join(PROJECT_DIR, "etc", "styles"))
 
 
 def list_available_layers():
@@ -35,7 +47,10 @@ def push_sld_to_style(
 
     Esta función toma un archivo SLD o contenido de SLD, carga la definición en el
     estilo especificado en el servidor Geoserver y maneja errores según las opciones
-    proporcionadas. Actualiza el registro de registro con los mensajes apropiados.
+    proporcionadas. Un estilo existente se reemplaza en el lugar, conservando su
+    asignación a las capas, y solo si su contenido cambió (ver
+    `Geoserver.push_style`). Actualiza el registro de registro con los mensajes
+    apropiados.
 
     Args:
         file (Union[str, FileStorage]): Ruta de archivo o objeto FileStorage que
@@ -53,18 +68,19 @@ def push_sld_to_style(
     """
     sld = SLD(file)
     try:
-        geoserver.push_style(
-            style=style,
-            data=sld.read(),
-            if_exists=error_handle,
-        )
+        with sld.read() as reader:
+            result = geoserver.push_style(
+                style=style,
+                data=reader,
+                if_exists=error_handle,
+            )
     except HTTPError:
+        # Solo "ignore" descarta el error: con "fail" o "replace" se propaga.
         if error_handle == "ignore":
             return
-        elif error_handle == "fail":
-            raise
+        raise
     if logger:
-        logger.keep_track(message_append=f"{style} style created.")
+        logger.keep_track(message_append=f"{style} style {result}.")
 
 
 @core_exception_logger
@@ -101,6 +117,8 @@ def assign_style_to_layer(
             return
         elif error_handle == "fail":
             raise
+    with PostGIS() as postgis:
+        postgis.register_layer(layer, style=style)
     if logger:
         logger.keep_track(message_append=f"{style} style assigned to {layer}.")
 
@@ -140,7 +158,112 @@ def delete_style_from_server(
     except HTTPError:
         if error_handle == "ignore":
             return
-        elif error_handle == "fail":
-            raise
+        raise
+    with PostGIS() as postgis:
+        postgis.unregister_style(style)
     if logger:
         logger.keep_track(message_append=f"{style} style deleted.")
+
+
+@core_exception_logger
+def push_sld_directory(
+    error_handle: Literal["fail", "replace", "ignore"] = "fail",
+    json: Optional[dict] = None,
+    logger: Optional[Logger] = None,
+    **kwargs,
+):
+    """
+    Carga en forma concurrente todos los archivos SLD de STYLES_DIR en el servidor
+    Geoserver, con el nombre de cada archivo como nombre del estilo. Los estilos sin
+    cambios desde su última carga no se vuelven a cargar.
+
+    Args:
+        error_handle (Literal["fail", "replace", "ignore"], optional): Controla el
+            comportamiento en caso de un estilo existente, como en `push_sld_to_style`.
+        json (Optional[dict]): JSON asociado a la operación (opcional).
+        log (Union[int, Logs], optional): Un ID de registro o objeto Logs para
+            actualizar el registro de registro. Por defecto es None.
+
+    Raises:
+        BadGateway: Si falló la carga de algún estilo.
+
+    Returns:
+        None
+    """
+    paths = sorted(glob.glob(os.path.join(STYLES_DIR, "*.sld")))
+    styles = [
+        secure_filename(os.path.splitext(os.path.basename(path))[0]) for path in paths
+    ]
+
+    def read(path: str) -> bytes:
+        with open(path, "rb") as reader:
+            return reader.read()
+
+    results = async_geoserver.bulk(
+        lambda: [
+            async_geoserver.push_style(
+                style=style, data=read(path), if_exists=error_handle
+            )
+            for style, path in zip(styles, paths)
+        ]
+    )
+    errors = bulk_errors(styles, results)
+    if logger:
+        logger.keep_track(
+            message_append=", ".join(
+                f"{results.count(result)} styles {result}"
+                for result in ["created", "updated", "unchanged", "ignored"]
+                if result in results
+            )
+            or "No styles pushed."
+        )
+    if errors:
+        raise BadGateway(
+            "Geoserver styles failed: "
+            + ", ".join(f"{style} ({error})" for style, error in errors.items())
+        )
+
+
+@core_exception_logger
+def assign_style_to_layers(
+    style: str,
+    layers: List[str],
+    json: Optional[dict] = None,
+    logger: Optional[Logger] = None,
+    **kwargs,
+):
+    """
+    Asigna en forma concurrente un estilo a una serie de capas en el servidor Geoserver.
+
+    Args:
+        style (str): Nombre del estilo que se asignará a las capas.
+        layers (List[str]): Nombres de las capas.
+        json (Optional[dict]): JSON asociado a la operación (opcional).
+        log (Union[int, Logs], optional): Un ID de registro o objeto Logs para
+            actualizar el registro de registro. Por defecto es None.
+
+    Raises:
+        BadGateway: Si falló la asignación a alguna capa.
+
+    Returns:
+        None
+    """
+    results = async_geoserver.bulk(
+        lambda: [
+            async_geoserver.assign_style(style=style, layer=layer) for layer in layers
+        ]
+    )
+    errors = bulk_errors(layers, results)
+    with PostGIS() as postgis:
+        for layer in layers:
+            if layer not in errors:
+                postgis.register_layer(layer, style=style)
+    if logger:
+        logger.keep_track(
+            message_append=f"{style} style assigned to {len(layers) - len(errors)} layers."
+        )
+    if errors:
+        raise BadGateway(
+            f"Style {style} assignment failed: "
+            + ", ".join(f"{layer} ({error})" for layer, error in errors.items())
+        )
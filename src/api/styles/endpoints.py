@@ -1,15 +1,20 @@
 from requests.exceptions import HTTPError
+from werkzeug.utils import secure_filename
 
 from api.logger import EndpointServer, Logger, debug_metadata
+from api.utils import parse_bulk_kwargs
 
 from . import namespace
 from .core import assign_style_to_layer, delete_style_from_server, push_sld_to_style
 from .marshal import (
     assign_style_parser,
+    bulk_assign_style_parser,
+    bulk_upload_style_parser,
     delete_style_parser,
     parse_kwargs,
     upload_style_parser,
 )
+from .tasks import task_assign_style_to_layers, task_push_sld_directory
 
 
 @namespace.route("/create/form")
@@ -35,7 +40,7 @@ class StyleCreateForm(EndpointServer):
           - __style__ (requerido): El nombre del estilo que se creará.
           - __error_handle__: Manejo de errores (opciones: "fail", "replace", "ignore").
                 - __fail__: Falla si el estilo ya existe.
-                - __replace__: Reemplaza cualquier estilo previo con el mismo nombre.
+                - __replace__: Actualiza en el lugar cualquier estilo previo con el mismo nombre, si cambió.
                 - __ignore__: Evita crear un nuevo estilo si ya existe uno previo con el mismo nombre.
 
         ### Respuestas:
@@ -137,3 +142,69 @@ class StyleDeleteForm(EndpointServer):
                     json=debug_metadata(**kwargs),
                 )
             return logger.log_response()
+
+
+@namespace.route("/bulk/create/form")
+class StyleBulkCreateForm(EndpointServer):
+    """
+    Clase de ruta para la carga masiva de estilos.
+
+    Carga en forma concurrente todos los archivos SLD del directorio de estilos del
+    servidor (STYLES_DIR), con el nombre de cada archivo como nombre del estilo.
+
+    """
+
+    @namespace.doc("Bulk SLD import.")
+    @namespace.expect(bulk_upload_style_parser, validate=True)
+    def post(self):
+        """
+        Maneja las solicitudes POST para cargar todos los estilos de STYLES_DIR.
+
+        ---
+        ### Parámetros:
+          - __error_handle__: Manejo de errores (opciones: "fail", "replace", "ignore").
+                - __fail__: Falla para los estilos que ya existen.
+                - __replace__: Actualiza en el lugar los estilos previos con el mismo nombre, si cambiaron.
+                - __ignore__: Omite los estilos que ya existen.
+
+        ### Respuestas:
+          - __200__: Carga iniciada. (OK)
+          - __400__: Datos de solicitud inválidos. (Solicitud incorrecta)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        kwargs = parse_bulk_kwargs(bulk_upload_style_parser)
+        with Logger(**self.job_received(**kwargs)) as logger:
+            task_push_sld_directory.delay(**kwargs, log_id=logger.log.id)
+            return logger.log_response()
+
+
+@namespace.route("/bulk/assign/form")
+class StyleBulkAssignForm(EndpointServer):
+    """
+    Clase de ruta para la asignación masiva de estilos.
+
+    Asigna en forma concurrente un estilo a una serie de capas.
+
+    """
+
+    @namespace.doc("Bulk assign style to layers.")
+    @namespace.expect(bulk_assign_style_parser, validate=True)
+    def put(self):
+        """
+        Maneja las solicitudes PUT para asignar un estilo a una serie de capas.
+
+        ---
+        ### Parámetros:
+          - __style__ (requerido): El nombre del estilo que se asignará a las capas.
+          - __layers__ (requerido): Los nombres de las capas separados por comas.
+
+        ### Respuestas:
+          - __200__: Asignación iniciada. (OK)
+          - __400__: Datos de solicitud inválidos. (Solicitud incorrecta)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        kwargs = parse_bulk_kwargs(bulk_assign_style_parser)
+        kwargs["style"] = secure_filename(kwargs["style"])
+        with Logger(**self.job_received(**kwargs)) as logger:
+            task_assign_style_to_layers.delay(**kwargs, log_id=logger.log.id)
+            return logger.log_response()
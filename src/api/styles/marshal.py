@@ -99,3 +99,14 @@ delete_style_parser = form_maker(
     error_delete_unexisting_style,
     base_arguments["metadata"],
 )
+
+bulk_upload_style_parser = form_maker(
+    error_create_existing_style,
+    base_arguments["metadata"],
+)
+
+bulk_assign_style_parser = form_maker(
+    base_arguments["style"],
+    base_arguments["layers"],
+    base_arguments["metadata"],
+)
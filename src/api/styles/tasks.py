@@ -0,0 +1,50 @@
+from api.celery import app
+from api.logger import Logger
+
+from .core import assign_style_to_layers, push_sld_directory
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_push_sld_directory(*args, **kwargs):
+    """
+    Tarea asincrónica para cargar en forma masiva los estilos de STYLES_DIR.
+
+    Si el estado del registro está en 205 (procesamiento), lo actualiza a 210 (éxito)
+    una vez que se completa la tarea.
+
+    Args:
+        *args: Argumentos posicionales no especificados.
+        **kwargs: Argumentos clave que deben incluir "log_id" y otros necesarios para
+            la función push_sld_directory.
+
+    Returns:
+        None
+    """
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
+        logger.keep_track(message="Processing.", status=205)
+        push_sld_directory(*args, **kwargs, logger=logger)
+        if logger.log.status == 205:
+            logger.keep_track(message_append="Success", status=210)
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_assign_style_to_layers(*args, **kwargs):
+    """
+    Tarea asincrónica para asignar un estilo a una serie de capas.
+
+    Si el estado del registro está en 205 (procesamiento), lo actualiza a 210 (éxito)
+    una vez que se completa la tarea.
+
+    Args:
+        *args: Argumentos posicionales no especificados.
+        **kwargs: Argumentos clave que deben incluir "log_id" y otros necesarios para
+            la función assign_style_to_layers.
+
+    Returns:
+        None
+    """
+    with Logger(log_id=kwargs["log_id"], buffered=True) as logger:
+        logger.keep_track(message="Processing.", status=205)
+        assign_style_to_layers(*args, **kwargs, logger=logger)
+        if logger.log.status == 205:
+            logger.keep_track(message_append="Success", status=210)
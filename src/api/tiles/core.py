@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Union
+
+from requests.exceptions import RequestException
+from sqlalchemy.exc import DatabaseError
+from werkzeug.utils import secure_filename
+
+from api.logger import Logger
+from utils.cache_interface import DiskCache
+from utils.config import settings
+from utils.geoserver_interface import Geoserver
+from utils.postgis_interface import PostGIS
+
+tile_cache = DiskCache(
+    getattr(settings, "TILE_CACHE_DIR", os.path.join(settings.TEMP_BASE, "tiles")),
+    ttl=getattr(settings, "TILE_CACHE_TTL", 86400),
+)
+geoserver = Geoserver()
+
+
+def cache_key(layer: str) -> str:
+    """
+    Clave de una capa en la caché de teselas.
+
+    El nombre de la capa se normaliza con `secure_filename`, para que no pueda
+    referenciar rutas fuera del directorio de la caché. Si la normalización lo
+    modifica, se agrega un hash del nombre original para que dos capas distintas no
+    compartan la clave.
+
+    Args:
+        layer (str): Nombre de la capa.
+
+    Returns:
+        str: Clave de la capa.
+
+    """
+    key = secure_filename(layer)
+    if key != layer:
+        key = f"{key}_{hashlib.sha1(layer.encode()).hexdigest()[:12]}"
+    return key
+
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    """
+    Verifica que las coordenadas de una tesela existan en el esquema XYZ.
+
+    Args:
+        z (int): Nivel de zoom.
+        x (int): Columna de la tesela.
+        y (int): Fila de la tesela.
+
+    Returns:
+        bool: True si la tesela existe, False en caso contrario.
+
+    """
+    return 0 <= z <= 30 and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def generalized_column(z: int, tolerances: List[float]) -> Optional[str]:
+    """
+    Elige la columna de geometría generalizada adecuada para un nivel de zoom.
+
+    Se utiliza el nivel de mayor tolerancia que no supere el tamaño de un píxel de la
+    tesela, aproximado en grados (sistemas de coordenadas geográficos).
+
+    Args:
+        z (int): Nivel de zoom.
+        tolerances (List[float]): Tolerancias de generalización, de menor a mayor.
+
+    Returns:
+        Optional[str]: Nombre de la columna, o None para la geometría original.
+
+    """
+    pixel_size = 360 / (256 * 2**z)
+    levels = [
+        level
+        for level, tolerance in enumerate(tolerances, start=1)
+        if tolerance <= pixel_size
+    ]
+    return f"geometry_g{levels[-1]}" if levels else None
+
+
+def get_tile(layer: str, z: int, x: int, y: int) -> Optional[bytes]:
+    """
+    Obtiene una tesela vectorial de una capa, desde la caché o desde PostGIS.
+
+    Args:
+        layer (str): Nombre de la capa.
+        z (int): Nivel de zoom.
+        x (int): Columna de la tesela.
+        y (int): Fila de la tesela.
+
+    Returns:
+        Optional[bytes]: Tesela en formato MVT, o None si la capa no existe.
+
+    """
+    # La generación se lee antes de consultar PostGIS: si la capa se invalida durante
+    # la consulta, la tesela se guarda en la generación anterior y no se vuelve a leer.
+    generation = tile_cache.generation(cache_key(layer))
+    key = (cache_key(layer), generation, z, x, f"{y}.mvt")
+    tile = tile_cache.get(*key)
+    if tile is not None:
+        return tile
+    with PostGIS() as postgis:
+        if layer not in postgis.list_views():
+            return None
+        render_col = generalized_column(z=z, tolerances=postgis.tolerances)
+        if render_col not in postgis.list_view_columns(layer):
+            render_col = None
+        tile = postgis.tile(layer=layer, z=z, x=x, y=y, render_col=render_col)
+    tile_cache.set(tile, *key)
+    return tile
+
+
+def get_aggregate(
+    layer: str, z: int, x: int, y: int, method: str = "grid", cells: int = 32
+) -> Optional[bytes]:
+    """
+    Obtiene la agregación (grilla, hexágonos o clusters) de una capa dentro de una
+    tesela, desde la caché o desde PostGIS.
+
+    Se almacena en la misma caché que las teselas vectoriales, bajo la capa y su
+    generación, por lo que `invalidate_tiles` también la invalida.
+
+    Args:
+        layer (str): Nombre de la capa.
+        z (int): Nivel de zoom.
+        x (int): Columna de la tesela.
+        y (int): Fila de la tesela.
+        method (str): Método de agregación: "grid", "hex" o "cluster".
+        cells (int): Cantidad de celdas por lado de la tesela.
+
+    Returns:
+        Optional[bytes]: FeatureCollection GeoJSON, o None si la capa no existe.
+
+    """
+    generation = tile_cache.generation(cache_key(layer))
+    key = (cache_key(layer), generation, z, x, f"{y}.{method}.{cells}.geojson")
+    aggregate = tile_cache.get(*key)
+    if aggregate is not None:
+        return aggregate
+    with PostGIS() as postgis:
+        if layer not in postgis.list_views():
+            return None
+        aggregate = json.dumps(
+            postgis.aggregate(layer=layer, z=z, x=x, y=y, method=method, cells=cells)
+        ).encode()
+    tile_cache.set(aggregate, *key)
+    return aggregate
+
+
+def invalidate_tiles(layers: Union[str, List[str]]) -> None:
+    """
+    Invalida en la caché todas las teselas y agregaciones de una o varias capas.
+
+    Se debe invocar cada vez que se agregan o eliminan geometrías de una capa. Cada
+    capa pasa a una nueva generación, de modo que las teselas que se estén calculando
+    con los datos anteriores no se lean aunque se guarden después de la invalidación.
+
+    Args:
+        layers (Union[str, List[str]]): Nombre o lista de nombres de capas.
+
+    """
+    if isinstance(layers, str):
+        layers = [layers]
+    for layer in layers:
+        if cache_key(layer):
+            tile_cache.new_generation(cache_key(layer))
+
+
+def prune_tiles() -> int:
+    """
+    Elimina del disco las teselas expiradas (ver TILE_CACHE_TTL) y las de
+    generaciones ya invalidadas.
+
+    Returns:
+        int: Cantidad de teselas expiradas eliminadas.
+
+    """
+    try:
+        keys = os.listdir(tile_cache.base_dir)
+    except FileNotFoundError:
+        return 0
+    for key in keys:
+        tile_cache.prune_generations(key)
+    return tile_cache.prune()
+
+
+def dirty_extents(
+    postgis: PostGIS,
+    batches: Optional[Union[int, List[int]]] = None,
+    geometries: Optional[Union[int, List[int]]] = None,
+    logger: Optional[Logger] = None,
+) -> dict:
+    """
+    Obtiene, por capa, la extensión de los batches o geometrías modificados, en los
+    SRID de los gridsets de GeoWebCache.
+
+    En las eliminaciones se debe invocar antes de eliminar las geometrías. Al igual
+    que en `truncate_gwc`, un error de la consulta no interrumpe la operación: se
+    registra en el log y no se trunca ninguna tesela.
+
+    Args:
+        postgis (PostGIS): Objeto PostGIS.
+        batches (Optional[Union[int, List[int]]]): ID o lista de IDs de batches.
+        geometries (Optional[Union[int, List[int]]]): ID o lista de IDs de geometrías.
+        logger (Logger): Objeto Logger para registrar la acción (opcional).
+
+    Returns:
+        dict: Extensión por capa y SRID (vacío si GWC_TRUNCATE está deshabilitado o
+            si la consulta falla).
+
+    """
+    if not getattr(settings, "GWC_TRUNCATE", True):
+        return {}
+    try:
+        if batches is not None:
+            return postgis.batch_extents(batches, srids=geoserver.gwc_srids)
+        if geometries is not None:
+            return postgis.geometry_extents(geometries, srids=geoserver.gwc_srids)
+    except DatabaseError:
+        if logger:
+            logger.message_append("GeoWebCache extents query failed.")
+    return {}
+
+
+def truncate_gwc(
+    extents: dict,
+    reseed: bool = getattr(settings, "GWC_RESEED", False),
+    logger: Optional[Logger] = None,
+) -> None:
+    """
+    Trunca en GeoWebCache las teselas que cubren las extensiones modificadas de cada
+    capa y, opcionalmente, las vuelve a generar en segundo plano.
+
+    Un error de GeoWebCache no interrumpe la operación: las teselas se regeneran al
+    expirar la caché, y el error se registra en el log.
+
+    Args:
+        extents (dict): Extensión por capa y SRID (ver `dirty_extents`).
+        reseed (bool): Vuelve a generar los niveles de zoom bajos
+            (por defecto: GWC_RESEED o False).
+        logger (Logger): Objeto Logger para registrar la acción (opcional).
+
+    """
+    failed = []
+    for layer, layer_extents in extents.items():
+        try:
+            geoserver.truncate_tiles(layer=layer, extents=layer_extents, reseed=reseed)
+        except RequestException:
+            failed.append(layer)
+    if logger and failed:
+        logger.message_append(f"GeoWebCache truncate failed: {', '.join(failed)}.")
@@ -0,0 +1,81 @@
+from flask import Response
+from flask_restx import Resource
+
+from . import namespace
+from .core import get_aggregate, get_tile, valid_tile
+from .marshal import aggregate_parser
+
+
+@namespace.route("/<string:layer>/<int:z>/<int:x>/<int:y>.mvt")
+class LayerTile(Resource):
+    """
+    Tesela vectorial de una capa.
+
+    Genera teselas Mapbox Vector Tile directamente desde la vista de la capa.
+    """
+
+    @namespace.doc("Layer vector tile.")
+    def get(self, layer, z, x, y):
+        """
+        Obtiene una tesela vectorial (MVT) de una capa.
+
+        ---
+        ### parameters:
+          - __layer__ (requerido): El nombre de la capa.
+          - __z__ (requerido): Nivel de zoom.
+          - __x__ (requerido): Columna de la tesela.
+          - __y__ (requerido): Fila de la tesela.
+        ---
+        ### responses:
+          - __200__: Tesela generada correctamente. (OK)
+          - __400__: Coordenadas de tesela inválidas. (Solicitud incorrecta)
+          - __404__: La capa no existe. (No encontrado)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        if not valid_tile(z=z, x=x, y=y):
+            namespace.abort(400, f"Tile {z}/{x}/{y} is out of range.")
+        tile = get_tile(layer=layer, z=z, x=x, y=y)
+        if tile is None:
+            namespace.abort(404, f"Layer '{layer}' doesn't exist.")
+        return Response(tile, mimetype="application/vnd.mapbox-vector-tile")
+
+
+@namespace.route("/<string:layer>/<int:z>/<int:x>/<int:y>/aggregate")
+class LayerAggregate(Resource):
+    """
+    Agregación de una capa.
+
+    Agrupa las geometrías de una capa dentro de una tesela en celdas o clusters, para
+    representar capas de muchos elementos en zooms bajos.
+    """
+
+    @namespace.doc("Layer aggregate.")
+    @namespace.expect(aggregate_parser, validate=True)
+    def get(self, layer, z, x, y):
+        """
+        Obtiene la agregación de una capa dentro de una tesela, en formato GeoJSON.
+
+        ---
+        ### parameters:
+          - __layer__ (requerido): El nombre de la capa.
+          - __z__ (requerido): Nivel de zoom.
+          - __x__ (requerido): Columna de la tesela.
+          - __y__ (requerido): Fila de la tesela.
+          - __method__: Método de agregación: grid (grilla), hex (hexágonos) o cluster
+            (por defecto: grid).
+          - __cells__: Celdas por lado de la tesela, entre 1 y 256 (por defecto: 32).
+        ---
+        ### responses:
+          - __200__: Agregación generada correctamente. (OK)
+          - __400__: Parámetros o coordenadas de tesela inválidos. (Solicitud incorrecta)
+          - __404__: La capa no existe. (No encontrado)
+          - __500__: Error interno del servidor. (Error del servidor interno)
+        """
+        if not valid_tile(z=z, x=x, y=y):
+            namespace.abort(400, f"Tile {z}/{x}/{y} is out of range.")
+        aggregate = get_aggregate(
+            layer=layer, z=z, x=x, y=y, **aggregate_parser.parse_args()
+        )
+        if aggregate is None:
+            namespace.abort(404, f"Layer '{layer}' doesn't exist.")
+        return Response(aggregate, mimetype="application/geo+json")
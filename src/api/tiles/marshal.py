@@ -0,0 +1,29 @@
+from flask_restx import reqparse
+
+from api.utils import form_maker, int_up_to_n
+
+method = reqparse.Argument(
+    "method",
+    dest="method",
+    location="args",
+    type=str,
+    choices=["grid", "hex", "cluster"],
+    required=False,
+    default="grid",
+    help="Aggregation method: square grid, hexagonal grid or clusters of grid cells.",
+)
+
+cells = reqparse.Argument(
+    "cells",
+    dest="cells",
+    location="args",
+    type=int_up_to_n(256),
+    required=False,
+    default=32,
+    help="Grid cells per tile side. Must be between 1 and 256.",
+)
+
+aggregate_parser = form_maker(
+    method,
+    cells,
+)
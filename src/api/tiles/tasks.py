@@ -0,0 +1,16 @@
+from api.celery import app
+from api.tiles.core import prune_tiles
+
+
+@app.task(bind=True, max_retries=3, retry_backoff=1)
+def task_prune_tiles(*args, **kwargs):
+    """
+    Tarea periódica de limpieza de la caché de teselas.
+
+    Elimina las teselas expiradas (ver TILE_CACHE_TTL) y las de generaciones ya
+    invalidadas, para que la caché no crezca sin límite en disco.
+
+    Returns:
+        int: Cantidad de teselas expiradas eliminadas.
+    """
+    return prune_tiles()
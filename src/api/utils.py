@@ -1,15 +1,16 @@
+import json
 import os
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from flask_restx import reqparse
 from geoalchemy2 import functions as func
-from geoalchemy2.elements import WKTElement
 from geoalchemy2.shape import from_shape
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 from models.tables import Batches, Geometries, Logs
 from utils.config import settings
+from utils.general import clean_nones
 from utils.geoserver_interface import Geoserver
 from utils.kml_interface import KML
 from utils.postgis_interface import PostGIS
@@ -72,6 +73,74 @@ def str_under_n(n: int = 64):
     return validate
 
 
+def int_up_to_n(n: int = 1000):
+    def validate(value):
+        value = int(value)
+        if not 0 < value <= n:
+            raise ValueError(f"'{value}' must be between 1 and {n}.")
+        return value
+
+    return validate
+
+
+def json_object(value):
+    try:
+        value = json.loads(value)
+    except ValueError:
+        raise ValueError(f"'{value}' must be a valid JSON object.")
+    if not isinstance(value, dict):
+        raise ValueError(f"'{value}' must be a JSON object.")
+    return value
+
+
+def name_list(value):
+    names = [element.strip(" ,\"'[](){}") for element in str(value).split(",")]
+    names = [name for name in names if name]
+    if not names:
+        raise ValueError(f"'{value}' must be a comma separated list of names.")
+    for name in names:
+        # Los nombres se crean normalizados (ver marshal), por lo que uno que cambie
+        # al normalizarse no existe: se rechaza en lugar de buscar otro.
+        if secure_filename(name) != name:
+            raise ValueError(f"'{name}' is not a valid name.")
+    return names
+
+
+def parse_bulk_kwargs(parser):
+    """
+    Analiza los argumentos de una operación masiva y los devuelve como un diccionario
+    de kwargs, con la metadata en `json`.
+
+    Args:
+        parser (RequestParser): Parser de Flask-RESTX.
+
+    Returns:
+        dict: Diccionario de kwargs generado a partir de los argumentos.
+    """
+    form = parser.parse_args()
+    kwargs = {arg.dest: getattr(form, arg.dest) for arg in parser.args}
+    kwargs["json"] = json.loads(kwargs.get("json") or "{}")
+    return clean_nones(kwargs)
+
+
+def bulk_errors(names: List[str], results: list) -> dict:
+    """
+    Obtiene los errores de una operación masiva.
+
+    Args:
+        names (List[str]): Nombres de los elementos de la operación.
+        results (list): Resultados de la operación, en el mismo orden.
+
+    Returns:
+        dict: Mensaje de error por nombre de elemento, solo para los que fallaron.
+    """
+    return {
+        name: str(result)
+        for name, result in zip(names, results)
+        if isinstance(result, Exception)
+    }
+
+
 base_arguments = {
     "layer": reqparse.Argument(
         "layer",
@@ -105,6 +174,14 @@ base_arguments = {
         required=True,
         help="File url to be imported.",
     ),
+    "layers": reqparse.Argument(
+        "layers",
+        dest="layers",
+        location="form",
+        type=name_list,
+        required=True,
+        help="Comma separated list of layer names.",
+    ),
     "metadata": reqparse.Argument(
         "metadata",
         dest="json",
@@ -337,6 +414,7 @@ def generate_batch(
     """
     if isinstance(log, int):
         log = postgis.get_log(id=log)
+    postgis.verify_geometry_dimension()
     generate_batch = Batches(
         obra=obra,
         operatoria=operatoria,
@@ -363,13 +441,13 @@ def generate_batch(
             ):
                 chunk.columns = map(str.lower, chunk.columns)
                 for _, row in chunk.iterrows():
-                    parsed_geometry = (
-                        from_shape(row["geometry"], srid=postgis.coordsysid)
-                        if row["geometry"].has_z
-                        else func.ST_Force3D(
-                            WKTElement(row["geometry"].wkt, srid=postgis.coordsysid)
-                        )
+                    parsed_geometry = from_shape(
+                        row["geometry"], srid=postgis.coordsysid
                     )
+                    if postgis.dimension == 2 and row["geometry"].has_z:
+                        parsed_geometry = func.ST_Force2D(parsed_geometry)
+                    elif postgis.dimension == 3 and not row["geometry"].has_z:
+                        parsed_geometry = func.ST_Force3D(parsed_geometry)
                     generate_batch.geometries.append(
                         Geometries(
                             geometry=parsed_geometry,
@@ -0,0 +1,21 @@
+from starlette.applications import Starlette
+
+from api.asgi import postgis, routes
+from utils.config import settings
+
+# Endpoints de solo lectura servidos de forma asincrónica (ver api/asgi.py).
+app = Starlette(
+    debug=settings.DEBUG,
+    routes=routes,
+    on_shutdown=[postgis.dispose],
+)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "asgi:app",
+        host=settings.LISTEN_TO,
+        port=int(getattr(settings, "ASGI_PORT", 5002)),
+        workers=int(getattr(settings, "ASGI_WORKERS", 2)),
+    )
@@ -0,0 +1,201 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.config import settings
+from utils.fake_geoserver import FakeGeoserver
+
+# Benchmarks de publicación en Geoserver contra un servidor simulado (ver
+# utils/fake_geoserver.py). Los módulos que crean objetos Geoserver se importan
+# recién después de apuntar los settings al servidor simulado, ya que leen la
+# configuración al importarse.
+
+
+def configure(fake: FakeGeoserver) -> None:
+    settings.GEOSERVER_BASE_URL = fake.url
+    # Caché de listados propia del proceso, para no compartirla con otros servidores.
+    settings.GEOSERVER_CACHE_URL = None
+    # Sin workers de Celery, cada agregado se publica de inmediato.
+    settings.GEOSERVER_PUBLISH_DELAY = 0
+
+
+def report(name: str, operations: int, seconds: float, failures: int = 0) -> None:
+    print(
+        f"{name:<24} {operations:>6} ops {seconds:>9.3f} s "
+        f"{operations / seconds if seconds else 0:>9.1f} ops/s {failures:>5} failed"
+    )
+
+
+def fake_geoserver(args) -> FakeGeoserver:
+    return FakeGeoserver(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+
+
+def serve(args) -> None:
+    """
+    Ejecuta el servidor simulado hasta que se interrumpa, para apuntar a él una API o
+    workers de Celery mediante GEOSERVER_BASE_URL.
+    """
+    with fake_geoserver(args) as fake:
+        print(f"Fake Geoserver listening on {fake.url}")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            pass
+
+
+def bench_geoserver(args) -> None:
+    """
+    Compara la publicación secuencial de capas con la publicación concurrente de
+    AsyncGeoserver (creación, asignación de estilo, actualización y eliminación).
+    """
+    with fake_geoserver(args) as fake:
+        configure(fake)
+        from utils.async_geoserver_interface import AsyncGeoserver
+        from utils.geoserver_interface import Geoserver
+
+        geoserver = Geoserver()
+        async_geoserver = AsyncGeoserver(concurrency=args.concurrency)
+        geoserver.push_style(style="benchmark", data=b"<sld/>", if_exists="ignore")
+        layers = [f"benchmark_{i}" for i in range(args.layers)]
+        steps = [
+            ("push_layer", {"if_exists": "replace"}),
+            ("assign_style", {"style": "benchmark"}),
+            ("update_layer", {}),
+            ("delete_layer", {"if_not_exists": "ignore"}),
+        ]
+        for step, kwargs in steps:
+            failures = 0
+            start = time.perf_counter()
+            for layer in layers:
+                try:
+                    getattr(geoserver, step)(layer=layer, **kwargs)
+                except Exception:
+                    failures += 1
+            report(f"sync {step}", len(layers), time.perf_counter() - start, failures)
+        for step, kwargs in steps:
+            start = time.perf_counter()
+            results = async_geoserver.bulk(
+                lambda: [
+                    getattr(async_geoserver, step)(layer=layer, **kwargs)
+                    for layer in layers
+                ]
+            )
+            failures = sum(isinstance(result, Exception) for result in results)
+            report(f"async {step}", len(layers), time.perf_counter() - start, failures)
+        print(f"Requests: {dict(fake.requests)}")
+
+
+def bench_ingest(args) -> None:
+    """
+    Mide el throughput de punta a punta de la ingesta de un KML en PostGIS y su
+    publicación en Geoserver (creación de capas y agregado de lotes), con varios
+    workers en paralelo como los de Celery. Requiere la base de datos PostGIS.
+    """
+    with fake_geoserver(args) as fake:
+        configure(fake)
+        from api.geoserver.core import (
+            delete_layer,
+            kml_to_append_layer,
+            kml_to_create_layer,
+        )
+
+        layers = [f"{args.prefix}_{i}" for i in range(args.layers)]
+
+        def run(function, **kwargs) -> float:
+            start = time.perf_counter()
+            function(file=args.kml, **kwargs)
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            start = time.perf_counter()
+            list(
+                executor.map(
+                    lambda layer: run(kml_to_create_layer, layer=layer), layers
+                )
+            )
+            created = len([layer for layer in layers if layer in fake.layers])
+            report(
+                "create layer",
+                len(layers),
+                time.perf_counter() - start,
+                len(layers) - created,
+            )
+
+            appends = [layer for layer in layers for _ in range(args.appends)]
+            start = time.perf_counter()
+            latencies = sorted(
+                executor.map(
+                    lambda layer: run(kml_to_append_layer, layer=layer), appends
+                )
+            )
+            report("append batch", len(appends), time.perf_counter() - start)
+            if latencies:
+                print(
+                    f"Append latency: p50 {latencies[len(latencies) // 2]:.3f} s, "
+                    f"p95 {latencies[int(len(latencies) * 0.95)]:.3f} s"
+                )
+        print(f"Published layers: {created}/{len(layers)}")
+        print(f"Requests: {dict(fake.requests)}")
+        if not args.keep:
+            for layer in layers:
+                delete_layer(layer=layer, delete_geometries=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de ingesta y publicación contra un Geoserver simulado."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds per request."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Max extra random latency."
+    )
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="Probability of a 503."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("serve", help="Run the fake Geoserver.").set_defaults(
+        function=serve
+    )
+
+    geoserver_parser = commands.add_parser(
+        "geoserver", help="Geoserver client throughput."
+    )
+    geoserver_parser.add_argument("--layers", type=int, default=100)
+    geoserver_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(getattr(settings, "GEOSERVER_CONCURRENCY", 8)),
+    )
+    geoserver_parser.set_defaults(function=bench_geoserver)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="Ingest-to-publish throughput (needs PostGIS)."
+    )
+    ingest_parser.add_argument("--kml", required=True, help="KML file to ingest.")
+    ingest_parser.add_argument("--layers", type=int, default=10)
+    ingest_parser.add_argument(
+        "--appends", type=int, default=5, help="Batches appended per layer."
+    )
+    ingest_parser.add_argument("--workers", type=int, default=4)
+    ingest_parser.add_argument("--prefix", default="benchmark")
+    ingest_parser.add_argument(
+        "--keep", action="store_true", help="Keep the layers afterwards."
+    )
+    ingest_parser.set_defaults(function=bench_ingest)
+
+    args = parser.parse_args()
+    args.function(args)
@@ -0,0 +1,76 @@
+import argparse
+import sys
+
+from api.tiles.core import invalidate_tiles
+from models.tables import GEOMETRY_DIMENSION, Batches
+from utils.config import settings
+from utils.postgis_interface import PostGIS
+
+# Comandos de administración que modifican datos existentes y, por eso, no se
+# ejecutan desde las migraciones de Alembic.
+
+
+def geometry_dimension(args) -> None:
+    with PostGIS() as postgis:
+        current = postgis.geometry_dimension()
+        print(f"Stored dimension: {current}. GEOMETRY_DIMENSION: {GEOMETRY_DIMENSION}.")
+        if current is None:
+            sys.exit("The geometries table does not exist, run 'alembic upgrade head'.")
+        if current == GEOMETRY_DIMENSION:
+            return
+        if current > GEOMETRY_DIMENSION and not args.yes:
+            sys.exit(
+                "Converting to 2D discards the Z coordinate and cannot be undone. "
+                "Run again with --yes to proceed."
+            )
+        postgis.alter_geometry_dimension(GEOMETRY_DIMENSION)
+    print(f"Geometries converted to {GEOMETRY_DIMENSION}D.")
+
+
+def generalize(args) -> None:
+    with PostGIS() as postgis:
+        ids = [id for id, in postgis.session.query(Batches.id).order_by(Batches.id)]
+    # Una transacción por grupo de batches, para no retener bloqueos en toda la tabla.
+    done = 0
+    while done < len(ids):
+        end = min(done + args.chunksize, len(ids))
+        with PostGIS() as postgis:
+            postgis.generalize_batches(ids[done:end])
+        done = end
+        print(f"Generalized batches: {done}/{len(ids)}")
+    # Las vistas se recrean para exponer una columna por nivel configurado.
+    with PostGIS() as postgis:
+        layers = sorted(set(postgis.list_layers()) & set(postgis.list_views()))
+        for layer in layers:
+            postgis.create_view(layer, if_exists="replace")
+    invalidate_tiles(layers)
+    print(f"Views recreated: {len(layers)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comandos de administración.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dimension_parser = commands.add_parser(
+        "geometry-dimension",
+        help="Convert stored geometries to GEOMETRY_DIMENSION.",
+    )
+    dimension_parser.add_argument(
+        "--yes", action="store_true", help="Confirm a lossy 3D to 2D conversion."
+    )
+    dimension_parser.set_defaults(function=geometry_dimension)
+
+    generalize_parser = commands.add_parser(
+        "generalize",
+        help="Generalize every batch with GENERALIZATION_TOLERANCES and recreate views.",
+    )
+    generalize_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=int(getattr(settings, "DEFAULT_CHUNKSIZE", 50)),
+        help="Batches per transaction.",
+    )
+    generalize_parser.set_defaults(function=generalize)
+
+    args = parser.parse_args()
+    args.function(args)
@@ -0,0 +1,27 @@
+"""Índice espacial de geometrías
+
+Revision ID: 3f1c9a7d2b64
+Revises: 8c54fbb3ebc4
+Create Date: 2026-10-19 09:12:40.518223
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1c9a7d2b64"
+down_revision = "8c54fbb3ebc4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Asegura el índice GIST que utilizan las consultas por envolvente (teselas).
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_geometries_geometry "
+        "ON geoapi.geometries USING GIST (geometry)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS geoapi.idx_geometries_geometry")
@@ -5,6 +5,7 @@ Revises:
 Create Date: 2023-08-12 21:36:11.210835
 
 """
+
 import geoalchemy2
 import sqlalchemy as sa
 from alembic import op
@@ -0,0 +1,47 @@
+"""Dimensión de geometrías configurable
+
+Revision ID: d71b3e5a9c02
+Revises: a52e0d8c6f19
+Create Date: 2026-10-19 11:20:05.377410
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from models.tables import GEOMETRY_DIMENSION
+from utils.postgis_interface import PostGIS
+
+# revision identifiers, used by Alembic.
+revision = "d71b3e5a9c02"
+down_revision = "a52e0d8c6f19"
+branch_labels = None
+depends_on = None
+
+
+def is_empty() -> bool:
+    return not (
+        op.get_bind()
+        .execute(sa.text("SELECT EXISTS (SELECT 1 FROM geoapi.geometries)"))
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    # Sin geometrías almacenadas (ej: una instalación nueva) la conversión no pierde
+    # datos, por lo que la columna se adapta a GEOMETRY_DIMENSION. Con datos, se
+    # conserva la dimensión actual: pasar de 3 a 2 dimensiones descarta la
+    # coordenada Z, y se aplica explícitamente con `python manage.py
+    # geometry-dimension`. La ingesta rechaza las cargas mientras no coincidan.
+    postgis = PostGIS()
+    stored = postgis.geometry_dimension(connection=op.get_bind())
+    if stored != GEOMETRY_DIMENSION and is_empty():
+        postgis.alter_geometry_dimension(GEOMETRY_DIMENSION, connection=op.get_bind())
+
+
+def downgrade() -> None:
+    # La migración inicial declara la columna en 3 dimensiones.
+    postgis = PostGIS()
+    stored = postgis.geometry_dimension(connection=op.get_bind())
+    if stored != 3 and is_empty():
+        postgis.alter_geometry_dimension(3, connection=op.get_bind())
@@ -0,0 +1,49 @@
+"""Partición por defecto de logs
+
+Revision ID: f2d8a6c3b915
+Revises: e9c4b1d7f352
+Create Date: 2026-10-19 21:37:08.504126
+
+"""
+
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+from utils.postgis_interface import PostGIS
+
+# revision identifiers, used by Alembic.
+revision = "f2d8a6c3b915"
+down_revision = "e9c4b1d7f352"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Recibe los logs de los meses sin partición propia, que de otro modo se rechazan.
+    op.execute("CREATE TABLE geoapi.logs_default PARTITION OF geoapi.logs DEFAULT")
+
+
+def downgrade() -> None:
+    # Mueve los logs de la partición por defecto a particiones mensuales.
+    since, until = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT min(created_at)::date, max(created_at)::date "
+                "FROM geoapi.logs_default"
+            )
+        )
+        .one()
+    )
+    if since:
+        today = date.today()
+        PostGIS().create_log_partitions(
+            since=min(since, today),
+            months_ahead=max(
+                (until.year - today.year) * 12 + until.month - today.month, 0
+            ),
+            connection=op.get_bind(),
+        )
+    op.execute("DROP TABLE geoapi.logs_default")
@@ -0,0 +1,60 @@
+"""Metadata JSONB
+
+Revision ID: f4a6d1e9b238
+Revises: e83f2c4b7a15
+Create Date: 2026-10-19 13:55:08.241769
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from models.tables import GEOMETRIES_JSON_INDEX
+
+# revision identifiers, used by Alembic.
+revision = "f4a6d1e9b238"
+down_revision = "e83f2c4b7a15"
+branch_labels = None
+depends_on = None
+
+
+def tables() -> list:
+    return ["batches", "logs"] + (["geometries"] if GEOMETRIES_JSON_INDEX else [])
+
+
+def upgrade() -> None:
+    for table in ["batches", "geometries", "logs"]:
+        op.alter_column(
+            table,
+            "json",
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=postgresql.JSON(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using="json::jsonb",
+            schema="geoapi",
+        )
+    for table in tables():
+        op.create_index(
+            f"ix_{table}_json",
+            table,
+            ["json"],
+            unique=False,
+            schema="geoapi",
+            postgresql_using="gin",
+            postgresql_ops={"json": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    for table in ["batches", "geometries", "logs"]:
+        op.execute(f"DROP INDEX IF EXISTS geoapi.ix_{table}_json")
+        op.alter_column(
+            table,
+            "json",
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using="json::json",
+            schema="geoapi",
+        )
@@ -4,16 +4,57 @@ from urllib.parse import urlparse
 import pytz
 from geoalchemy2 import Geometry
 from sqlalchemy import MetaData, event
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext import declarative
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 from sqlalchemy.sql import func
-from sqlalchemy.sql.schema import Column, ForeignKey
-from sqlalchemy.sql.sqltypes import DateTime, Integer, String
+from sqlalchemy.sql.schema import Column, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql.sqltypes import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+)
 
 from utils.config import settings
 from utils.general import clean_nones
 
+# Dimensión con la que se almacenan las geometrías (2: XY, 3: XYZ).
+GEOMETRY_DIMENSION = int(getattr(settings, "GEOMETRY_DIMENSION", 3))
+
+# Indexa la metadata de geometrías (tabla de mayor volumen) solo si se configura.
+GEOMETRIES_JSON_INDEX = bool(getattr(settings, "GEOMETRIES_JSON_INDEX", False))
+
+# Cantidad máxima de IDs de geometrías incluidos en el registro de un lote.
+BATCH_RECORD_GEOMETRIES = int(getattr(settings, "BATCH_RECORD_GEOMETRIES", 1000))
+
+
+def json_index(table: str) -> Index:
+    """
+    Índice GIN sobre la columna `json` de una tabla, para búsquedas por contención (@>).
+    """
+    return Index(
+        f"ix_{table}_json",
+        "json",
+        postgresql_using="gin",
+        postgresql_ops={"json": "jsonb_path_ops"},
+    )
+
+
+def geometry_type(dimension: int = GEOMETRY_DIMENSION) -> Geometry:
+    """
+    Tipo de columna para geometrías, según el sistema de coordenadas y la dimensión
+    configurados (o la indicada).
+    """
+    return Geometry(
+        "GEOMETRYZ" if dimension == 3 else "GEOMETRY",
+        srid=int(settings.COORDINATE_SYSTEM.split(":")[-1]),
+        dimension=dimension,
+    )
+
 
 def declarative_base(cls):
     return declarative.declarative_base(
@@ -123,14 +164,16 @@ class Batches(Base):
         categoria (Column): Columna de tipo String que representa la categoría.
         ente (Column): Columna de tipo String que representa el ente.
         fuente (Column): Columna de tipo String que representa la fuente.
-        json (Column): Columna de tipo JSON que almacena datos adicionales en formato JSON.
+        json (Column): Columna de tipo JSONB que almacena datos adicionales en formato JSON.
         layer_id (Column): Columna de tipo Integer que representa la clave externa a la tabla de capas.
         layer (relationship): Relación con la tabla de capas (Layers).
+        geometries_count (Column): Columna de tipo BigInteger con la cantidad de geometrías del lote (ver triggers).
         record (property): Propiedad que devuelve un diccionario con los campos relevantes del lote.
 
     """
 
     __tablename__ = "batches"
+    __table_args__ = (json_index("batches"), {"extend_existing": True})
 
     obra = Column(String, nullable=True, default=None)
     operatoria = Column(String, nullable=True, default=None)
@@ -144,31 +187,70 @@ class Batches(Base):
     categoria = Column(String, nullable=True, default=None)
     ente = Column(String, nullable=True, default=None)
     fuente = Column(String, nullable=True, default=None)
-    json = Column(JSON, nullable=True, default=None)
+    json = Column(JSONB, nullable=True, default=None)
 
     layer_id = Column(
-        Integer, ForeignKey("layers.id", ondelete="SET NULL"), nullable=True
+        Integer,
+        ForeignKey("layers.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
     layer = relationship("Layers", backref="batches")
 
+    # Se actualiza con triggers al insertar o eliminar geometrías, para no contarlas
+    # en cada consulta del lote.
+    geometries_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     @property
     def layer_name(self):
         return self.layer.name if self.layer else None
 
+    def geometry_ids(self, after: int = 0, limit: int = None) -> list:
+        """
+        Devuelve los IDs de las geometrías del lote, en orden ascendente, sin cargar
+        las geometrías.
+
+        Args:
+            after (int): Devuelve solo IDs mayores a este valor (por defecto: 0).
+            limit (int): Cantidad máxima de IDs (por defecto: todos).
+
+        Returns:
+            list: IDs de las geometrías.
+
+        """
+        session = object_session(self)
+        if session is None or self.id is None:
+            return []
+        return [
+            id
+            for id, in session.query(Geometries.id)
+            .filter(Geometries.batch_id == self.id, Geometries.id > after)
+            .order_by(Geometries.id)
+            .limit(limit)
+        ]
+
     @property
     def record(self):
         """
         Devuelve un diccionario con los campos relevantes del lote.
 
+        La lista de geometrías se limita a los primeros BATCH_RECORD_GEOMETRIES IDs;
+        el total se informa en `geometries_count` y el listado completo se obtiene
+        paginado con `geometry_ids`.
+
         Returns:
             dict: Diccionario con los campos relevantes del lote.
 
         """
+        ids = self.geometry_ids(limit=BATCH_RECORD_GEOMETRIES + 1)
+        truncated = len(ids) > BATCH_RECORD_GEOMETRIES
         return clean_nones(
             {
                 "id": self.id,
                 "layer": self.layer_name,
-                "geometries": [geometry.id for geometry in self.geometries],
+                "geometries": ids[:BATCH_RECORD_GEOMETRIES],
+                "geometries_count": self.geometries_count if truncated else len(ids),
+                "geometries_truncated": truncated,
                 "obra": self.obra,
                 "operatoria": self.operatoria,
                 "provincia": self.provincia,
@@ -193,39 +275,183 @@ class Geometries(Base):
 
     Atributos:
         __tablename__ (str): Nombre de la tabla en la base de datos.
-        geometry (Column): Columna de tipo Geometry que representa la geometría.
+        geometry (Column): Columna de tipo Geometry que representa la geometría, en 2 o 3
+            dimensiones según GEOMETRY_DIMENSION.
         name (Column): Columna de tipo String que representa el nombre de la geometría.
         description (Column): Columna de tipo String que representa la descripción de la geometría.
-        json (Column): Columna de tipo JSON que almacena datos adicionales en formato JSON.
+        json (Column): Columna de tipo JSONB que almacena datos adicionales en formato JSON.
         batch_id (Column): Columna de tipo Integer que representa la clave externa a la tabla de lotes.
         batch (relationship): Relación con la tabla de lotes (Batches).
 
     """
 
     __tablename__ = "geometries"
-
-    geometry = Column(
-        Geometry(
-            "GEOMETRYZ",
-            srid=int(settings.COORDINATE_SYSTEM.split(":")[-1]),
-            dimension=3,
-        ),
-        nullable=False,
+    __table_args__ = (
+        *([json_index("geometries")] if GEOMETRIES_JSON_INDEX else []),
+        {"extend_existing": True},
     )
+
+    geometry = Column(geometry_type(), nullable=False)
     name = Column(String, nullable=True, default=None)
     description = Column(String, nullable=True, default=None)
-    json = Column(JSON, nullable=True, default=None)
+    json = Column(JSONB, nullable=True, default=None)
 
     batch_id = Column(
-        Integer, ForeignKey("batches.id", ondelete="RESTRICT"), nullable=True
+        Integer,
+        ForeignKey("batches.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
     )
     batch = relationship("Batches", backref="geometries")
 
 
+class GeneralizedGeometries(Base):
+    """
+    Definición de tabla para versiones generalizadas de las geometrías.
+
+    Cada geometría tiene una versión simplificada por nivel de generalización, calculada
+    con `ST_SimplifyPreserveTopology` según las tolerancias de GENERALIZATION_TOLERANCES.
+
+    Atributos:
+        __tablename__ (str): Nombre de la tabla en la base de datos.
+        level (Column): Columna de tipo Integer que representa el nivel (1 = menor tolerancia).
+        tolerance (Column): Columna de tipo Float que representa la tolerancia utilizada.
+        geometry (Column): Columna de tipo Geometry que representa la geometría generalizada.
+        geometry_id (Column): Columna de tipo Integer que representa la clave externa a la tabla de geometrías.
+
+    """
+
+    __tablename__ = "generalized_geometries"
+    __table_args__ = (
+        UniqueConstraint("geometry_id", "level"),
+        {"extend_existing": True},
+    )
+
+    level = Column(Integer, nullable=False)
+    tolerance = Column(Float, nullable=False)
+    geometry = Column(geometry_type(), nullable=False)
+
+    geometry_id = Column(
+        Integer, ForeignKey("geometries.id", ondelete="CASCADE"), nullable=False
+    )
+
+
+class LayerStatistics(Base):
+    """
+    Definición de tabla para las estadísticas de las capas.
+
+    Las estadísticas se mantienen en forma incremental mediante triggers sobre las
+    tablas de geometrías y lotes: cada sentencia que inserta o elimina geometrías agrega
+    una fila con la variación correspondiente a cada capa afectada. Al insertar filas
+    nuevas en lugar de actualizar una fila por capa, las ingestas concurrentes sobre una
+    misma capa no se bloquean entre sí. Las estadísticas de una capa son la suma de sus
+    filas, que se compactan periódicamente en una sola.
+
+    Atributos:
+        __tablename__ (str): Nombre de la tabla en la base de datos.
+        features (Column): Columna de tipo BigInteger que representa la variación en la
+            cantidad de geometrías.
+        geometry_types (Column): Columna de tipo JSONB con la variación en la cantidad de
+            geometrías por tipo (ej: {"POLYGON": 10}).
+        area (Column): Columna de tipo Float con la variación del área total, en metros
+            cuadrados.
+        length (Column): Columna de tipo Float con la variación de la longitud total de
+            las líneas, en metros.
+        vertices (Column): Columna de tipo BigInteger con la variación en la cantidad de
+            vértices.
+        minx (Column): Columna de tipo Float con la coordenada X mínima de la extensión.
+        miny (Column): Columna de tipo Float con la coordenada Y mínima de la extensión.
+        maxx (Column): Columna de tipo Float con la coordenada X máxima de la extensión.
+        maxy (Column): Columna de tipo Float con la coordenada Y máxima de la extensión.
+        extent_stale (Column): Columna de tipo Boolean que indica que se eliminaron
+            geometrías, por lo que la extensión puede ser mayor a la real hasta la
+            siguiente compactación.
+        layer_id (Column): Columna de tipo Integer que representa la clave externa a la tabla de capas.
+
+    """
+
+    __tablename__ = "layer_statistics"
+
+    features = Column(BigInteger, nullable=False, default=0)
+    geometry_types = Column(JSONB, nullable=False, default=dict)
+    area = Column(Float, nullable=False, default=0)
+    length = Column(Float, nullable=False, default=0)
+    vertices = Column(BigInteger, nullable=False, default=0)
+    minx = Column(Float, nullable=True, default=None)
+    miny = Column(Float, nullable=True, default=None)
+    maxx = Column(Float, nullable=True, default=None)
+    maxy = Column(Float, nullable=True, default=None)
+    extent_stale = Column(Boolean, nullable=False, default=False)
+
+    layer_id = Column(
+        Integer,
+        ForeignKey("layers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+
+class LayerRegistry(Base):
+    """
+    Definición de tabla para el registro de capas (layer_registry).
+
+    Registra por nombre el estado de cada capa en PostGIS y en Geoserver, para validar
+    las solicitudes con una sola consulta indexada en lugar de listar las capas de
+    ambos servidores. La presencia en PostGIS se mantiene con triggers sobre `layers`;
+    el estado de publicación, el estilo y la extensión los actualizan las operaciones
+    de la API, y una tarea periódica los concilia con Geoserver.
+
+    Atributos:
+        __tablename__ (str): Nombre de la tabla en la base de datos.
+        name (Column): Columna de tipo String que representa el nombre de la capa.
+        in_postgis (Column): Columna de tipo Boolean que indica si la capa existe en
+            PostGIS.
+        published (Column): Columna de tipo Boolean que indica si la capa está publicada
+            en Geoserver (NULL si aún no se conoce).
+        style (Column): Columna de tipo String con el estilo asignado por la API.
+        minx (Column): Columna de tipo Float con la coordenada X mínima publicada.
+        miny (Column): Columna de tipo Float con la coordenada Y mínima publicada.
+        maxx (Column): Columna de tipo Float con la coordenada X máxima publicada.
+        maxy (Column): Columna de tipo Float con la coordenada Y máxima publicada.
+        published_at (Column): Columna de tipo DateTime con la fecha de la última
+            publicación.
+        reconciled_at (Column): Columna de tipo DateTime con la fecha de la última
+            conciliación con Geoserver.
+        pending_batches (Column): Columna de tipo ARRAY de Integer con los IDs de los
+            batches agregados que aún no se publicaron en Geoserver.
+        publish_requested_at (Column): Columna de tipo DateTime con la fecha de la
+            primera solicitud de publicación pendiente.
+        publish_due_at (Column): Columna de tipo DateTime con la fecha en que se
+            publican las solicitudes pendientes (NULL si no hay ninguna).
+
+    """
+
+    __tablename__ = "layer_registry"
+
+    name = Column(String, nullable=False, unique=True)
+    in_postgis = Column(Boolean, nullable=False, default=False)
+    published = Column(Boolean, nullable=True, default=None)
+    style = Column(String, nullable=True, default=None)
+    minx = Column(Float, nullable=True, default=None)
+    miny = Column(Float, nullable=True, default=None)
+    maxx = Column(Float, nullable=True, default=None)
+    maxy = Column(Float, nullable=True, default=None)
+    published_at = Column(DateTime, nullable=True, default=None)
+    reconciled_at = Column(DateTime, nullable=True, default=None)
+    pending_batches = Column(
+        ARRAY(Integer), nullable=False, default=list, server_default="{}"
+    )
+    publish_requested_at = Column(DateTime, nullable=True, default=None)
+    publish_due_at = Column(DateTime, nullable=True, default=None)
+
+
 class Logs(Base):
     """
     Definición de tabla para registros de registro (logs).
 
+    La tabla está particionada por rango mensual de `created_at` (ver LogPartitions),
+    por lo que su clave primaria en la base de datos es (id, created_at).
+
     Atributos:
         __tablename__ (str): Nombre de la tabla en la base de datos.
         endpoint (Column): Columna de tipo String que representa el endpoint.
@@ -233,7 +459,7 @@ class Logs(Base):
         status (Column): Columna de tipo String que representa el estado.
         message (Column): Columna de tipo String que representa el mensaje.
         url (Column): Columna de tipo String que representa la URL.
-        json (Column): Columna de tipo JSON que almacena datos adicionales en formato JSON.
+        json (Column): Columna de tipo JSONB que almacena datos adicionales en formato JSON.
         batch_id (Column): Columna de tipo Integer que representa la clave externa a la tabla de lotes.
         batch (relationship): Relación con la tabla de lotes (Batches).
         record (property): Propiedad que devuelve un diccionario con los campos relevantes del registro.
@@ -243,13 +469,14 @@ class Logs(Base):
     """
 
     __tablename__ = "logs"
+    __table_args__ = (json_index("logs"), {"extend_existing": True})
 
     endpoint = Column(String, nullable=True, default=None)
     layer = Column(String, nullable=True, default=None)
     status = Column(Integer, nullable=True, default=None)
     message = Column(String, nullable=True, default=None)
     url = Column(String, nullable=True, default=None)
-    json = Column(JSON, nullable=True, default=None)
+    json = Column(JSONB, nullable=True, default=None)
 
     batch_id = Column(
         Integer, ForeignKey("batches.id", ondelete="RESTRICT"), nullable=True
@@ -319,6 +546,35 @@ class Logs(Base):
         )
 
 
+class LogPartitions(Base):
+    """
+    Definición de tabla para las particiones mensuales de los logs.
+
+    Permite resolver a qué partición pertenece un ID de log sin recorrerlas todas: los
+    IDs se asignan en forma creciente, por lo que el primer ID de cada partición acota
+    el rango de `created_at` en el que debe buscarse.
+
+    Atributos:
+        __tablename__ (str): Nombre de la tabla en la base de datos.
+        name (Column): Columna de tipo String que representa el nombre de la partición.
+        starts_at (Column): Columna de tipo Date que representa el inicio del rango (incluido).
+        ends_at (Column): Columna de tipo Date que representa el fin del rango (excluido).
+        first_id (Column): Columna de tipo Integer que representa el primer ID de log de
+            la partición, o None si aún no se registró.
+        archive (Column): Columna de tipo String que representa la ruta del archivo en el
+            que se archivó la partición, o None si sigue adjunta.
+
+    """
+
+    __tablename__ = "log_partitions"
+
+    name = Column(String, nullable=False, unique=True)
+    starts_at = Column(Date, nullable=False)
+    ends_at = Column(Date, nullable=False)
+    first_id = Column(Integer, nullable=True, default=None, index=True)
+    archive = Column(String, nullable=True, default=None)
+
+
 @event.listens_for(Logs, "before_update")
 def autoupdate_logs(mapper, connection, log):
     log.url = log.get_url()
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+# Los módulos de la API leen la configuración al importarse: sin un settings.toml
+# propio, las pruebas utilizan el de ejemplo.
+os.environ.setdefault(
+    "SETTINGS",
+    os.path.join(os.path.dirname(__file__), "..", "..", "etc", "settings.example.toml"),
+)
+
+from utils.fake_geoserver import FakeGeoserver  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    with FakeGeoserver() as fake:
+        yield fake
+
+
+@pytest.fixture
+def options(fake, tmp_path):
+    # Sin caché de listados ni reintentos, para que cada consulta llegue al servidor.
+    return {
+        "base_url": fake.url,
+        "cache_url": None,
+        "cache_ttl": 0,
+        "retries": 0,
+        "style_cache_dir": str(tmp_path),
+    }
+
+
+@pytest.fixture
+def postgis():
+    # Las pruebas de base de datos requieren un PostGIS con las migraciones aplicadas
+    # (ej: el de docker-compose); si no está disponible, se omiten.
+    pytest.importorskip("sqlalchemy")
+    from utils.postgis_interface import PostGIS
+
+    postgis = PostGIS()
+    try:
+        available = postgis.status and "layer_registry" in postgis.list_tables()
+    except Exception:
+        available = False
+    if not available:
+        pytest.skip("PostGIS with the current migrations is not available.")
+    with postgis:
+        yield postgis
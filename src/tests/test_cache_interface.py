@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from utils.cache_interface import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path), ttl=60)
+
+
+def test_disk_cache_set_get_invalidate(cache):
+    cache.set(b"tile", "layer", 1, 2, "3.mvt")
+    assert cache.get("layer", 1, 2, "3.mvt") == b"tile"
+    cache.invalidate("layer")
+    assert cache.get("layer", 1, 2, "3.mvt") is None
+
+
+def test_disk_cache_rejects_paths_outside_base_dir(cache):
+    with pytest.raises(ValueError):
+        cache.path("..", "outside")
+
+
+def test_disk_cache_late_write_to_old_generation_is_not_read(cache):
+    old = cache.generation("layer")
+    new = cache.new_generation("layer")
+    assert new != old and cache.generation("layer") == new
+    # Una tesela calculada antes de la invalidación se guarda después de ella.
+    cache.set(b"stale", "layer", old, 0, 0, "0.mvt")
+    assert cache.get("layer", new, 0, 0, "0.mvt") is None
+    cache.prune_generations("layer")
+    assert not os.path.exists(cache.path("layer", old))
+
+
+def test_disk_cache_expires_and_prunes_entries(cache):
+    generation = cache.new_generation("layer")
+    cache.set(b"tile", "layer", generation, 0, 0, "0.mvt")
+    os.utime(cache.path("layer", generation, 0, 0, "0.mvt"), (0, 0))
+    assert cache.get("layer", generation, 0, 0, "0.mvt") is None
+    assert cache.prune() == 1
+    assert not os.path.exists(cache.path("layer", generation))
+    assert cache.generation("layer") == generation
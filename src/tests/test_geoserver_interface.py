@@ -0,0 +1,65 @@
+import pytest
+from requests.exceptions import HTTPError
+
+from utils.async_geoserver_interface import AsyncGeoserver
+from utils.fake_geoserver import FakeGeoserver
+from utils.geoserver_interface import Geoserver
+
+
+@pytest.fixture
+def geoserver(options):
+    return Geoserver(**options)
+
+
+def test_push_update_and_delete_layer(fake, geoserver):
+    geoserver.push_layer(layer="test")
+    assert "test" in geoserver.list_layers()
+    assert geoserver.get_featuretype(layer="test")["nativeName"] == "test"
+
+    geoserver.update_layer(layer="test", minx=-60, maxx=-58, miny=-35, maxy=-34)
+    assert fake.requests["update_featuretype"] == 1
+
+    geoserver.delete_layer(layer="test")
+    assert "test" not in fake.layers
+    assert "test" not in geoserver.list_layers()
+
+
+def test_push_layer_fails_if_exists(geoserver):
+    geoserver.push_layer(layer="test")
+    with pytest.raises(ValueError):
+        geoserver.push_layer(layer="test")
+    geoserver.push_layer(layer="test", if_exists="ignore")
+
+
+def test_assign_style(fake, geoserver):
+    geoserver.push_style(style="style", data=b"<sld/>")
+    geoserver.push_layer(layer="test")
+    geoserver.assign_style(style="style", layer="test")
+    assert fake.layers["test"]["style"] == "style"
+
+
+def test_async_bulk(fake, options):
+    async_geoserver = AsyncGeoserver(concurrency=4, **options)
+    layers = [f"layer_{i}" for i in range(10)]
+    results = async_geoserver.bulk(
+        lambda: [async_geoserver.push_layer(layer=layer) for layer in layers]
+    )
+    assert results == [None] * len(layers)
+    assert set(fake.layers) == set(layers)
+
+    results = async_geoserver.bulk(
+        lambda: [async_geoserver.delete_layer(layer=layer) for layer in layers]
+    )
+    assert results == [None] * len(layers)
+    assert not fake.layers
+
+
+def test_async_bulk_returns_failures(options):
+    with FakeGeoserver(failure_rate=1) as failing:
+        async_geoserver = AsyncGeoserver(
+            concurrency=4, **{**options, "base_url": failing.url}
+        )
+        results = async_geoserver.bulk(
+            lambda: [async_geoserver.push_layer(layer=f"layer_{i}") for i in range(3)]
+        )
+    assert all(isinstance(result, HTTPError) for result in results)
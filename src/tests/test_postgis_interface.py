@@ -0,0 +1,116 @@
+import uuid
+from datetime import date, datetime, time
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from models.tables import GEOMETRY_DIMENSION, Batches, Geometries  # noqa: E402
+from utils.config import settings  # noqa: E402
+from utils.general import add_months  # noqa: E402
+
+
+def point(postgis, x: float, y: float) -> str:
+    if GEOMETRY_DIMENSION == 3:
+        return f"SRID={postgis.coordsysid};POINT Z ({x} {y} 0)"
+    return f"SRID={postgis.coordsysid};POINT ({x} {y})"
+
+
+@pytest.fixture
+def batch(postgis):
+    layer = postgis.get_or_create_layer(name=f"test_statistics_{uuid.uuid4().hex[:8]}")
+    batch = Batches(layer=layer)
+    postgis.session.add(batch)
+    postgis.session.commit()
+    yield batch
+    postgis.drop_batches(batch.id, cascade=True)
+    postgis.drop_layer(layer.name, if_not_exists="ignore")
+
+
+def test_statistics_follow_inserted_and_deleted_geometries(postgis, batch):
+    geometries = [
+        Geometries(geometry=point(postgis, -60, -35), batch=batch),
+        Geometries(geometry=point(postgis, -58, -34), batch=batch),
+    ]
+    postgis.session.add_all(geometries)
+    postgis.session.commit()
+
+    statistics = postgis.get_layer_statistics(batch.layer_name)
+    assert statistics["features"] == 2
+    assert statistics["geometry_types"] == {"POINT": 2}
+    assert statistics["bbox"] == {"minx": -60, "miny": -35, "maxx": -58, "maxy": -34}
+    assert statistics["bbox_exact"]
+    postgis.session.refresh(batch)
+    assert batch.geometries_count == 2
+
+    postgis.drop_geometries(geometries[0].id)
+    statistics = postgis.get_layer_statistics(batch.layer_name)
+    assert statistics["features"] == 1
+    assert statistics["geometry_types"] == {"POINT": 1}
+    # La extensión no se reduce hasta la próxima compactación.
+    assert not statistics["bbox_exact"]
+    postgis.session.refresh(batch)
+    assert batch.geometries_count == 1
+
+    postgis.compact_layer_statistics()
+    statistics = postgis.get_layer_statistics(batch.layer_name)
+    assert statistics["bbox"] == {"minx": -58, "miny": -34, "maxx": -58, "maxy": -34}
+    assert statistics["bbox_exact"]
+
+
+def test_log_partition_takes_rows_from_default_partition(postgis):
+    if postgis.LOG_DEFAULT_PARTITION not in postgis.list_tables():
+        pytest.skip("The logs default partition does not exist.")
+    # Un mes posterior a los que crea el mantenimiento, sin partición propia.
+    months_ahead = int(getattr(settings, "LOGS_PARTITIONS_AHEAD", 3)) + 6
+    month = add_months(date.today(), months_ahead)
+    name = postgis.log_partition_name(month)
+    assert name not in postgis.list_tables()
+    created_at = datetime.combine(month, time(12))
+    with postgis.engine.begin() as connection:
+        log_id = connection.execute(
+            sqlalchemy.text(
+                f"""
+                INSERT INTO {postgis.relation('logs')} (endpoint, created_at, updated_at)
+                VALUES ('tests', :created_at, :created_at)
+                RETURNING id
+                """
+            ),
+            {"created_at": created_at},
+        ).scalar()
+
+    def count(table: str) -> int:
+        with postgis.engine.connect() as connection:
+            return connection.execute(
+                sqlalchemy.text(
+                    f"SELECT count(*) FROM {postgis.relation(table)} WHERE id = :id"
+                ),
+                {"id": log_id},
+            ).scalar()
+
+    try:
+        assert count(postgis.LOG_DEFAULT_PARTITION) == 1
+        assert postgis.create_log_partitions(
+            since=month, months_ahead=months_ahead
+        ) == [name]
+        assert count(postgis.LOG_DEFAULT_PARTITION) == 0
+        assert count(name) == 1
+        assert count("logs") == 1
+    finally:
+        with postgis.engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(
+                    f"DELETE FROM {postgis.relation('logs')} WHERE id = :id"
+                ),
+                {"id": log_id},
+            )
+            connection.execute(
+                sqlalchemy.text(f"DROP TABLE IF EXISTS {postgis.relation(name)}")
+            )
+            connection.execute(
+                sqlalchemy.text(
+                    f"DELETE FROM {postgis.relation('log_partitions')} "
+                    "WHERE name = :name"
+                ),
+                {"name": name},
+            )
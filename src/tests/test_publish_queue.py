@@ -0,0 +1,112 @@
+import threading
+import uuid
+
+import pytest
+from requests.exceptions import HTTPError
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+pytest.importorskip("flask_restx")
+
+from api.geoserver import core  # noqa: E402
+from api.tiles import core as tiles_core  # noqa: E402
+from utils.fake_geoserver import FakeGeoserver  # noqa: E402
+from utils.geoserver_interface import Geoserver  # noqa: E402
+from utils.postgis_interface import PostGIS  # noqa: E402
+
+
+@pytest.fixture
+def layer(postgis):
+    name = f"test_publish_{uuid.uuid4().hex[:8]}"
+    postgis.session.add(postgis.get_or_create_layer(name=name))
+    postgis.session.commit()
+    postgis.register_layer(name, published=True)
+    yield name
+    with postgis.engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                f"DELETE FROM {postgis.relation('layer_registry')} WHERE name = :layer"
+            ),
+            {"layer": name},
+        )
+    postgis.drop_layer(name, if_not_exists="ignore")
+
+
+@pytest.fixture
+def geoserver(options, monkeypatch):
+    geoserver = Geoserver(**options)
+    monkeypatch.setattr(core, "geoserver", geoserver)
+    monkeypatch.setattr(tiles_core, "geoserver", geoserver)
+    return geoserver
+
+
+def test_requests_are_coalesced_until_due(postgis, layer):
+    due_in = postgis.request_publish(layer, [1], delay=60, max_delay=600)
+    assert 0 < due_in <= 60
+    # Las solicitudes siguientes se acumulan en la publicación ya programada.
+    assert postgis.request_publish(layer, [2, 1], delay=60, max_delay=600) is None
+    batches, due_in = postgis.claim_publish(layer)
+    assert batches is None and 0 < due_in <= 60
+
+    assert postgis.request_publish(layer, [3], delay=0, max_delay=600) is None
+    assert postgis.claim_publish(layer) == ([1, 2, 3], None)
+    assert postgis.claim_publish(layer) == (None, None)
+
+
+def test_requests_are_published_after_max_delay(postgis, layer):
+    postgis.request_publish(layer, [1], delay=60, max_delay=600)
+    # Simula una capa que recibe agregados continuamente desde hace 10 minutos.
+    with postgis.engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                f"""
+                UPDATE {postgis.relation('layer_registry')}
+                SET publish_requested_at = publish_requested_at - interval '600 seconds'
+                WHERE name = :layer
+                """
+            ),
+            {"layer": layer},
+        )
+    postgis.request_publish(layer, [2], delay=60, max_delay=600)
+    assert postgis.claim_publish(layer) == ([1, 2], None)
+
+
+def test_concurrent_claims_take_batches_once(postgis, layer):
+    postgis.request_publish(layer, [1, 2], delay=0, max_delay=0)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def claim():
+        barrier.wait()
+        results.append(PostGIS().claim_publish(layer))
+
+    threads = [threading.Thread(target=claim) for _ in range(barrier.parties)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results, key=lambda result: result[0] is None) == [
+        ([1, 2], None),
+        *[(None, None)] * (barrier.parties - 1),
+    ]
+
+
+def test_publish_layer_updates_geoserver(postgis, layer, fake, geoserver):
+    postgis.request_publish(layer, [1, 2], delay=0, max_delay=0)
+    assert core.publish_layer(layer) is None
+    assert layer in fake.layers
+    assert postgis.claim_publish(layer) == (None, None)
+    assert postgis.get_layer_registry(layer)["published"]
+
+
+def test_publish_layer_requeues_on_geoserver_failure(
+    postgis, layer, options, monkeypatch
+):
+    with FakeGeoserver(failure_rate=1) as failing:
+        geoserver = Geoserver(**{**options, "base_url": failing.url})
+        monkeypatch.setattr(core, "geoserver", geoserver)
+        monkeypatch.setattr(tiles_core, "geoserver", geoserver)
+        postgis.request_publish(layer, [1, 2], delay=0, max_delay=0)
+        with pytest.raises(HTTPError):
+            core.publish_layer(layer)
+    # Los batches vuelven a quedar pendientes, listos para el próximo intento.
+    assert postgis.claim_publish(layer) == ([1, 2], None)
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List
+
+from utils.config import settings
+from utils.geoserver_interface import Geoserver
+
+
+class AsyncGeoserver:
+    """
+    Una interfaz asincrónica para la API REST de Geoserver, para operaciones masivas.
+
+    Refleja las operaciones de Geoserver como corrutinas que pueden ejecutarse en forma
+    concurrente, con un límite de solicitudes simultáneas al servidor. Cada operación se
+    ejecuta en un hilo con la interfaz sincrónica, por lo que comparte su pool de
+    conexiones persistentes, sus reintentos y la invalidación de la caché de listados.
+
+    Args:
+        concurrency (int): Cantidad máxima de solicitudes simultáneas a Geoserver
+            (por defecto: GEOSERVER_CONCURRENCY o 8).
+        **kwargs: Argumentos de Geoserver.
+
+    """
+
+    def __init__(
+        self,
+        concurrency: int = int(getattr(settings, "GEOSERVER_CONCURRENCY", 8)),
+        **kwargs,
+    ):
+        # El pool de conexiones debe admitir todas las solicitudes simultáneas.
+        kwargs["pool_size"] = max(
+            kwargs.get("pool_size", getattr(settings, "GEOSERVER_POOL_SIZE", 10)),
+            concurrency,
+        )
+        self._geoserver = Geoserver(**kwargs)
+        self._concurrency = concurrency
+        self._semaphore = None
+        self._loop = None
+
+    @property
+    def geoserver(self) -> Geoserver:
+        return self._geoserver
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # El semáforo queda ligado al event loop en el que se crea.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta una operación sincrónica de Geoserver respetando el límite de
+        concurrencia.
+
+        Args:
+            function (Callable[..., Any]): Operación a ejecutar.
+            *args: Argumentos posicionales de la operación.
+            **kwargs: Argumentos clave de la operación.
+
+        Returns:
+            Any: Resultado de la operación.
+
+        """
+        async with self.semaphore:
+            return await asyncio.to_thread(function, *args, **kwargs)
+
+    async def push_layer(self, **kwargs) -> None:
+        return await self.run(self.geoserver.push_layer, **kwargs)
+
+    async def update_layer(self, **kwargs) -> None:
+        return await self.run(self.geoserver.update_layer, **kwargs)
+
+    async def delete_layer(self, **kwargs) -> None:
+        return await self.run(self.geoserver.delete_layer, **kwargs)
+
+    async def get_featuretype(self, **kwargs) -> dict:
+        return await self.run(self.geoserver.get_featuretype, **kwargs)
+
+    async def push_style(self, **kwargs) -> None:
+        return await self.run(self.geoserver.push_style, **kwargs)
+
+    async def assign_style(self, **kwargs) -> None:
+        return await self.run(self.geoserver.assign_style, **kwargs)
+
+    async def delete_style(self, **kwargs) -> None:
+        return await self.run(self.geoserver.delete_style, **kwargs)
+
+    @staticmethod
+    async def gather(operations: Iterable[Awaitable]) -> List[Any]:
+        """
+        Ejecuta una serie de operaciones en forma concurrente.
+
+        Args:
+            operations (Iterable[Awaitable]): Operaciones a ejecutar.
+
+        Returns:
+            List[Any]: Resultado de cada operación, en el mismo orden, o la excepción
+                que produjo si falló.
+
+        """
+        return await asyncio.gather(*operations, return_exceptions=True)
+
+    def bulk(self, operations: Callable[[], Iterable[Awaitable]]) -> List[Any]:
+        """
+        Ejecuta una serie de operaciones en forma concurrente desde código sincrónico
+        (ej: una tarea de Celery).
+
+        Args:
+            operations (Callable[[], Iterable[Awaitable]]): Función que devuelve las
+                operaciones a ejecutar; se invoca dentro del event loop.
+
+        Returns:
+            List[Any]: Resultado de cada operación, en el mismo orden, o la excepción
+                que produjo si falló.
+
+        """
+        return asyncio.run(self.gather(operations()))
@@ -0,0 +1,89 @@
+import asyncio
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from utils.config import settings
+from utils.postgis_interface import PostGIS
+
+
+class AsyncPostGIS(PostGIS):
+    """
+    Una interfaz asincrónica de solo lectura para PostGIS, para servir consultas
+    desde un servidor ASGI.
+
+    Las consultas se ejecutan con SQLAlchemy asyncio sobre asyncpg. Para no duplicar
+    la lógica de lectura, `run` ejecuta funciones sincrónicas que reciben un objeto
+    PostGIS ligado a la sesión asincrónica: SQLAlchemy las corre en un greenlet, por
+    lo que cada consulta (incluidas las cargas diferidas de relaciones) cede el
+    control al event loop en lugar de bloquear el proceso.
+
+    Args:
+        async_driver (str): Driver asincrónico de conexión
+            (por defecto: "postgresql+asyncpg").
+        **kwargs: Argumentos de PostGIS.
+
+    """
+
+    # Motores asincrónicos compartidos por todas las instancias del proceso.
+    _async_engines: dict = {}
+
+    def __init__(
+        self,
+        async_driver: str = getattr(
+            settings, "POSTGIS_ASYNC_DRIVER", "postgresql+asyncpg"
+        ),
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._async_driver = async_driver
+
+    def async_url(self, url: str) -> str:
+        return url.replace(self.driver, self._async_driver, 1)
+
+    def async_engine(self, url: str):
+        key = (self.async_url(url), self._pool_size, self._pool_recycle)
+        if key not in AsyncPostGIS._async_engines:
+            AsyncPostGIS._async_engines[key] = create_async_engine(
+                self.async_url(url),
+                pool_size=self._pool_size,
+                pool_recycle=self._pool_recycle,
+                pool_pre_ping=url != self.url,
+            )
+        return AsyncPostGIS._async_engines[key]
+
+    async def run(self, function: Callable[[PostGIS], Any]) -> Any:
+        """
+        Ejecuta una función de lectura sobre una sesión asincrónica.
+
+        La sesión se conecta a una réplica saludable si hay alguna configurada (ver
+        `PostGIS.read_url`); el chequeo de salud, cuando no está en caché, se
+        ejecuta en un hilo aparte para no bloquear el event loop.
+
+        Args:
+            function (Callable[[PostGIS], Any]): Función que recibe un objeto PostGIS
+                cuya sesión es la sesión asincrónica, y devuelve el resultado.
+
+        Returns:
+            Any: Resultado de la función.
+
+        """
+        url = await asyncio.to_thread(lambda: self.read_url)
+        async with AsyncSession(
+            self.async_engine(url), autoflush=False, expire_on_commit=False
+        ) as session:
+            return await session.run_sync(self._call, function)
+
+    @staticmethod
+    def _call(session, function: Callable[[PostGIS], Any]) -> Any:
+        postgis = PostGIS()
+        postgis.set(session=session, read_session=session)
+        return function(postgis)
+
+    async def dispose(self) -> None:
+        """
+        Cierra las conexiones de los pools asincrónicos.
+        """
+        for engine in AsyncPostGIS._async_engines.values():
+            await engine.dispose()
@@ -0,0 +1,367 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional, Union
+
+import redis
+
+
+class DiskCache:
+    """
+    Interfaz para una caché de archivos en disco.
+
+    Los valores se almacenan como archivos dentro de un directorio base, organizados
+    en subdirectorios según una clave jerárquica (ej: capa / zoom / x / y). Esto
+    permite invalidar de una sola vez todas las entradas que comparten un prefijo.
+
+    Args:
+        base_dir (str): Directorio base de la caché.
+        ttl (Optional[float]): Tiempo de expiración de las entradas, en segundos,
+            según su fecha de modificación (por defecto: sin expiración).
+
+    Note:
+        - La escritura es atómica: el valor se escribe en un archivo temporal que luego
+          reemplaza a la entrada, por lo que los lectores concurrentes nunca ven
+          archivos incompletos.
+        - Al estar en disco, la caché puede compartirse entre la API y los workers de
+          Celery si utilizan el mismo volumen.
+        - Las entradas expiradas no se leen, pero ocupan espacio hasta que se
+          eliminan con `prune`.
+
+    """
+
+    # Archivo con la generación vigente de un prefijo de clave (ver `generation`).
+    GENERATION_FILE = ".generation"
+
+    def __init__(self, base_dir: str, ttl: Optional[float] = None, **kwargs):
+        self._base_dir = base_dir
+        self._ttl = ttl
+
+    @property
+    def base_dir(self) -> str:
+        return self._base_dir
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self._ttl
+
+    def path(self, *keys: Union[str, int]) -> str:
+        """
+        Ruta del archivo o directorio correspondiente a una clave.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        Returns:
+            str: Ruta dentro del directorio base.
+
+        Raises:
+            ValueError: Si la ruta resultante queda fuera del directorio base (ej: una
+                clave con ".." o una ruta absoluta).
+
+        """
+        path = os.path.join(self.base_dir, *[str(key) for key in keys])
+        base_dir = os.path.realpath(self.base_dir)
+        if os.path.commonpath([base_dir, os.path.realpath(path)]) != base_dir:
+            raise ValueError(f"Cache key {keys} is outside of {self.base_dir}.")
+        return path
+
+    def get(self, *keys: Union[str, int]) -> Optional[bytes]:
+        """
+        Obtiene el valor almacenado para una clave.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        Returns:
+            Optional[bytes]: Valor almacenado, o None si la clave no existe.
+
+        """
+        try:
+            with open(self.path(*keys), "rb") as reader:
+                if (
+                    self.ttl
+                    and os.fstat(reader.fileno()).st_mtime + self.ttl < time.time()
+                ):
+                    return None
+                return reader.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def set(self, value: bytes, *keys: Union[str, int]) -> None:
+        """
+        Almacena un valor para una clave.
+
+        Args:
+            value (bytes): Valor a almacenar.
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        """
+        path = self.path(*keys)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(handle, "wb") as writer:
+                writer.write(value)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def invalidate(self, *keys: Union[str, int]) -> None:
+        """
+        Elimina una entrada o todas las entradas bajo un prefijo de clave.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica. Si no se
+                proporcionan, se vacía la caché completa.
+
+        """
+        path = self.path(*keys)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def generation(self, *keys: Union[str, int]) -> str:
+        """
+        Obtiene la generación vigente de un prefijo de clave.
+
+        Las entradas se guardan bajo `(*keys, generación, ...)`. Quien calcula un
+        valor lee la generación antes de calcularlo y lo almacena bajo ella: si el
+        prefijo se invalida mientras tanto (ver `new_generation`), el valor queda en
+        una generación que ya no se lee, en lugar de reemplazar al vigente.
+
+        Args:
+            *keys (Union[str, int]): Prefijo de clave.
+
+        Returns:
+            str: Generación vigente ("0" si el prefijo nunca se invalidó).
+
+        """
+        # Se lee sin aplicar el TTL: la generación vigente no expira.
+        try:
+            with open(self.path(*keys, self.GENERATION_FILE), "rb") as reader:
+                return reader.read().decode() or "0"
+        except (FileNotFoundError, NotADirectoryError):
+            return "0"
+
+    def new_generation(self, *keys: Union[str, int]) -> str:
+        """
+        Invalida un prefijo de clave pasando a una nueva generación, y elimina las
+        entradas de las generaciones anteriores.
+
+        Args:
+            *keys (Union[str, int]): Prefijo de clave.
+
+        Returns:
+            str: Nueva generación.
+
+        """
+        generation = f"{time.time_ns():x}"
+        path = self.path(*keys, self.GENERATION_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(handle, "wb") as writer:
+            writer.write(generation.encode())
+        os.replace(temp_path, path)
+        self.prune_generations(*keys)
+        return generation
+
+    def prune_generations(self, *keys: Union[str, int]) -> None:
+        """
+        Elimina las entradas de las generaciones no vigentes de un prefijo de clave,
+        incluidas las que se escribieron tarde en una generación ya invalidada.
+
+        Args:
+            *keys (Union[str, int]): Prefijo de clave.
+
+        """
+        current = self.generation(*keys)
+        try:
+            children = os.listdir(self.path(*keys))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for child in children:
+            if child != current and os.path.isdir(self.path(*keys, child)):
+                shutil.rmtree(self.path(*keys, child), ignore_errors=True)
+
+    def prune(self) -> int:
+        """
+        Elimina del disco las entradas expiradas y los directorios vacíos.
+
+        Returns:
+            int: Cantidad de entradas eliminadas.
+
+        """
+        if not self.ttl:
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for root, _, files in os.walk(self.base_dir, topdown=False):
+            for name in files:
+                if name == self.GENERATION_FILE:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+            if root != self.base_dir:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+        return removed
+
+
+class MemoryCache:
+    """
+    Interfaz para una caché en memoria con tiempo de expiración.
+
+    Tiene la misma interfaz que DiskCache, pero los valores viven en el proceso, por lo
+    que no se comparten entre la API y los workers de Celery (ver RedisCache).
+
+    Args:
+        ttl (float): Tiempo de expiración de las entradas, en segundos.
+
+    """
+
+    def __init__(self, ttl: float, **kwargs):
+        self._ttl = ttl
+        self._entries = {}
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, *keys: Union[str, int]) -> Optional[bytes]:
+        """
+        Obtiene el valor almacenado para una clave, si no expiró.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        Returns:
+            Optional[bytes]: Valor almacenado, o None si la clave no existe o expiró.
+
+        """
+        entry = self._entries.get(tuple(str(key) for key in keys))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, value: bytes, *keys: Union[str, int]) -> None:
+        """
+        Almacena un valor para una clave.
+
+        Args:
+            value (bytes): Valor a almacenar.
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        """
+        self._entries[tuple(str(key) for key in keys)] = (
+            time.monotonic() + self.ttl,
+            value,
+        )
+
+    def invalidate(self, *keys: Union[str, int]) -> None:
+        """
+        Elimina una entrada o todas las entradas bajo un prefijo de clave.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica. Si no se
+                proporcionan, se vacía la caché completa.
+
+        """
+        prefix = tuple(str(key) for key in keys)
+        for key in list(self._entries):
+            if key[: len(prefix)] == prefix:
+                self._entries.pop(key, None)
+
+
+class RedisCache:
+    """
+    Interfaz para una caché en Redis con tiempo de expiración.
+
+    Tiene la misma interfaz que DiskCache y permite que la API y los workers de Celery
+    compartan las entradas. Si Redis no está disponible, la caché se comporta como si
+    estuviera vacía, de modo que los llamadores obtengan los valores de su fuente.
+
+    Args:
+        url (str): URL de conexión a Redis (ej: "redis://localhost:6379/1").
+        ttl (float): Tiempo de expiración de las entradas, en segundos.
+        prefix (str): Prefijo de las claves (por defecto: "geoapi").
+
+    Note:
+        - Las claves se forman uniendo sus partes con ":", por lo que la invalidación
+          por prefijo recorre las claves con SCAN; conviene utilizarla con prefijos
+          acotados.
+
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "geoapi", **kwargs):
+        self._client = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._prefix = prefix
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def key(self, *keys: Union[str, int]) -> str:
+        return ":".join([self._prefix, *[str(key) for key in keys]])
+
+    def get(self, *keys: Union[str, int]) -> Optional[bytes]:
+        """
+        Obtiene el valor almacenado para una clave, si no expiró.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        Returns:
+            Optional[bytes]: Valor almacenado, o None si la clave no existe, expiró o
+                Redis no está disponible.
+
+        """
+        try:
+            return self._client.get(self.key(*keys))
+        except redis.RedisError:
+            return None
+
+    def set(self, value: bytes, *keys: Union[str, int]) -> None:
+        """
+        Almacena un valor para una clave.
+
+        Args:
+            value (bytes): Valor a almacenar.
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        """
+        try:
+            self._client.set(self.key(*keys), value, px=int(self.ttl * 1000))
+        except redis.RedisError:
+            pass
+
+    def invalidate(self, *keys: Union[str, int]) -> None:
+        """
+        Elimina una entrada y todas las entradas bajo su prefijo de clave.
+
+        Args:
+            *keys (Union[str, int]): Partes de la clave jerárquica.
+
+        """
+        key = self.key(*keys)
+        try:
+            self._client.delete(key)
+            for entry in self._client.scan_iter(match=f"{key}:*"):
+                self._client.delete(entry)
+        except redis.RedisError:
+            pass
@@ -0,0 +1,341 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+
+
+class FakeGeoserver:
+    """
+    Un servidor liviano que imita la API REST de Geoserver, para pruebas y benchmarks
+    sin un contenedor de Geoserver.
+
+    Implementa los recursos que utiliza `utils.geoserver_interface` (estado del
+    sistema, featureTypes, capas, estilos y tareas de GeoWebCache) manteniendo su
+    estado en memoria. Cada solicitud puede demorarse (`latency` más un valor
+    aleatorio de hasta `jitter` segundos) y fallar con probabilidad `failure_rate`,
+    respondiendo `failure_status`.
+
+    Args:
+        host (str): Dirección en la que escucha el servidor (por defecto: "127.0.0.1").
+        port (int): Puerto; 0 elige uno libre (por defecto: 0).
+        latency (float): Demora fija de cada solicitud, en segundos (por defecto: 0).
+        jitter (float): Demora aleatoria adicional máxima, en segundos (por defecto: 0).
+        failure_rate (float): Probabilidad de que una solicitud falle (por defecto: 0).
+        failure_status (int): Código de estado de las fallas (por defecto: 503).
+        seed (Optional[int]): Semilla del generador aleatorio, para repetir una
+            secuencia de demoras y fallas (opcional).
+
+    Example:
+        >>> with FakeGeoserver(latency=0.05) as fake:
+        ...     geoserver = Geoserver(base_url=fake.url, cache_ttl=0)
+        ...     geoserver.push_layer(layer="test")
+        ...     fake.layers
+        {'test': {'style': None}}
+
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        failure_rate: float = 0,
+        failure_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.featuretypes = {}
+        self.layers = {}
+        self.styles = {}
+        self.seeds = []
+        self.requests = Counter()
+        self._server = ThreadingHTTPServer((host, port), self.handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self) -> "FakeGeoserver":
+        """
+        Inicia el servidor en un hilo aparte.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Detiene el servidor.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def reset(self) -> None:
+        """
+        Elimina las capas, estilos, tareas y contadores de solicitudes.
+        """
+        with self.lock:
+            self.featuretypes.clear()
+            self.layers.clear()
+            self.styles.clear()
+            self.seeds.clear()
+            self.requests.clear()
+
+    def handler(self):
+        """
+        Genera la clase que atiende las solicitudes HTTP del servidor.
+        """
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def handle_method(self, method: str):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = fake.dispatch(
+                    method, url.path, parse_qs(url.query), body
+                )
+                data = (
+                    payload
+                    if isinstance(payload, bytes)
+                    else json.dumps(payload).encode()
+                )
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.handle_method("get")
+
+            def do_POST(self):
+                self.handle_method("post")
+
+            def do_PUT(self):
+                self.handle_method("put")
+
+            def do_DELETE(self):
+                self.handle_method("delete")
+
+        return Handler
+
+    def routes(self) -> list:
+        return [
+            ("get", r"/rest/about/system-status", self.system_status),
+            ("get", r"/rest/workspaces/[^/]+/layers\.json", self.list_layers),
+            (
+                "get",
+                r"/rest/workspaces/[^/]+/datastores/[^/]+/featuretypes\.json",
+                self.list_featuretypes,
+            ),
+            (
+                "get",
+                r"/rest/workspaces/[^/]+/datastores/[^/]+/featuretypes/(?P<name>[^/]+)\.json",
+                self.get_featuretype,
+            ),
+            (
+                "post",
+                r"/rest/workspaces/[^/]+/datastores/[^/]+/featuretypes",
+                self.create_featuretype,
+            ),
+            (
+                "put",
+                r"/rest/workspaces/[^/]+/datastores/[^/]+/featuretypes/(?P<name>[^/]+)",
+                self.update_featuretype,
+            ),
+            (
+                "delete",
+                r"/rest/workspaces/[^/]+/datastores/[^/]+/featuretypes/(?P<name>[^/]+)\.xml",
+                self.delete_featuretype,
+            ),
+            ("delete", r"/rest/layers/[^/:]+:(?P<name>[^/]+)\.xml", self.delete_layer),
+            (
+                "put",
+                r"/rest/workspaces/[^/]+/layers/(?P<name>[^/]+)",
+                self.assign_style,
+            ),
+            ("get", r"/rest/workspaces/[^/]+/styles\.json", self.list_styles),
+            (
+                "get",
+                r"/rest/workspaces/[^/]+/styles/(?P<name>[^/]+)\.sld",
+                self.get_style,
+            ),
+            ("post", r"/rest/workspaces/[^/]+/styles", self.create_style),
+            (
+                "put",
+                r"/rest/workspaces/[^/]+/styles/(?P<name>[^/]+)",
+                self.update_style,
+            ),
+            (
+                "delete",
+                r"/rest/workspaces/[^/]+/styles/(?P<name>[^/]+)",
+                self.delete_style,
+            ),
+            ("post", r"/gwc/rest/seed/[^/:]+:(?P<name>[^/]+)\.json", self.seed),
+        ]
+
+    def dispatch(self, method: str, path: str, query: dict, body: bytes) -> tuple:
+        """
+        Atiende una solicitud: aplica la demora y la falla simuladas, y la deriva al
+        recurso correspondiente.
+
+        Args:
+            method (str): Método HTTP en minúsculas.
+            path (str): Ruta de la solicitud.
+            query (dict): Parámetros de la consulta.
+            body (bytes): Cuerpo de la solicitud.
+
+        Returns:
+            tuple: Código de estado y respuesta (objeto JSON o bytes).
+
+        """
+        path = re.sub(r"^/geoserver", "", path)
+        for route_method, pattern, resource in self.routes():
+            match = re.fullmatch(pattern, path)
+            if route_method != method or not match:
+                continue
+            with self.lock:
+                self.requests[resource.__name__] += 1
+                delay = self.latency + self.random.uniform(0, self.jitter)
+                failed = self.random.random() < self.failure_rate
+            time.sleep(delay)
+            if failed:
+                return self.failure_status, {"message": "Injected failure."}
+            with self.lock:
+                return resource(query=query, body=body, **match.groupdict())
+        return 404, {"message": f"No such resource: {method.upper()} {path}"}
+
+    def system_status(self, **kwargs) -> tuple:
+        return 200, {"metrics": {"metric": []}}
+
+    def list_layers(self, **kwargs) -> tuple:
+        if not self.layers:
+            return 200, {"layers": ""}
+        return 200, {"layers": {"layer": [{"name": name} for name in self.layers]}}
+
+    def list_featuretypes(self, **kwargs) -> tuple:
+        if not self.featuretypes:
+            return 200, {"featureTypes": ""}
+        return 200, {
+            "featureTypes": {
+                "featureType": [{"name": name} for name in self.featuretypes]
+            }
+        }
+
+    def get_featuretype(self, name: str, **kwargs) -> tuple:
+        if name not in self.featuretypes:
+            return 404, {"message": f"No such feature type: {name}"}
+        definition = ElementTree.fromstring(self.featuretypes[name])
+        return 200, {
+            "featureType": {
+                "name": name,
+                "nativeName": definition.findtext("nativeName") or name,
+                "title": definition.findtext("title"),
+            }
+        }
+
+    def create_featuretype(self, body: bytes, **kwargs) -> tuple:
+        name = ElementTree.fromstring(body).findtext("name")
+        if name in self.featuretypes:
+            return 500, {"message": f"Resource named '{name}' already exists."}
+        self.featuretypes[name] = body
+        self.layers[name] = {"style": None}
+        return 201, b""
+
+    def update_featuretype(self, name: str, body: bytes, **kwargs) -> tuple:
+        if name not in self.featuretypes:
+            return 404, {"message": f"No such feature type: {name}"}
+        # Como Geoserver, conserva la definición original (nombre nativo, título).
+        return 200, b""
+
+    def delete_featuretype(self, name: str, **kwargs) -> tuple:
+        if name not in self.featuretypes:
+            return 404, {"message": f"No such feature type: {name}"}
+        del self.featuretypes[name]
+        return 200, b""
+
+    def delete_layer(self, name: str, **kwargs) -> tuple:
+        if name not in self.layers:
+            return 404, {"message": f"No such layer: {name}"}
+        del self.layers[name]
+        return 200, b""
+
+    def assign_style(self, name: str, body: bytes, **kwargs) -> tuple:
+        if name not in self.layers:
+            return 404, {"message": f"No such layer: {name}"}
+        style = ElementTree.fromstring(body).findtext("defaultStyle/name")
+        if style not in self.styles:
+            return 400, {"message": f"No such style: {style}"}
+        self.layers[name]["style"] = style
+        return 200, b""
+
+    def list_styles(self, **kwargs) -> tuple:
+        if not self.styles:
+            return 200, {"styles": ""}
+        return 200, {"styles": {"style": [{"name": name} for name in self.styles]}}
+
+    def get_style(self, name: str, **kwargs) -> tuple:
+        if name not in self.styles:
+            return 404, {"message": f"No such style: {name}"}
+        return 200, self.styles[name]
+
+    def create_style(self, query: dict, body: bytes, **kwargs) -> tuple:
+        name = query.get("name", [None])[0]
+        if not name:
+            return 400, {"message": "Style name is required."}
+        if name in self.styles:
+            return 403, {"message": f"Style '{name}' already exists."}
+        self.styles[name] = body
+        return 201, b""
+
+    def update_style(self, name: str, body: bytes, **kwargs) -> tuple:
+        if name not in self.styles:
+            return 404, {"message": f"No such style: {name}"}
+        self.styles[name] = body
+        return 200, b""
+
+    def delete_style(self, name: str, query: dict, **kwargs) -> tuple:
+        if name not in self.styles:
+            return 404, {"message": f"No such style: {name}"}
+        users = [layer for layer, info in self.layers.items() if info["style"] == name]
+        if users and query.get("recurse", ["false"])[0] != "true":
+            return 403, {"message": f"Style '{name}' is in use."}
+        for layer in users:
+            self.layers[layer]["style"] = None
+        del self.styles[name]
+        return 200, b""
+
+    def seed(self, name: str, body: bytes, **kwargs) -> tuple:
+        if name not in self.layers:
+            return 400, {"message": f"Unknown layer: {name}"}
+        self.seeds.append(json.loads(body)["seedRequest"])
+        return 200, b""
@@ -1,2 +1,13 @@
+from datetime import date
+
+
 def clean_nones(kwargs: dict) -> dict:
     return {key: value for key, value in kwargs.items() if value not in [None, {}]}
+
+
+def add_months(day: date, months: int) -> date:
+    """
+    Devuelve el primer día del mes que resulta de desplazar `day` en `months` meses.
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
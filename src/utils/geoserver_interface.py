@@ -1,17 +1,41 @@
+import hashlib
+import json
+import os
 from io import BufferedReader
-from typing import Literal, Optional, Union
+from typing import Callable, Literal, Optional, Union
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from utils.cache_interface import DiskCache, MemoryCache, RedisCache
 from utils.config import settings
 
 
 class Geoserver:
     """
     Una interfaz para interactuar con la API REST de Geoserver.
+
+    Las solicitudes se realizan con una sesión HTTP compartida por todas las instancias
+    del proceso (por servidor y credenciales), que mantiene un pool de conexiones
+    persistentes (keep-alive) y reintenta con espera exponencial las solicitudes
+    idempotentes que fallan con errores 5xx o de conexión.
+
+    Los listados de capas y estilos se guardan en una caché con tiempo de expiración,
+    compartida por todas las instancias del proceso o, si se configura una URL de Redis,
+    también con los demás procesos (API y workers de Celery). Las operaciones de esta
+    interfaz que crean o eliminan capas o estilos invalidan el listado correspondiente.
+
+    El hash del contenido de cada estilo cargado se guarda en disco, de modo que volver
+    a cargar un estilo sin cambios no realiza ninguna solicitud (ver `push_style`).
     """
 
+    # Sesiones compartidas por todas las instancias del proceso.
+    _sessions: dict = {}
+    # Cachés de listados compartidas por todas las instancias del proceso.
+    _caches: dict = {}
+
     def __init__(
         self,
         base_url: str = None,
@@ -20,6 +44,23 @@ class Geoserver:
         workspace: str = None,
         datastore: str = None,
         coordsys: str = None,
+        pool_size: int = getattr(settings, "GEOSERVER_POOL_SIZE", 10),
+        timeout: float = getattr(settings, "GEOSERVER_TIMEOUT", 60),
+        connect_timeout: float = getattr(settings, "GEOSERVER_CONNECT_TIMEOUT", 5),
+        retries: int = getattr(settings, "GEOSERVER_RETRIES", 3),
+        backoff_factor: float = getattr(settings, "GEOSERVER_BACKOFF_FACTOR", 0.5),
+        cache_url: Optional[str] = getattr(settings, "GEOSERVER_CACHE_URL", None),
+        cache_ttl: float = getattr(settings, "GEOSERVER_CACHE_TTL", 30),
+        gwc_gridsets: dict = getattr(
+            settings, "GWC_GRIDSETS", {"EPSG:4326": 4326, "EPSG:900913": 3857}
+        ),
+        gwc_formats: list = getattr(settings, "GWC_FORMATS", ["image/png"]),
+        gwc_zoom_stop: int = getattr(settings, "GWC_ZOOM_STOP", 21),
+        gwc_seed_zoom_stop: int = getattr(settings, "GWC_SEED_ZOOM_STOP", 10),
+        gwc_threads: int = getattr(settings, "GWC_THREADS", 1),
+        style_cache_dir: Optional[str] = getattr(
+            settings, "GEOSERVER_STYLE_CACHE_DIR", None
+        ),
         *args,
         **kwargs,
     ):
@@ -33,6 +74,30 @@ class Geoserver:
             workspace (str): Espacio de trabajo de Geoserver.
             datastore (str): Almacenamiento de datos de Geoserver.
             coordsys (str): Sistema de coordenadas (por defecto: "EPSG:4326").
+            pool_size (int): Cantidad máxima de conexiones persistentes (por defecto: 10).
+            timeout (float): Tiempo máximo de espera de una respuesta, en segundos
+                (por defecto: 60).
+            connect_timeout (float): Tiempo máximo para establecer una conexión, en
+                segundos (por defecto: 5).
+            retries (int): Cantidad de reintentos ante errores 5xx o de conexión
+                (por defecto: 3).
+            backoff_factor (float): Factor de la espera exponencial entre reintentos,
+                en segundos (por defecto: 0.5).
+            cache_url (Optional[str]): URL de Redis para compartir la caché de listados
+                entre procesos (por defecto: caché en memoria del proceso).
+            cache_ttl (float): Tiempo de expiración de los listados en caché, en
+                segundos; 0 deshabilita la caché (por defecto: 30).
+            gwc_gridsets (dict): SRID de cada gridset de GeoWebCache cuyas teselas se
+                truncan (por defecto: {"EPSG:4326": 4326, "EPSG:900913": 3857}).
+            gwc_formats (list): Formatos de las teselas de GeoWebCache que se truncan
+                (por defecto: ["image/png"]).
+            gwc_zoom_stop (int): Último nivel de zoom que se trunca (por defecto: 21).
+            gwc_seed_zoom_stop (int): Último nivel de zoom que se vuelve a generar
+                (por defecto: 10).
+            gwc_threads (int): Hilos de GeoWebCache por tarea de generación
+                (por defecto: 1).
+            style_cache_dir (Optional[str]): Directorio de los hashes de los estilos
+                cargados (por defecto: "styles" en TEMP_BASE).
             *args: Argumentos adicionales.
             **kwargs: Argumentos clave adicionales.
 
@@ -45,6 +110,23 @@ class Geoserver:
         self._coordsys = (
             coordsys or settings.__getattribute__("COORDINATE_SYSTEM") or "EPSG:4326"
         )
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._connect_timeout = connect_timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._cache_url = cache_url
+        self._cache_ttl = cache_ttl
+        self._gwc_gridsets = {
+            gridset: int(srid) for gridset, srid in dict(gwc_gridsets).items()
+        }
+        self._gwc_formats = list(gwc_formats)
+        self._gwc_zoom_stop = int(gwc_zoom_stop)
+        self._gwc_seed_zoom_stop = int(gwc_seed_zoom_stop)
+        self._gwc_threads = int(gwc_threads)
+        self._style_cache_dir = style_cache_dir or os.path.join(
+            getattr(settings, "TEMP_BASE", "/tmp"), "styles"
+        )
 
     @property
     def base_url(self) -> str:
@@ -54,6 +136,10 @@ class Geoserver:
     def rest_url(self) -> str:
         return f"{self.base_url}/rest"
 
+    @property
+    def gwc_url(self) -> str:
+        return f"{self.base_url}/gwc/rest"
+
     @property
     def hostname(self) -> str:
         return urlparse(self.base_url).netloc
@@ -78,13 +164,127 @@ class Geoserver:
     def coordsys(self) -> str:
         return self._coordsys
 
+    @property
+    def gwc_gridsets(self) -> dict:
+        return self._gwc_gridsets
+
+    @property
+    def gwc_srids(self) -> list:
+        return sorted(set(self._gwc_gridsets.values()))
+
+    @property
+    def session(self) -> requests.Session:
+        # El PID forma parte de la clave para no compartir conexiones entre procesos
+        # creados con fork (ej: workers de Celery o de Gunicorn).
+        key = (
+            os.getpid(),
+            self.base_url,
+            self.username,
+            self.password,
+            self._pool_size,
+            self._retries,
+            self._backoff_factor,
+        )
+        if key not in Geoserver._sessions:
+            Geoserver._sessions[key] = self.create_session()
+        return Geoserver._sessions[key]
+
+    def create_session(self) -> requests.Session:
+        """
+        Crea una sesión HTTP con un pool de conexiones persistentes y reintentos.
+
+        Los reintentos se aplican a los métodos idempotentes (GET, PUT, DELETE, ...) y
+        no a POST, para no crear recursos duplicados si Geoserver los creó antes de
+        fallar. Al agotarse los reintentos se devuelve la última respuesta, por lo que
+        `raise_for_status` sigue informando el error.
+
+        Returns:
+            requests.Session: Sesión autenticada.
+
+        """
+        session = requests.Session()
+        session.auth = (self.username, self.password)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self._pool_size,
+            max_retries=Retry(
+                total=self._retries,
+                backoff_factor=self._backoff_factor,
+                status_forcelist=[500, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Realiza una solicitud a Geoserver con la sesión compartida.
+
+        Args:
+            method (str): Método HTTP.
+            url (str): URL de la solicitud.
+            **kwargs: Argumentos de `requests.Session.request`.
+
+        Returns:
+            requests.Response: Respuesta de Geoserver.
+
+        """
+        kwargs.setdefault("timeout", (self._connect_timeout, self._timeout))
+        return self.session.request(method, url, **kwargs)
+
+    @property
+    def cache(self) -> Union[MemoryCache, RedisCache]:
+        key = (self._cache_url, self._cache_ttl)
+        if key not in Geoserver._caches:
+            Geoserver._caches[key] = (
+                RedisCache(url=self._cache_url, ttl=self._cache_ttl, prefix="geoserver")
+                if self._cache_url
+                else MemoryCache(ttl=self._cache_ttl)
+            )
+        return Geoserver._caches[key]
+
+    @property
+    def style_hashes(self) -> DiskCache:
+        return DiskCache(self._style_cache_dir)
+
+    def cached_listing(self, name: str, fetch: Callable[[], list]) -> list:
+        """
+        Obtiene un listado del espacio de trabajo desde la caché o desde Geoserver.
+
+        Args:
+            name (str): Nombre del listado (ej: "layers").
+            fetch (Callable[[], list]): Función que obtiene el listado desde Geoserver.
+
+        Returns:
+            list: Listado.
+
+        """
+        if self._cache_ttl <= 0:
+            return fetch()
+        keys = (self.hostname, self.workspace, name)
+        cached = self.cache.get(*keys)
+        if cached is not None:
+            return json.loads(cached)
+        listing = fetch()
+        self.cache.set(json.dumps(listing).encode(), *keys)
+        return listing
+
+    def invalidate_listing(self, name: str) -> None:
+        """
+        Invalida un listado del espacio de trabajo en la caché.
+
+        Args:
+            name (str): Nombre del listado (ej: "layers").
+
+        """
+        self.cache.invalidate(self.hostname, self.workspace, name)
+
     @property
     def status(self) -> bool:
         try:
-            response = requests.get(
-                f"{self.rest_url}/about/system-status",
-                auth=(self.username, self.password),
-            )
+            response = self.request("get", f"{self.rest_url}/about/system-status")
             response.raise_for_status()
             return True
         except Exception:
@@ -99,13 +299,25 @@ class Geoserver:
         """
         Obtiene una lista de capas disponibles en Geoserver.
 
+        El listado se obtiene de la caché mientras no expire (ver `cached_listing`).
+
         Returns:
             list: Lista de nombres de capas.
 
         """
-        response = requests.get(
+        return self.cached_listing("layers", self.fetch_layers)
+
+    def fetch_layers(self) -> list:
+        """
+        Obtiene de Geoserver la lista de capas disponibles, sin utilizar la caché.
+
+        Returns:
+            list: Lista de nombres de capas.
+
+        """
+        response = self.request(
+            "get",
             f"{self.rest_url}/workspaces/{self.workspace}/layers.json",
-            auth=(self.username, self.password),
         )
         response.raise_for_status()
         if not (
@@ -115,6 +327,56 @@ class Geoserver:
             return []
         return [layer["name"] for layer in response.json()["layers"]["layer"]]
 
+    def fetch_featuretypes(self) -> list:
+        """
+        Obtiene de Geoserver la lista de featureTypes del datastore, sin utilizar la
+        caché.
+
+        A diferencia de `fetch_layers`, no incluye las capas de otros almacenes del
+        espacio de trabajo.
+
+        Returns:
+            list: Lista de nombres de featureTypes.
+
+        """
+        response = self.request(
+            "get",
+            f"{self.rest_url}/workspaces/{self.workspace}"
+            + f"/datastores/{self.datastore}/featuretypes.json",
+        )
+        response.raise_for_status()
+        if not (
+            isinstance(response.json().get("featureTypes"), dict)
+            and "featureType" in response.json()["featureTypes"]
+        ):
+            return []
+        return [
+            featuretype["name"]
+            for featuretype in response.json()["featureTypes"]["featureType"]
+        ]
+
+    def get_featuretype(self, layer: str) -> dict:
+        """
+        Obtiene la definición de un featureType del datastore.
+
+        Args:
+            layer (str): Nombre del featureType.
+
+        Returns:
+            dict: Definición del featureType (ej: "name", "nativeName", "title").
+
+        Raises:
+            requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
+
+        """
+        response = self.request(
+            "get",
+            f"{self.rest_url}/workspaces/{self.workspace}"
+            + f"/datastores/{self.datastore}/featuretypes/{layer}.json",
+        )
+        response.raise_for_status()
+        return response.json()["featureType"]
+
     def push_layer(
         self,
         layer: str,
@@ -155,10 +417,10 @@ class Geoserver:
             elif if_exists.lower() == "ignore":
                 return
         view = view or layer
-        response = requests.post(
+        response = self.request(
+            "post",
             f"{self.rest_url}/workspaces/{self.workspace}"
             + f"/datastores/{self.datastore}/featuretypes",
-            auth=(self.username, self.password),
             headers={"Content-type": "text/xml"},
             data=f"""
                 <featureType>
@@ -176,6 +438,70 @@ class Geoserver:
                 </featureType>
             """,
         )
+        self.invalidate_listing("layers")
+        response.raise_for_status()
+
+    def update_layer(
+        self,
+        layer: str,
+        view: Optional[str] = None,
+        minx: Optional[Union[float, str]] = None,
+        maxx: Optional[Union[float, str]] = None,
+        miny: Optional[Union[float, str]] = None,
+        maxy: Optional[Union[float, str]] = None,
+    ) -> None:
+        """
+        Actualiza la extensión de una capa existente en Geoserver, sin eliminarla.
+
+        Se modifica el featureType en el lugar (PUT), por lo que la capa conserva su
+        estilo y su configuración de caché de teselas, y los clientes nunca la ven
+        ausente. Si se proporciona la extensión nativa, Geoserver solo recalcula la
+        extensión en coordenadas geográficas; si no, recalcula ambas desde los datos.
+        Si la capa no existe, se crea con `push_layer`.
+
+        Args:
+            layer (str): Nombre de la capa.
+            view (Optional[str]): Nombre del featureType (por defecto: `layer`).
+            minx (Optional[Union[float, str]]): Valor mínimo en el eje X.
+            maxx (Optional[Union[float, str]]): Valor máximo en el eje X.
+            miny (Optional[Union[float, str]]): Valor mínimo en el eje Y.
+            maxy (Optional[Union[float, str]]): Valor máximo en el eje Y.
+
+        Raises:
+            requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
+
+        """
+        view = view or layer
+        bbox = {"minx": minx, "maxx": maxx, "miny": miny, "maxy": maxy}
+        if None in bbox.values():
+            bbox = {}
+            recalculate = "nativebbox,latlonbbox"
+            native_bbox = ""
+        else:
+            recalculate = "latlonbbox"
+            native_bbox = f"""
+                  <nativeBoundingBox>
+                    <minx>{minx}</minx>
+                    <maxx>{maxx}</maxx>
+                    <miny>{miny}</miny>
+                    <maxy>{maxy}</maxy>
+                    <crs>{self.coordsys}</crs>
+                  </nativeBoundingBox>"""
+        response = self.request(
+            "put",
+            f"{self.rest_url}/workspaces/{self.workspace}"
+            + f"/datastores/{self.datastore}/featuretypes/{view}"
+            + f"?recalculate={recalculate}",
+            headers={"Content-type": "text/xml"},
+            data=f"""
+                <featureType>
+                  <enabled>true</enabled>{native_bbox}
+                </featureType>
+            """,
+        )
+        if response.status_code == 404:
+            self.invalidate_listing("layers")
+            return self.push_layer(layer=layer, view=view, if_exists="ignore", **bbox)
         response.raise_for_status()
 
     def delete_layer(
@@ -200,15 +526,16 @@ class Geoserver:
                 raise ValueError(f"Layer '{layer}' doesn't exist!")
             elif if_not_exists == "ignore":
                 return
-        response = requests.delete(
+        response = self.request(
+            "delete",
             f"{self.rest_url}/layers/{self.workspace}:{layer}.xml",
-            auth=(self.username, self.password),
         )
+        self.invalidate_listing("layers")
         response.raise_for_status()
-        response = requests.delete(
+        response = self.request(
+            "delete",
             f"{self.rest_url}/workspaces/{self.workspace}/datastores/"
             + f"{self.datastore}/featuretypes/{layer}.xml",
-            auth=(self.username, self.password),
         )
         response.raise_for_status()
 
@@ -218,6 +545,20 @@ class Geoserver:
         """
         Lista los estilos disponibles en el servidor GeoServer.
 
+        El listado se obtiene de la caché mientras no expire (ver `cached_listing`).
+
+        Returns:
+            List[str]: Una lista de nombres de estilos disponibles en el servidor.
+
+        Raises:
+            requests.HTTPError: Si la solicitud HTTP al servidor falla.
+        """
+        return self.cached_listing("styles", self.fetch_styles)
+
+    def fetch_styles(self) -> list:
+        """
+        Lista los estilos disponibles en el servidor GeoServer, sin utilizar la caché.
+
         Esta función realiza una solicitud GET al servidor GeoServer para obtener la lista
         de estilos disponibles en el espacio de trabajo y devuelve los nombres de los
         estilos encontrados.
@@ -228,9 +569,9 @@ class Geoserver:
         Raises:
             requests.HTTPError: Si la solicitud HTTP al servidor falla.
         """
-        response = requests.get(
+        response = self.request(
+            "get",
             url=f"{self.rest_url}/workspaces/{self.workspace}/styles.json",
-            auth=(self.username, self.password),
             headers={
                 "accept": "application/json",
             },
@@ -274,14 +615,16 @@ class Geoserver:
         """
         if style not in self.list_styles() and if_not_exists == "ignore":
             return
-        response = requests.delete(
+        response = self.request(
+            "delete",
             url=f"{self.rest_url}/workspaces/{self.workspace}/styles/{style}"
             + f"?purge={str(purge).lower()}&recurse={str(recurse).lower()}",
-            auth=(self.username, self.password),
             headers={
                 "content-type": "application/xml",
             },
         )
+        self.invalidate_listing("styles")
+        self.style_hashes.invalidate(self.hostname, self.workspace, style)
         if response.status_code == 403:
             raise requests.exceptions.HTTPError(
                 f"Style '{style}' on workspace '{self.workspace}' "
@@ -293,53 +636,74 @@ class Geoserver:
     def push_style(
         self,
         style: str,
-        data: Union[str, BufferedReader],
+        data: Union[str, bytes, BufferedReader],
         if_exists: Literal["fail", "ignore", "replace"] = "fail",
-    ) -> None:
+    ) -> Literal["created", "updated", "unchanged", "ignored"]:
         """
         Carga una definición de estilo en el servidor GeoServer.
 
-        Esta función envía una solicitud POST al servidor GeoServer para cargar una
-        definición de estilo en el espacio de trabajo especificado.
+        Esta función envía una solicitud POST al servidor GeoServer para crear el estilo
+        en el espacio de trabajo especificado, o una solicitud PUT para actualizar un
+        estilo existente en el lugar, conservando su asignación a las capas.
 
         Args:
             style (str): El nombre del estilo que se creará o reemplazará.
-            data (Union[str, BufferedReader]): Los datos de la definición del estilo, que
-                pueden ser una ruta de archivo o un objeto BufferedReader.
+            data (Union[str, bytes, BufferedReader]): Los datos de la definición del
+                estilo, que pueden ser una ruta de archivo, su contenido o un objeto
+                BufferedReader.
             if_exists (Literal["fail", "ignore", "replace"], optional): Controla el
                 comportamiento si el estilo ya existe en el servidor. Opciones: "fail" (por
                 defecto) para lanzar un error, "ignore" para omitir la carga si ya existe,
                 "replace" para reemplazar el estilo existente.
 
+        Returns:
+            Literal["created", "updated", "unchanged", "ignored"]: Resultado de la carga.
+
         Raises:
             requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
 
         Note:
             - Si el estilo ya existe en el servidor y if_exists es "ignore", la función
               retornará sin hacer nada.
-            - Si if_exists es "replace", se eliminará el estilo existente antes de cargar
-              la nueva definición.
+            - Si if_exists es "replace" y el contenido es el mismo que el de la última
+              carga del estilo (según su hash), la función retornará sin hacer nada. Los
+              cambios realizados en el estilo por fuera de esta interfaz no se detectan.
 
         """
-        if style in self.list_styles() and if_exists == "ignore":
-            return
+        exists = style in self.list_styles()
+        if exists and if_exists == "ignore":
+            return "ignored"
         if isinstance(data, str):
-            data = open(data, "rb")
-        elif if_exists == "replace":
-            self.delete_style(
-                style=style,
-                purge=True,
-                recurse=True,
-                if_not_exists="ignore",
+            with open(data, "rb") as reader:
+                data = reader.read()
+        elif not isinstance(data, bytes):
+            data = data.read()
+        keys = (self.hostname, self.workspace, style)
+        digest = hashlib.sha256(data).hexdigest().encode()
+        result = "created"
+        if exists and if_exists == "replace":
+            if self.style_hashes.get(*keys) == digest:
+                return "unchanged"
+            response = self.request(
+                "put",
+                url=f"{self.rest_url}/workspaces/{self.workspace}/styles/{style}",
+                headers={"Content-type": "application/vnd.ogc.sld+xml"},
+                data=data,
             )
-        response = requests.post(
-            url=f"{self.rest_url}/workspaces/{self.workspace}"
-            + f"/styles?name={style}",
-            auth=(self.username, self.password),
-            headers={"Content-type": "application/vnd.ogc.sld+xml"},
-            data=data,
-        )
+            # Si el listado en caché estaba desactualizado, el estilo se crea.
+            result = "updated" if response.status_code != 404 else result
+        if result == "created":
+            response = self.request(
+                "post",
+                url=f"{self.rest_url}/workspaces/{self.workspace}"
+                + f"/styles?name={style}",
+                headers={"Content-type": "application/vnd.ogc.sld+xml"},
+                data=data,
+            )
+            self.invalidate_listing("styles")
         response.raise_for_status()
+        self.style_hashes.set(digest, *keys)
+        return result
 
     def assign_style(
         self,
@@ -360,9 +724,9 @@ class Geoserver:
             requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
 
         """
-        response = requests.put(
+        response = self.request(
+            "put",
             url=f"{self.rest_url}/workspaces/{self.workspace}/layers/{layer}",
-            auth=(self.username, self.password),
             headers={
                 "content-type": "application/xml",
             },
@@ -375,3 +739,96 @@ class Geoserver:
             """,
         )
         response.raise_for_status()
+
+    def seed_tiles(
+        self,
+        layer: str,
+        gridset: str,
+        minx: Union[float, str],
+        miny: Union[float, str],
+        maxx: Union[float, str],
+        maxy: Union[float, str],
+        zoom_start: int = 0,
+        zoom_stop: Optional[int] = None,
+        format: str = "image/png",
+        type: Literal["truncate", "seed", "reseed"] = "truncate",
+    ) -> None:
+        """
+        Envía una tarea de GeoWebCache sobre las teselas de una capa dentro de una
+        extensión.
+
+        GeoWebCache encola la tarea y la ejecuta en segundo plano, por lo que la
+        solicitud no espera a que se generen o eliminen las teselas.
+
+        Args:
+            layer (str): Nombre de la capa.
+            gridset (str): Identificador del gridset (ej: "EPSG:4326").
+            minx (Union[float, str]): Valor mínimo en el eje X, en el SRID del gridset.
+            miny (Union[float, str]): Valor mínimo en el eje Y, en el SRID del gridset.
+            maxx (Union[float, str]): Valor máximo en el eje X, en el SRID del gridset.
+            maxy (Union[float, str]): Valor máximo en el eje Y, en el SRID del gridset.
+            zoom_start (int): Primer nivel de zoom (por defecto: 0).
+            zoom_stop (Optional[int]): Último nivel de zoom (por defecto: `gwc_zoom_stop`).
+            format (str): Formato de las teselas (por defecto: "image/png").
+            type (Literal["truncate", "seed", "reseed"]): Tipo de tarea
+                (por defecto: "truncate").
+
+        Raises:
+            requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
+
+        """
+        response = self.request(
+            "post",
+            f"{self.gwc_url}/seed/{self.workspace}:{layer}.json",
+            json={
+                "seedRequest": {
+                    "name": f"{self.workspace}:{layer}",
+                    "bounds": {"coords": {"double": [minx, miny, maxx, maxy]}},
+                    "gridSetId": gridset,
+                    "zoomStart": zoom_start,
+                    "zoomStop": self._gwc_zoom_stop if zoom_stop is None else zoom_stop,
+                    "format": format,
+                    "type": type,
+                    "threadCount": self._gwc_threads,
+                }
+            },
+        )
+        response.raise_for_status()
+
+    def truncate_tiles(
+        self,
+        layer: str,
+        extents: dict,
+        reseed: bool = False,
+    ) -> None:
+        """
+        Trunca en GeoWebCache solo las teselas de una capa que cubren las extensiones
+        modificadas, en todos los gridsets y formatos configurados, y opcionalmente
+        vuelve a generar los niveles de zoom bajos.
+
+        Args:
+            layer (str): Nombre de la capa.
+            extents (dict): Extensión modificada por SRID, con las claves "minx",
+                "miny", "maxx" y "maxy" (ver `PostGIS.batch_extents`).
+            reseed (bool): Vuelve a generar las teselas truncadas hasta
+                `gwc_seed_zoom_stop` (por defecto: False).
+
+        Raises:
+            requests.exceptions.HTTPError: Si la solicitud HTTP al servidor falla.
+
+        """
+        for gridset, srid in self.gwc_gridsets.items():
+            bbox = extents.get(srid)
+            if not bbox:
+                continue
+            for format in self._gwc_formats:
+                self.seed_tiles(layer=layer, gridset=gridset, format=format, **bbox)
+                if reseed:
+                    self.seed_tiles(
+                        layer=layer,
+                        gridset=gridset,
+                        format=format,
+                        zoom_stop=min(self._gwc_seed_zoom_stop, self._gwc_zoom_stop),
+                        type="seed",
+                        **bbox,
+                    )
@@ -1,14 +1,59 @@
+import gzip
+import hashlib
+import json
+import os
+import random
 import re
-from typing import List, Literal, Optional, Union
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Generator, List, Literal, Optional, Tuple, Type, Union
 from urllib.parse import quote_plus
 
-import pandas
 import sqlalchemy
+from geoalchemy2 import Geometry
+from geoalchemy2 import functions as func
+from sqlalchemy import event
 from sqlalchemy.exc import DatabaseError
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
-from models.tables import Batches, Geometries, Layers, Logs
+from models.tables import Batches, Geometries, Layers, LogPartitions, Logs
 from utils.config import settings
+from utils.general import add_months
+
+# Retraso de replicación en segundos (NULL si el servidor no es una réplica).
+REPLICATION_LAG = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Parámetros nombrados (`:nombre`) de una consulta, sin confundirlos con casts (`::`).
+PARAMETER = re.compile(r"(?<![:\w]):(\w+)")
+
+
+class Explain(Executable, ClauseElement):
+    """
+    Plan de ejecución (EXPLAIN) de una consulta, en formato JSON.
+
+    Los parámetros de la consulta se compilan con sus tipos (ej: JSONB), como al
+    ejecutarla.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
 
 
 class PostGIS:
@@ -16,6 +61,13 @@ class PostGIS:
     Una interfaz para interactuar con la API REST de Geoserver.
     """
 
+    # Motores compartidos por todas las instancias del proceso, por URL y pool.
+    _engines: dict = {}
+    # Último resultado del chequeo de salud de cada réplica: (saludable, instante).
+    _replica_health: dict = {}
+    # Dimensión de la columna de geometrías ya verificada, por URL y esquema.
+    _verified_dimensions: dict = {}
+
     def __init__(
         self,
         host: Optional[str] = settings.__getattribute__("POSTGIS_HOSTNAME"),
@@ -27,8 +79,18 @@ class PostGIS:
         driver: str = settings.__getattribute__("POSTGIS_DRIVER")
         or "postgresql+psycopg2",
         coordsys: str = settings.__getattribute__("COORDINATE_SYSTEM") or "EPSG:4326",
+        dimension: int = int(getattr(settings, "GEOMETRY_DIMENSION", 3)),
         pool_size: int = 10,
         pool_recycle: int = 1500,
+        delete_chunksize: int = getattr(settings, "POSTGIS_DELETE_CHUNKSIZE", 5000),
+        stream_chunksize: int = getattr(settings, "POSTGIS_STREAM_CHUNKSIZE", 1000),
+        tolerances: List[float] = getattr(settings, "GENERALIZATION_TOLERANCES", []),
+        replicas: List[str] = getattr(settings, "POSTGIS_REPLICAS", []),
+        replica_max_lag: float = getattr(settings, "POSTGIS_REPLICA_MAX_LAG", 10),
+        replica_check_interval: float = getattr(
+            settings, "POSTGIS_REPLICA_CHECK_INTERVAL", 30
+        ),
+        prepared_statements: int = getattr(settings, "POSTGIS_PREPARED_STATEMENTS", 50),
         *args,
         **kwargs,
     ):
@@ -43,6 +105,22 @@ class PostGIS:
             schema (Optional[str]): Esquema de PostGIS.
             driver (Optional[str]): Driver de conexión (por defecto: "postgres").
             coordsys (Optional[str]): Sistema de coordenadas (por defecto: "EPSG:4326").
+            dimension (int): Dimensión de almacenamiento de las geometrías, 2 (XY) o
+                3 (XYZ) (por defecto: 3).
+            delete_chunksize (int): Cantidad máxima de filas eliminadas por transacción
+                (por defecto: 5000).
+            stream_chunksize (int): Cantidad de filas por fragmento al recorrer vistas
+                con cursores del lado del servidor (por defecto: 1000).
+            tolerances (List[float]): Tolerancias de generalización, en unidades del
+                sistema de coordenadas, de menor a mayor (por defecto: ninguna).
+            replicas (List[str]): Hosts ("host:puerto") de réplicas de lectura, con
+                las mismas credenciales y base de datos (por defecto: ninguna).
+            replica_max_lag (float): Retraso de replicación máximo, en segundos, para
+                considerar saludable una réplica (por defecto: 10).
+            replica_check_interval (float): Segundos durante los cuales se reutiliza
+                el resultado del chequeo de salud de una réplica (por defecto: 30).
+            prepared_statements (int): Cantidad máxima de sentencias preparadas por
+                conexión (por defecto: 50).
             *args: Argumentos adicionales.
             **kwargs: Argumentos clave adicionales.
 
@@ -54,10 +132,20 @@ class PostGIS:
         self._schema = schema
         self._driver = driver
         self._coordsys = coordsys
+        self._dimension = dimension
         self._engine = None
         self._session = None
         self._pool_size = pool_size
         self._pool_recycle = pool_recycle
+        self._delete_chunksize = delete_chunksize
+        self._stream_chunksize = stream_chunksize
+        self._tolerances = sorted(float(tolerance) for tolerance in tolerances)
+        self._replicas = list(replicas)
+        self._replica_max_lag = replica_max_lag
+        self._replica_check_interval = replica_check_interval
+        self._prepared_statements = prepared_statements
+        self._read_session = None
+        self._pinned = False
 
     def __enter__(self):
         return self
@@ -74,6 +162,8 @@ class PostGIS:
                     raise
         finally:
             self.session.close()
+            if self._read_session is not None:
+                self._read_session.close()
 
     @property
     def host(self) -> Optional[str]:
@@ -109,11 +199,30 @@ class PostGIS:
             return None
         return int("".join(re.findall(r"\d+", self.coordsys)))
 
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def tolerances(self) -> List[float]:
+        return self._tolerances
+
+    @property
+    def generalization_levels(self) -> List[int]:
+        return list(range(1, len(self.tolerances) + 1))
+
     @property
     def url(self) -> str:
+        return self.url_for(self.host)
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [self.url_for(host) for host in self._replicas]
+
+    def url_for(self, host: str) -> str:
         return (
             f"{self.driver}://{self.username}:"
-            + f"{quote_plus(self.password)}@{self.host}/{self.database}"
+            + f"{quote_plus(self.password)}@{host}/{self.database}"
         )
 
     @property
@@ -132,6 +241,91 @@ class PostGIS:
             self.create_session()
         return self._session
 
+    @property
+    def read_url(self) -> str:
+        """
+        URL para operaciones de solo lectura: una réplica saludable, o la primaria si
+        no hay réplicas disponibles o si este objeto ya escribió (ver `pin`).
+        """
+        if self._pinned or not self._replicas:
+            return self.url
+        urls = self.replica_urls
+        start = random.randrange(len(urls))
+        for url in urls[start:] + urls[:start]:
+            if self.replica_healthy(url):
+                return url
+        return self.url
+
+    @property
+    def read_engine(self) -> sqlalchemy.engine.Engine:
+        url = self.read_url
+        return self.engine if url == self.url else self.engine_for(url)
+
+    @property
+    def read_session(self) -> sqlalchemy.orm.scoped_session:
+        """
+        Sesión para operaciones de solo lectura. Es la sesión principal si la lectura
+        se resuelve en la primaria, de modo que se leen los propios cambios.
+        """
+        if self._read_session is not None:
+            return self._read_session
+        if self.read_url == self.url:
+            return self.session
+        self._read_session = scoped_session(
+            sessionmaker(bind=self.read_engine, autocommit=False, autoflush=False)
+        )
+        return self._read_session
+
+    @contextmanager
+    def read_connection(self) -> Generator[sqlalchemy.engine.Connection, None, None]:
+        """
+        Conexión para consultas de solo lectura. Si el objeto tiene una sesión de
+        lectura propia (ej: la sesión asincrónica que inyecta AsyncPostGIS), se usa su
+        conexión, para que la consulta no abra otra por fuera de esa sesión.
+        """
+        if self._read_session is not None:
+            yield self._read_session.connection()
+        else:
+            with self.read_engine.connect() as connection:
+                yield connection
+
+    def pin(self) -> None:
+        """
+        Fija las lecturas posteriores de este objeto a la primaria, para que una
+        operación lea sus propias escrituras aunque las réplicas tengan retraso.
+        """
+        self._pinned = True
+        if self._read_session is not None and self._read_session is not self._session:
+            self._read_session.close()
+        self._read_session = None
+
+    def replica_healthy(self, url: str) -> bool:
+        """
+        Indica si una réplica responde y su retraso de replicación no supera
+        `replica_max_lag`. El resultado se reutiliza durante `replica_check_interval`
+        segundos en todo el proceso.
+
+        Args:
+            url (str): URL de la réplica.
+
+        Returns:
+            bool: True si la réplica puede utilizarse para lecturas.
+
+        """
+        healthy, checked_at = PostGIS._replica_health.get(url, (False, None))
+        if checked_at is not None and (
+            time.monotonic() - checked_at < self._replica_check_interval
+        ):
+            return healthy
+        try:
+            with self.engine_for(url).connect() as connection:
+                lag = connection.execute(sqlalchemy.text(REPLICATION_LAG)).scalar()
+            healthy = lag is not None and float(lag) <= self._replica_max_lag
+        except sqlalchemy.exc.DBAPIError:
+            healthy = False
+        PostGIS._replica_health[url] = (healthy, time.monotonic())
+        return healthy
+
     @property
     def status(self) -> bool:
         try:
@@ -155,17 +349,42 @@ class PostGIS:
 
     def create_engine(self) -> None:
         """
-        Crea un motor SQLAlchemy.
+        Crea un motor SQLAlchemy, o reutiliza el ya creado en el proceso para la misma
+        URL y configuración de pool.
 
         """
-        self._engine = sqlalchemy.create_engine(
-            self.url,
-            poolclass=sqlalchemy.pool.QueuePool,
-            pool_size=self._pool_size,
-            pool_recycle=self._pool_recycle,
-        )
+        self._engine = self.engine_for(self.url)
         self._engine.execution_options(autocommit=False)
 
+    def engine_for(self, url: str) -> sqlalchemy.engine.Engine:
+        """
+        Devuelve el motor SQLAlchemy del proceso para una URL, creándolo si no existe.
+
+        Los procesos hijos creados con fork no heredan los motores del padre: cada uno
+        crea los suyos, con su propio pool de conexiones.
+
+        Args:
+            url (str): URL de conexión.
+
+        Returns:
+            Engine: Motor compartido para la URL y configuración de pool.
+
+        """
+        # El PID forma parte de la clave para no compartir conexiones entre procesos
+        # creados con fork (ej: workers de Celery o de Gunicorn), como en
+        # `Geoserver.session`.
+        key = (os.getpid(), url, self._pool_size, self._pool_recycle)
+        if key not in PostGIS._engines:
+            PostGIS._engines[key] = sqlalchemy.create_engine(
+                url,
+                poolclass=sqlalchemy.pool.QueuePool,
+                pool_size=self._pool_size,
+                pool_recycle=self._pool_recycle,
+                # Descarta conexiones caídas, ej: de una réplica que se reinició.
+                pool_pre_ping=url != self.url,
+            )
+        return PostGIS._engines[key]
+
     def create_session(self) -> None:
         """
         Crea una sesión SQLAlchemy.
@@ -178,42 +397,251 @@ class PostGIS:
                 autoflush=False,
             ),
         )
+        # Toda escritura por la sesión fija las lecturas posteriores a la primaria.
+        event.listen(self._session, "after_flush", lambda *args: self.pin())
 
-    @staticmethod
-    def clean(query: str) -> str:
+    def quote(self, name: str) -> str:
+        """
+        Cita un identificador (ej: nombre de vista o columna) para utilizarlo en SQL.
+
+        Args:
+            name (str): Identificador.
+
+        Returns:
+            str: Identificador entre comillas dobles, con las comillas internas escapadas.
+
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+    def relation(self, name: str) -> str:
+        """
+        Nombre calificado y citado de una tabla o vista del esquema.
+
+        Args:
+            name (str): Nombre de la tabla o vista.
+
+        Returns:
+            str: Nombre en la forma "esquema"."nombre".
+
+        """
+        return f"{self.quote(self.schema)}.{self.quote(name)}"
+
+    def literal(self, value: str) -> str:
+        """
+        Representa un valor como literal SQL, para sentencias que no admiten
+        parámetros (ej: la definición de una vista). Asume
+        `standard_conforming_strings` activado (valor por defecto de PostgreSQL).
+
+        Args:
+            value (str): Valor a representar.
+
+        Returns:
+            str: Literal SQL con las comillas escapadas.
+
+        """
+        return "'" + value.replace("'", "''") + "'"
+
+    def execute_prepared(
+        self, connection: sqlalchemy.engine.Connection, sql: str, params: dict = {}
+    ) -> sqlalchemy.engine.CursorResult:
+        """
+        Ejecuta una consulta como sentencia preparada del lado del servidor.
+
+        La sentencia se prepara una sola vez por conexión del pool (se recuerda en
+        `connection.info`), por lo que las ejecuciones siguientes evitan el análisis y,
+        una vez que PostgreSQL adopta el plan genérico, también la planificación. Los
+        parámetros nombrados (`:nombre`) se traducen a parámetros posicionales. Con
+        otros drivers (ej: asyncpg, que ya mantiene su propia caché de sentencias
+        preparadas por conexión) la consulta se ejecuta directamente.
+
+        Solo se deben preparar consultas de texto fijo, sin nombres de vistas ni otros
+        valores interpolados. Como resguardo, cada conexión conserva a lo sumo
+        `prepared_statements` sentencias: al superarse se libera (DEALLOCATE) la menos
+        usada recientemente.
+
+        Args:
+            connection (Connection): Conexión en la que se ejecuta la consulta.
+            sql (str): Consulta con parámetros nombrados.
+            params (dict): Valores de los parámetros.
+
+        Returns:
+            CursorResult: Resultado de la ejecución.
+
+        """
+        if connection.dialect.driver != "psycopg2":
+            return connection.execute(sqlalchemy.text(sql), params)
+        names = list(dict.fromkeys(PARAMETER.findall(sql)))
+        statement = f"geoapi_{hashlib.sha1(sql.encode()).hexdigest()[:20]}"
+        prepared = connection.info.setdefault("prepared_statements", OrderedDict())
+        if statement in prepared:
+            prepared.move_to_end(statement)
+        else:
+            body = PARAMETER.sub(
+                lambda match: f"${names.index(match.group(1)) + 1}", sql
+            )
+            connection.execution_options(no_parameters=True).exec_driver_sql(
+                f"PREPARE {statement} AS {body}"
+            )
+            prepared[statement] = True
+            while len(prepared) > max(self._prepared_statements, 1):
+                evicted, _ = prepared.popitem(last=False)
+                connection.exec_driver_sql(f"DEALLOCATE {evicted}")
+        arguments = f"({', '.join(f':{name}' for name in names)})" if names else ""
+        return connection.execute(
+            sqlalchemy.text(f"EXECUTE {statement}{arguments}"), params
+        )
+
+    def geometry_dimension(
+        self, connection: Optional[sqlalchemy.engine.Connection] = None
+    ) -> Optional[int]:
         """
-        Limpia una consulta SQL de comentarios y espacios en blanco.
+        Obtiene la dimensión con la que está declarada la columna de geometrías.
 
         Args:
-            query (str): Consulta SQL.
+            connection (Optional[Connection]): Conexión a utilizar (ej: la de una
+                migración de Alembic). Si no se proporciona, se abre una.
 
         Returns:
-            str: Consulta SQL limpia.
+            Optional[int]: Dimensión de la columna, o None si la tabla no existe.
+
+        """
+        if connection is None:
+            with self.engine.connect() as connection:
+                return self.geometry_dimension(connection=connection)
+        return connection.execute(
+            sqlalchemy.text(
+                """
+                SELECT coord_dimension FROM geometry_columns
+                WHERE f_table_schema = :schema
+                AND f_table_name = 'geometries'
+                AND f_geometry_column = 'geometry'
+                """
+            ),
+            {"schema": self.schema},
+        ).scalar()
+
+    def verify_geometry_dimension(self) -> None:
+        """
+        Verifica que la columna de geometrías esté declarada con la dimensión
+        configurada, antes de insertar geometrías convertidas a esa dimensión. El
+        resultado se recuerda en el proceso, ya que la dimensión solo cambia con
+        `manage.py geometry-dimension`.
+
+        Raises:
+            ValueError: Si la dimensión de la columna no es la configurada.
 
         """
-        # Elimina comentarios de línea
-        query = re.sub("--.*", " ", query)
-        # Elimina comentarios de bloque
-        query = re.sub("/[*]([*](?!/)|[^*])*[*]/", " ", query)
-        # Una línea y elimina espacios en blanco adicionales
-        query = re.sub("[ \n\t]+", " ", query)
-        # Elimina cualquier cosa después de un punto y coma
-        query = re.sub(";.*", "", query)
-        # Elimina espacios en blanco al comienzo y al final.
-        return query.strip()
+        key = (self.url, self.schema)
+        if PostGIS._verified_dimensions.get(key) == self.dimension:
+            return
+        stored = self.geometry_dimension()
+        if stored is not None and stored != self.dimension:
+            raise ValueError(
+                f"Geometries are stored in {stored}D but GEOMETRY_DIMENSION is "
+                f"{self.dimension}. Run 'python manage.py geometry-dimension'."
+            )
+        PostGIS._verified_dimensions[key] = stored
 
-    def execute(self, sql: str) -> None:
+    def alter_geometry_dimension(
+        self,
+        dimension: int,
+        connection: Optional[sqlalchemy.engine.Connection] = None,
+    ) -> None:
         """
-        Ejecuta una consulta SQL en el motor SQLAlchemy.
+        Cambia la dimensión de almacenamiento de la columna de geometrías.
+
+        Se modifican tanto las geometrías como sus versiones generalizadas. PostgreSQL
+        no permite alterar el tipo de una columna utilizada por una vista, por lo que
+        las vistas y vistas materializadas que dependen de esas tablas, directamente o
+        a través de otras vistas, se eliminan desde las más dependientes y se vuelven
+        a crear en el orden inverso con su definición original (y, en las
+        materializadas, sus índices).
+
+        El paso de 3 a 2 dimensiones descarta la coordenada Z y no es reversible. Se
+        invoca desde `manage.py geometry-dimension`, no desde las migraciones.
 
         Args:
-            sql (str): Consulta SQL.
+            dimension (int): Nueva dimensión, 2 (XY) o 3 (XYZ).
+            connection (Optional[Connection]): Conexión con una transacción abierta.
+                Si no se proporciona, se abre una.
+
+        Raises:
+            ValueError: Si la dimensión no es 2 ni 3.
 
         """
-        for query in [
-            self.clean(query) for query in sql.split(";") if self.clean(query) != ""
-        ]:
-            self.engine.execute(query + " ;")
+        self.pin()
+        if dimension not in [2, 3]:
+            raise ValueError(f"Geometry dimension must be 2 or 3, not {dimension}.")
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self.alter_geometry_dimension(dimension, connection=connection)
+        PostGIS._verified_dimensions.pop((self.url, self.schema), None)
+        # Vistas dependientes, con la profundidad máxima a la que aparecen en el árbol
+        # de dependencias para eliminarlas y recrearlas en orden.
+        views = connection.execute(
+            sqlalchemy.text(
+                """
+                WITH RECURSIVE dependents AS (
+                    SELECT view.oid, 1 AS depth
+                    FROM pg_depend AS dep
+                        JOIN pg_rewrite AS rew ON rew.oid = dep.objid
+                        JOIN pg_class AS view ON view.oid = rew.ev_class
+                        JOIN pg_class AS tab ON tab.oid = dep.refobjid
+                        JOIN pg_namespace AS nsp ON nsp.oid = tab.relnamespace
+                    WHERE nsp.nspname = :schema
+                    AND tab.relname IN ('geometries', 'generalized_geometries')
+                    AND view.oid <> tab.oid
+                    UNION ALL
+                    SELECT view.oid, dependents.depth + 1
+                    FROM dependents
+                        JOIN pg_depend AS dep ON dep.refobjid = dependents.oid
+                        JOIN pg_rewrite AS rew ON rew.oid = dep.objid
+                        JOIN pg_class AS view ON view.oid = rew.ev_class
+                    WHERE view.oid <> dependents.oid
+                )
+                SELECT
+                    format('%I.%I', nsp.nspname, view.relname),
+                    view.relkind,
+                    pg_get_viewdef(view.oid),
+                    array_remove(array_agg(DISTINCT idx.indexdef), NULL),
+                    max(dependents.depth) AS depth
+                FROM dependents
+                    JOIN pg_class AS view ON view.oid = dependents.oid
+                    JOIN pg_namespace AS nsp ON nsp.oid = view.relnamespace
+                    LEFT JOIN pg_indexes AS idx
+                        ON idx.schemaname = nsp.nspname
+                        AND idx.tablename = view.relname
+                GROUP BY view.oid, nsp.nspname, view.relname, view.relkind
+                ORDER BY depth
+                """
+            ),
+            {"schema": self.schema},
+        ).fetchall()
+        for name, kind, _, _, _ in reversed(views):
+            connection.execution_options(no_parameters=True).exec_driver_sql(
+                f"DROP {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name}"
+            )
+        for table in ["geometries", "generalized_geometries"]:
+            if not sqlalchemy.inspect(connection).has_table(table, schema=self.schema):
+                continue
+            connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    ALTER TABLE {self.relation(table)}
+                    ALTER COLUMN geometry
+                    TYPE geometry({'GEOMETRYZ' if dimension == 3 else 'GEOMETRY'}, {self.coordsysid})
+                    USING {'ST_Force3D' if dimension == 3 else 'ST_Force2D'}(geometry)
+                    """
+                )
+            )
+        for name, kind, definition, indexes, _ in views:
+            # La definición se ejecuta sin parámetros para no interpretar ':' ni '%'.
+            connection.execution_options(no_parameters=True).exec_driver_sql(
+                f"CREATE {'MATERIALIZED VIEW' if kind == 'm' else 'VIEW'} {name} "
+                f"AS {definition}"
+            )
+            for index in indexes:
+                connection.execution_options(no_parameters=True).exec_driver_sql(index)
 
     def list_tables(self) -> list:
         """
@@ -251,6 +679,10 @@ class PostGIS:
         """
         Crea una vista en la base de datos.
 
+        Además de la geometría original, la vista expone una columna
+        `geometry_g<nivel>` por cada nivel de generalización configurado, que puede
+        utilizarse en reglas de estilo dependientes de la escala.
+
         Args:
             layer (str): Nombre de la vista.
             if_exists (Literal["fail", "replace"]): Acción a realizar si la vista ya existe
@@ -260,35 +692,94 @@ class PostGIS:
             Exception: Si la vista ya existe y se estableció `if_exists` en "fail".
 
         """
+        self.pin()
         if layer in self.list_views() and if_exists == "fail":
             raise Exception(f"View '{layer}' already exists!")
-        self.execute(
-            f"""
-            CREATE OR REPLACE VIEW {self.schema}."{layer}" AS (
-                SELECT
-                    ge."name" AS "nombre",
-                    ba."obra" AS "obra",
-                    ba."operatoria" AS "operatoria",
-                    ba."provincia" AS "provincia",
-                    ba."departamento" AS "departamento",
-                    ba."municipio" AS "municipio",
-                    ba."localidad" AS "localidad",
-                    ba."estado" AS "estado",
-                    ba."descripcion" AS "descripción",
-                    ba."cantidad" AS "cantidad",
-                    ba."categoria" AS "categoría",
-                    ba."ente" AS "ente",
-                    ba."fuente" AS "fuente",
-                    la."name" AS "layer",
-                    ge."geometry" AS "geometry"
-                FROM {self.schema}.layers AS la
-                    JOIN {self.schema}.batches AS ba ON la.id = ba.layer_id
-                    JOIN {self.schema}.geometries AS ge ON ba.id = ge.batch_id
-                WHERE la.name = '{layer}')
-            """
+        # Una columna por nivel de generalización, con la geometría original
+        # como respaldo para las geometrías que no se generalizan (puntos).
+        generalized_columns = "".join(
+            f", COALESCE(g{level}.geometry, ge.geometry)"
+            f" AS {self.quote(f'geometry_g{level}')}"
+            for level in self.generalization_levels
+        )
+        generalized_joins = "".join(
+            f" LEFT JOIN {self.relation('generalized_geometries')} AS g{level}"
+            f" ON g{level}.geometry_id = ge.id AND g{level}.level = {level}"
+            for level in self.generalization_levels
         )
+        # Las sentencias DDL no admiten parámetros: el nombre de la capa se incluye
+        # como literal escapado y la sentencia se ejecuta sin interpretar ':' ni '%'.
+        with self.engine.begin() as connection:
+            connection.execution_options(no_parameters=True).exec_driver_sql(
+                f"""
+                CREATE OR REPLACE VIEW {self.relation(layer)} AS (
+                    SELECT
+                        ge."name" AS "nombre",
+                        ba."obra" AS "obra",
+                        ba."operatoria" AS "operatoria",
+                        ba."provincia" AS "provincia",
+                        ba."departamento" AS "departamento",
+                        ba."municipio" AS "municipio",
+                        ba."localidad" AS "localidad",
+                        ba."estado" AS "estado",
+                        ba."descripcion" AS "descripción",
+                        ba."cantidad" AS "cantidad",
+                        ba."categoria" AS "categoría",
+                        ba."ente" AS "ente",
+                        ba."fuente" AS "fuente",
+                        la."name" AS "layer",
+                        ge."geometry" AS "geometry"{generalized_columns}
+                    FROM {self.relation('layers')} AS la
+                        JOIN {self.relation('batches')} AS ba ON la.id = ba.layer_id
+                        JOIN {self.relation('geometries')} AS ge ON ba.id = ge.batch_id{generalized_joins}
+                    WHERE la.name = {self.literal(layer)})
+                """
+            )
         self.session.commit()
 
+    def generalize_batches(self, ids: Union[int, List[int]]) -> None:
+        """
+        Calcula las versiones generalizadas de las geometrías de una serie de batches.
+
+        Por cada tolerancia configurada se guarda el resultado de
+        `ST_SimplifyPreserveTopology` en la tabla de geometrías generalizadas. Los
+        puntos se omiten, ya que no admiten simplificación. Se ejecuta dentro de la
+        transacción de la sesión, por lo que las geometrías deben estar persistidas
+        (flush) previamente.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de batches.
+
+        """
+        self.pin()
+        if isinstance(ids, int):
+            ids = [ids]
+        if not self.tolerances:
+            return
+        self.session.execute(
+            sqlalchemy.text(
+                f"""
+                INSERT INTO {self.relation('generalized_geometries')}
+                    (geometry_id, level, tolerance, geometry)
+                SELECT
+                    ge.id,
+                    lvl.level,
+                    lvl.tolerance,
+                    ST_SimplifyPreserveTopology(ge.geometry, lvl.tolerance)
+                FROM {self.relation('geometries')} AS ge
+                    CROSS JOIN unnest(CAST(:tolerances AS float8[]))
+                        WITH ORDINALITY AS lvl(tolerance, level)
+                WHERE ge.batch_id = ANY(:ids)
+                AND ST_Dimension(ge.geometry) > 0
+                ON CONFLICT (geometry_id, level) DO UPDATE
+                SET tolerance = EXCLUDED.tolerance,
+                    geometry = EXCLUDED.geometry,
+                    updated_at = now()
+                """
+            ),
+            {"ids": ids, "tolerances": self.tolerances},
+        )
+
     def drop_view(
         self,
         layer: str,
@@ -309,13 +800,14 @@ class PostGIS:
             Exception: Si la vista no existe y se estableció `if_not_exists` en "fail".
 
         """
+        self.pin()
         if layer not in self.list_views() and if_not_exists == "fail":
             raise Exception(f"View '{layer}' doesn't exist!")
-        self.execute(
-            f"""
-            DROP VIEW IF EXISTS {self.schema}."{layer}" {'CASCADE' if cascade else ''}
-            """
-        )
+        with self.engine.begin() as connection:
+            connection.execution_options(no_parameters=True).exec_driver_sql(
+                f"DROP VIEW IF EXISTS {self.relation(layer)}"
+                + (" CASCADE" if cascade else "")
+            )
 
     def drop_layer(
         self,
@@ -337,111 +829,201 @@ class PostGIS:
             Exception: Si la capa no existe y se estableció `if_not_exists` en "fail".
 
         """
+        self.pin()
         if layer not in self.list_layers() and if_not_exists == "fail":
             raise Exception(f"Layer '{layer}' doesn't exist!")
         if cascade:
-            self.execute(
-                f"""
-                DELETE FROM {self.schema}.geometries AS ge
-                    USING {self.schema}.batches AS ba,
-                    {self.schema}.layers AS la
-                    WHERE ge.batch_id = ba.id
-                    AND ba.layer_id = la.id
-                    AND la.name = '{layer}';
-                """
+            self._delete_in_chunks(
+                table="geometries",
+                where=f"""batch_id IN (
+                    SELECT ba.id FROM {self.relation('batches')} AS ba
+                        JOIN {self.relation('layers')} AS la ON la.id = ba.layer_id
+                    WHERE la.name = :layer
+                )""",
+                params={"layer": layer},
+            )
+        with self.engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(
+                    f"DELETE FROM {self.relation('layers')} WHERE name = :layer"
+                ),
+                {"layer": layer},
+            )
+
+    def _delete_in_chunks(
+        self,
+        table: str,
+        where: str,
+        params: dict,
+        chunksize: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Elimina filas de una tabla en fragmentos acotados, recorriendo la clave
+        primaria en orden ascendente. Cada fragmento se ejecuta en su propia
+        transacción para no retener bloqueos ni generar WAL excesivo, con una
+        sentencia preparada que se reutiliza entre fragmentos.
+
+        Args:
+            table (str): Nombre de la tabla dentro del esquema.
+            where (str): Condición SQL con parámetros nombrados (ej: "batch_id = ANY(:ids)").
+            params (dict): Valores de los parámetros utilizados en `where`.
+            chunksize (Optional[int]): Cantidad máxima de filas por transacción
+                (por defecto: el configurado en el objeto).
+            on_progress (Optional[Callable[[int], None]]): Función que recibe el total
+                de filas eliminadas luego de cada fragmento.
+
+        Returns:
+            int: Cantidad total de filas eliminadas.
+
+        """
+        self.pin()
+        query = f"""
+            DELETE FROM {self.relation(table)}
+            WHERE id IN (
+                SELECT id FROM {self.relation(table)}
+                WHERE ({where}) AND id > :last_id
+                ORDER BY id
+                LIMIT :chunksize
             )
-        self.execute(
-            f"""
-            DELETE FROM {self.schema}.layers AS la
-                WHERE la.name = '{layer}';
+            RETURNING id
             """
-        )
+        deleted = 0
+        last_id = 0
+        while True:
+            with self.engine.begin() as transaction:
+                chunk = [
+                    row[0]
+                    for row in self.execute_prepared(
+                        transaction,
+                        query,
+                        {
+                            **params,
+                            "last_id": last_id,
+                            "chunksize": chunksize or self._delete_chunksize,
+                        },
+                    )
+                ]
+            if not chunk:
+                break
+            deleted += len(chunk)
+            last_id = max(chunk)
+            if on_progress:
+                on_progress(deleted)
+        return deleted
 
     def drop_batches(
         self,
         ids: Union[int, List[int]],
         cascade: bool = False,
-    ):
+        chunksize: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
         """
         Elimina Batches según una lista de ids. Si se ejecuta en modo
-        cascade: elimina geometrías que dependen de los batches y anula relaciones
-        con Logs generados.
+        cascade: elimina geometrías que dependen de los batches en fragmentos
+        acotados. En ambos casos anula relaciones con Logs generados.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de batches a eliminar.
+            cascade (bool): Especifica si se deben eliminar las geometrías asociadas.
+            chunksize (Optional[int]): Cantidad máxima de geometrías por transacción.
+            on_progress (Optional[Callable[[int], None]]): Función que recibe el total
+                de geometrías eliminadas luego de cada fragmento.
+
+        Returns:
+            int: Cantidad de geometrías eliminadas.
+
+        Raises:
+            Exception: Si existen geometrías asociadas y `cascade` es False.
+
         """
+        self.pin()
         # Assert to deal with a list of indexes
         if isinstance(ids, int):
             ids = [ids]
         geometries_deleted = 0
-        with self.engine.begin() as transaction:
-            geometries_remaining = (
-                self.session.query(Geometries)
-                .filter(Geometries.batch_id.in_(ids))
-                .count()
+        if cascade:
+            geometries_deleted = self._delete_in_chunks(
+                table="geometries",
+                where="batch_id = ANY(:ids)",
+                params={"ids": ids},
+                chunksize=chunksize,
+                on_progress=on_progress,
             )
-            if cascade:
-                geometries_deleted = geometries_remaining
-                # Run cascade efect
-                transaction.execute(
-                    """
-                        UPDATE {schema}.logs
-                        SET batch_id = NULL
-                        WHERE batch_id IN ({ids}) ;
-                    """.format(
-                        schema=self.schema, ids=", ".join(str(i) for i in ids)
+        with self.engine.begin() as transaction:
+            if (
+                not cascade
+                and transaction.execute(
+                    sqlalchemy.text(
+                        f"""
+                    SELECT EXISTS (
+                        SELECT 1 FROM {self.relation('geometries')}
+                        WHERE batch_id = ANY(:ids)
                     )
-                )
-                transaction.execute(
                     """
-                        DELETE FROM {schema}.geometries
-                        WHERE batch_id IN ({ids}) ;
-                    """.format(
-                        schema=self.schema, ids=", ".join(str(i) for i in ids)
-                    )
-                )
-            elif geometries_remaining > 0:
+                    ),
+                    {"ids": ids},
+                ).scalar()
+            ):
                 raise Exception(
-                    f"Batch deletion prevented! There are {geometries_remaining} geometries attached to"
+                    "Batch deletion prevented! There are geometries attached to"
                     " this batch. Set 'cascade' to true to proceed with Geometry deletion as well."
                 )
-            # Delete batches
             transaction.execute(
-                """
-                    DELETE FROM {schema}.geometries
-                    WHERE batch_id IN ({ids}) ;
-                """.format(
-                    schema=self.schema, ids=", ".join(str(i) for i in ids)
-                )
+                sqlalchemy.text(
+                    f"""
+                    UPDATE {self.relation('logs')}
+                    SET batch_id = NULL
+                    WHERE batch_id = ANY(:ids)
+                    """
+                ),
+                {"ids": ids},
+            )
+            transaction.execute(
+                sqlalchemy.text(
+                    f"""
+                    DELETE FROM {self.relation('batches')}
+                    WHERE id = ANY(:ids)
+                    """
+                ),
+                {"ids": ids},
             )
-            # self.session.commit()
         return geometries_deleted
 
     def drop_geometries(
         self,
         ids: Union[int, List[int]],
         cascade: bool = False,
-    ):
+        chunksize: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
         """
-        Elimina geometrías en base a una lista de ids.
+        Elimina geometrías en base a una lista de ids, en fragmentos acotados.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de geometrías a eliminar.
+            chunksize (Optional[int]): Cantidad máxima de geometrías por transacción.
+            on_progress (Optional[Callable[[int], None]]): Función que recibe el total
+                de geometrías eliminadas luego de cada fragmento.
+
+        Returns:
+            int: Cantidad de geometrías eliminadas.
+
         """
         if isinstance(ids, int):
             ids = [ids]
-        geometries_deleted = (
-            self.session.query(Geometries).filter(Geometries.id.in_(ids)).count()
+        return self._delete_in_chunks(
+            table="geometries",
+            where="id = ANY(:ids)",
+            params={"ids": sorted(set(ids))},
+            chunksize=chunksize,
+            on_progress=on_progress,
         )
-        with self.engine.begin() as transaction:
-            transaction.execute(
-                """
-                    DELETE FROM {schema}.geometries
-                    WHERE id IN ({ids}) ;
-                """.format(
-                    schema=self.schema, ids=", ".join(str(i) for i in ids)
-                )
-            )
-            # self.session.commit()
-        return geometries_deleted
 
     def count_layer_geometries(self, layer: str):
         """
-        Obtiene el número de geometrías en una capa.
+        Obtiene el número de geometrías en una capa, a partir de sus estadísticas.
 
         Args:
             layer (str): Nombre de la capa.
@@ -450,101 +1032,1511 @@ class PostGIS:
             int: Número de geometrías en la capa.
 
         """
-        return pandas.read_sql(
-            f"""
-            SELECT count(*) FROM {self.schema}."{layer}"
-            """,
-            self.engine,
-        ).iloc[0, 0]
+        statistics = self.get_layer_statistics(layer)
+        return statistics["features"] if statistics else 0
 
-    def bbox(self, query: str, geometry_col: str = "geometry") -> dict:
+    def get_layer_statistics(self, layer: str) -> Optional[dict]:
         """
-        Obtiene los límites de una geometría.
+        Obtiene las estadísticas de una capa: cantidad de geometrías, cantidad por tipo
+        de geometría, área total (m²), longitud total de las líneas (m), cantidad de
+        vértices y extensión.
+
+        Las estadísticas se mantienen en forma incremental en la tabla
+        `layer_statistics` (ver LayerStatistics), por lo que no se recorren las
+        geometrías de la capa. Si desde la última compactación se eliminaron
+        geometrías, la extensión puede ser mayor a la real (`bbox_exact` es falso).
 
         Args:
-            query (str): Consulta SQL que devuelve una geometría.
-            geometry_col (str): Nombre de la columna que contiene la geometría
-                (por defecto: "geometry").
+            layer (str): Nombre de la capa.
 
         Returns:
-            dict: Límites de la geometría.
+            Optional[dict]: Estadísticas de la capa, o None si la capa no existe.
 
         """
-        if query.strip() in self.list_views():
-            table = f'{self.schema}."{query.strip()}"'
-        else:
-            table = f"({self.clean(query)}) AS query_result"
-        blist = (
-            pandas.read_sql(
-                f"SELECT ST_Extent({geometry_col}) AS bbox_str FROM {table};",
-                self.engine,
-            )
-            .iloc[0, 0]
-            .strip("BOX()")
-            .replace(" ", ",")
-            .split(",")
-        )
+        with self.read_connection() as connection:
+            row = self.execute_prepared(
+                connection,
+                f"""
+                SELECT
+                    coalesce(sum(ls.features), 0) AS features,
+                    coalesce(sum(ls.area), 0) AS area,
+                    coalesce(sum(ls.length), 0) AS length,
+                    coalesce(sum(ls.vertices), 0) AS vertices,
+                    min(ls.minx) AS minx,
+                    min(ls.miny) AS miny,
+                    max(ls.maxx) AS maxx,
+                    max(ls.maxy) AS maxy,
+                    NOT coalesce(bool_or(ls.extent_stale), false) AS bbox_exact
+                FROM {self.relation('layers')} AS la
+                    LEFT JOIN {self.relation('layer_statistics')} AS ls
+                        ON ls.layer_id = la.id
+                WHERE la.name = :layer
+                GROUP BY la.id
+                """,
+                {"layer": layer},
+            ).first()
+            if row is None:
+                return None
+            geometry_types = self.execute_prepared(
+                connection,
+                f"""
+                SELECT types.key, sum(types.value::bigint)
+                FROM {self.relation('layers')} AS la
+                    JOIN {self.relation('layer_statistics')} AS ls
+                        ON ls.layer_id = la.id
+                    CROSS JOIN jsonb_each_text(ls.geometry_types) AS types
+                WHERE la.name = :layer
+                GROUP BY types.key
+                HAVING sum(types.value::bigint) <> 0
+                ORDER BY types.key
+                """,
+                {"layer": layer},
+            ).fetchall()
+        features = int(row.features)
         return {
-            "minx": float(blist[0].strip()),
-            "maxx": float(blist[1].strip()),
-            "miny": float(blist[2].strip()),
-            "maxy": float(blist[3].strip()),
+            "layer": layer,
+            "features": features,
+            "geometry_types": {key: int(count) for key, count in geometry_types},
+            "area": float(row.area) if features else 0.0,
+            "length": float(row.length) if features else 0.0,
+            "vertices": int(row.vertices),
+            "bbox": (
+                {
+                    "minx": row.minx,
+                    "miny": row.miny,
+                    "maxx": row.maxx,
+                    "maxy": row.maxy,
+                }
+                if features and row.minx is not None
+                else None
+            ),
+            "bbox_exact": bool(row.bbox_exact),
         }
 
-    def get_log(self, id: Union[int, Logs]) -> Logs:
-        return self.session.query(Logs).get(id) if isinstance(id, int) else id
-
-    def get_log_record(self, id: int) -> dict:
+    def compact_layer_statistics(self) -> int:
         """
-        Obtiene el registro de un registro de registro de la base de datos.
+        Compacta las estadísticas de las capas en una sola fila por capa.
 
-        Args:
-            id (int): ID del registro.
+        Cada inserción o eliminación de geometrías agrega una fila de variación a
+        `layer_statistics`; esta tarea periódica las suma y, si se eliminaron
+        geometrías, recalcula la extensión de la capa. Cada capa se compacta en su
+        propia transacción, con una única sentencia, por lo que las filas que agreguen
+        transacciones concurrentes se conservan para la siguiente compactación.
 
         Returns:
-            dict: Registro correspondiente al ID proporcionado.
+            int: Cantidad de capas compactadas.
+
+        """
+        self.pin()
+        with self.engine.connect() as connection:
+            layers = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT layer_id, bool_or(extent_stale)
+                    FROM {self.relation('layer_statistics')}
+                    GROUP BY layer_id
+                    HAVING count(*) > 1 OR bool_or(extent_stale)
+                    """
+                )
+            ).fetchall()
+        for layer_id, stale in layers:
+            if stale:
+                extent = f"""
+                    (
+                        SELECT ST_Extent(ge.geometry) AS box
+                        FROM {self.relation('batches')} AS ba
+                            JOIN {self.relation('geometries')} AS ge
+                                ON ge.batch_id = ba.id
+                        WHERE ba.layer_id = :layer_id
+                    )
+                """
+            else:
+                extent = """
+                    (
+                        SELECT ST_MakeBox2D(
+                            ST_Point(min(minx), min(miny)),
+                            ST_Point(max(maxx), max(maxy))
+                        ) AS box
+                        FROM removed
+                    )
+                """
+            with self.engine.begin() as connection:
+                connection.execute(
+                    sqlalchemy.text(
+                        f"""
+                        WITH removed AS (
+                            DELETE FROM {self.relation('layer_statistics')}
+                            WHERE layer_id = :layer_id
+                            RETURNING *
+                        ), types AS (
+                            SELECT types.key, sum(types.value::bigint) AS features
+                            FROM removed
+                                CROSS JOIN jsonb_each_text(removed.geometry_types) AS types
+                            GROUP BY types.key
+                            HAVING sum(types.value::bigint) <> 0
+                        ), extent AS {extent}
+                        INSERT INTO {self.relation('layer_statistics')}
+                            (layer_id, features, geometry_types, area, length, vertices,
+                             minx, miny, maxx, maxy, extent_stale)
+                        SELECT
+                            :layer_id,
+                            sum(removed.features),
+                            (
+                                SELECT coalesce(jsonb_object_agg(key, features), '{{}}')
+                                FROM types
+                            ),
+                            sum(removed.area),
+                            sum(removed.length),
+                            sum(removed.vertices),
+                            (SELECT ST_XMin(box) FROM extent),
+                            (SELECT ST_YMin(box) FROM extent),
+                            (SELECT ST_XMax(box) FROM extent),
+                            (SELECT ST_YMax(box) FROM extent),
+                            false
+                        FROM removed
+                        HAVING sum(removed.features) <> 0
+                        """
+                    ),
+                    {"layer_id": layer_id},
+                )
+        return len(layers)
+
+    def clock_timestamp(self) -> datetime:
         """
-        return getattr(self.get_log(id=id), "record", None)
+        Obtiene la fecha y hora actuales del servidor de base de datos.
 
-    def get_batch(self, id: Union[int, Batches]) -> Batches:
-        return self.session.query(Batches).get(id) if isinstance(id, int) else id
+        Returns:
+            datetime: Fecha y hora, sin zona horaria (como las columnas de fecha).
 
-    def get_batch_record(self, id: int) -> dict:
         """
-        Obtiene el registro de un registro de batch de la base de datos.
+        with self.engine.connect() as connection:
+            return connection.execute(
+                sqlalchemy.text("SELECT clock_timestamp()::timestamp")
+            ).scalar()
 
-        Args:
-            id (int): ID del batch.
+    def layer_features(self) -> dict:
+        """
+        Obtiene la cantidad de geometrías de todas las capas, desde sus estadísticas.
 
         Returns:
-            dict: Registro correspondiente al ID proporcionado.
+            dict: Cantidad de geometrías por nombre de capa.
+
         """
-        return getattr(self.get_batch(id=id), "record", None)
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT la.name, coalesce(sum(ls.features), 0)
+                    FROM {self.relation('layers')} AS la
+                        LEFT JOIN {self.relation('layer_statistics')} AS ls
+                            ON ls.layer_id = la.id
+                    GROUP BY la.name
+                    """
+                )
+            ).fetchall()
+        return {name: int(features) for name, features in rows}
 
-    def get_layer(
-        self, id: Optional[int] = None, name: Optional[str] = None
-    ) -> Optional[Layers]:
+    def get_layer_registry(self, layer: str) -> Optional[dict]:
         """
-        Devuelve el objeto de una capa existente.
+        Obtiene el estado de una capa en el registro de capas (ver LayerRegistry).
+
+        La consulta se resuelve con el índice único por nombre, en la base de datos
+        primaria, para que una validación nunca vea un estado anterior a la última
+        operación.
 
         Args:
-            id (int, opcional): ID de la capa a buscar.
-            name (str, opcional): Nombre de la capa a buscar.
+            layer (str): Nombre de la capa.
 
         Returns:
-            Layers o None: Objeto de la capa si se encuentra,
-                o None si no se encuentra ninguna coincidencia.
-        """
-        if id:
-            return self.session.query(Layers).get(id) if isinstance(id, int) else id
-        elif name:
-            return self.session.query(Layers).filter_by(name=name).first()
-        else:
-            return None
+            Optional[dict]: Estado de la capa, o None si no está registrada.
 
-    def get_or_create_layer(
-        self, id: Optional[int] = None, name: Optional[str] = None
-    ) -> Layers:
+        """
+        with self.engine.connect() as connection:
+            row = self.execute_prepared(
+                connection,
+                f"""
+                SELECT name, in_postgis, published, style, minx, miny, maxx, maxy,
+                    published_at, reconciled_at
+                FROM {self.relation('layer_registry')}
+                WHERE name = :layer
+                """,
+                {"layer": layer},
+            ).first()
+        if row is None:
+            return None
+        return {
+            "layer": row.name,
+            "in_postgis": row.in_postgis,
+            "published": row.published,
+            "style": row.style,
+            "bbox": (
+                {
+                    "minx": row.minx,
+                    "miny": row.miny,
+                    "maxx": row.maxx,
+                    "maxy": row.maxy,
+                }
+                if row.minx is not None
+                else None
+            ),
+            "published_at": row.published_at.isoformat() if row.published_at else None,
+            "reconciled_at": (
+                row.reconciled_at.isoformat() if row.reconciled_at else None
+            ),
+        }
+
+    def register_layer(self, layer: str, **state) -> None:
+        """
+        Actualiza el estado de una capa en el registro de capas, y la registra si no
+        existe. Se invoca luego de cada operación de la API que modifica la capa en
+        Geoserver.
+
+        Args:
+            layer (str): Nombre de la capa.
+            **state: Valores a actualizar: `published`, `style`, `minx`, `miny`,
+                `maxx` y `maxy`. Al publicar la capa también se actualiza la fecha de
+                publicación.
+
+        """
+        columns = ["published", "style", "minx", "miny", "maxx", "maxy"]
+        state = {key: value for key, value in state.items() if key in columns}
+        values = {key: f":{key}" for key in state}
+        if state.get("published"):
+            values["published_at"] = "now()"
+        with self.engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    INSERT INTO {self.relation('layer_registry')}
+                        (name, in_postgis{''.join(f', {key}' for key in values)})
+                    SELECT
+                        :layer,
+                        EXISTS (
+                            SELECT 1 FROM {self.relation('layers')} WHERE name = :layer
+                        ){''.join(f', {value}' for value in values.values())}
+                    ON CONFLICT (name) DO UPDATE SET
+                        {''.join(f'{key} = EXCLUDED.{key}, ' for key in values)}
+                        updated_at = now()
+                    """
+                ),
+                {"layer": layer, **state},
+            )
+
+    def unregister_style(self, style: str) -> None:
+        """
+        Quita un estilo eliminado de las capas del registro que lo tenían asignado.
+
+        Args:
+            style (str): Nombre del estilo.
+
+        """
+        with self.engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    UPDATE {self.relation('layer_registry')}
+                    SET style = NULL, updated_at = now()
+                    WHERE style = :style
+                    """
+                ),
+                {"style": style},
+            )
+
+    def request_publish(
+        self, layer: str, batches: List[int], delay: float, max_delay: float
+    ) -> Optional[float]:
+        """
+        Encola la publicación en Geoserver de los batches agregados a una capa.
+
+        Las solicitudes de una misma capa se acumulan y se publican juntas `delay`
+        segundos después de la última, pero no más de `max_delay` segundos después de
+        la primera (ver `claim_publish`). La fila de la capa se bloquea antes de
+        leerla, por lo que las solicitudes concurrentes se aplican una tras otra.
+
+        Args:
+            layer (str): Nombre de la capa.
+            batches (List[int]): IDs de los batches agregados.
+            delay (float): Demora de la publicación desde la última solicitud, en
+                segundos.
+            max_delay (float): Demora máxima desde la primera solicitud pendiente, en
+                segundos.
+
+        Returns:
+            Optional[float]: Segundos hasta la publicación, si hay que programarla; o
+                None si ya hay una publicación programada para la capa.
+
+        """
+        with self.engine.begin() as connection:
+            previous = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT
+                        publish_due_at IS NULL
+                            OR publish_due_at <= clock_timestamp() AS unscheduled
+                    FROM {self.relation('layer_registry')}
+                    WHERE name = :layer
+                    FOR UPDATE
+                    """
+                ),
+                {"layer": layer},
+            ).fetchone()
+            if previous is None:
+                return None
+            due_in = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    UPDATE {self.relation('layer_registry')}
+                    SET pending_batches =
+                            pending_batches || CAST(:batches AS integer[]),
+                        publish_requested_at =
+                            coalesce(publish_requested_at, clock_timestamp()),
+                        publish_due_at = least(
+                            clock_timestamp() + make_interval(secs => :delay),
+                            coalesce(publish_requested_at, clock_timestamp())
+                                + make_interval(secs => :max_delay)
+                        )
+                    WHERE name = :layer
+                    RETURNING extract(epoch FROM publish_due_at - clock_timestamp())
+                    """
+                ),
+                {
+                    "layer": layer,
+                    "batches": list(batches),
+                    "delay": delay,
+                    "max_delay": max_delay,
+                },
+            ).scalar()
+        if not previous[0]:
+            return None
+        return max(float(due_in), 0.0)
+
+    def claim_publish(self, layer: str) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        Toma las solicitudes de publicación pendientes de una capa, si ya se cumplió su
+        demora (ver `request_publish`).
+
+        La fila de la capa se bloquea antes de leer los batches pendientes, por lo que
+        si varias tareas compiten por la misma capa solo una los obtiene, y los
+        agregados concurrentes quedan pendientes para la próxima publicación. Las
+        solicitudes de capas eliminadas de PostGIS se descartan.
+
+        Args:
+            layer (str): Nombre de la capa.
+
+        Returns:
+            Tuple[Optional[List[int]], Optional[float]]: IDs de los batches pendientes
+                (None si no se tomaron), y segundos restantes hasta la publicación (None
+                si no hay solicitudes pendientes o ya se tomaron).
+
+        """
+        with self.engine.begin() as connection:
+            row = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT
+                        pending_batches,
+                        in_postgis,
+                        publish_due_at <= clock_timestamp() AS due,
+                        extract(epoch FROM publish_due_at - clock_timestamp())
+                    FROM {self.relation('layer_registry')}
+                    WHERE name = :layer
+                    FOR UPDATE
+                    """
+                ),
+                {"layer": layer},
+            ).fetchone()
+            if row is None:
+                return None, None
+            batches, in_postgis, due, due_in = row
+            if not (due or not in_postgis):
+                return None, (max(float(due_in), 0.0) if due_in is not None else None)
+            connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    UPDATE {self.relation('layer_registry')}
+                    SET pending_batches = '{{}}',
+                        publish_requested_at = NULL,
+                        publish_due_at = NULL
+                    WHERE name = :layer
+                    """
+                ),
+                {"layer": layer},
+            )
+        return (sorted(set(batches)) if in_postgis else None), None
+
+    def list_overdue_publishes(self, overdue: float) -> List[str]:
+        """
+        Obtiene las capas con solicitudes de publicación vencidas hace más de
+        `overdue` segundos, cuya tarea de publicación se perdió o agotó sus
+        reintentos (ver `request_publish`).
+
+        Args:
+            overdue (float): Segundos desde el vencimiento de las solicitudes.
+
+        Returns:
+            List[str]: Nombres de las capas.
+
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT name
+                    FROM {self.relation('layer_registry')}
+                    WHERE publish_due_at
+                        < clock_timestamp() - make_interval(secs => :overdue)
+                    ORDER BY publish_due_at
+                    """
+                ),
+                {"overdue": overdue},
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def reconcile_layer_registry(
+        self, published: List[str], started_at: datetime
+    ) -> dict:
+        """
+        Concilia el estado de publicación del registro de capas con Geoserver.
+
+        Las capas modificadas por la API después de `started_at` (mientras se obtenía
+        el listado de Geoserver) no se corrigen, ya que su estado es más reciente que
+        el listado. Se registran las capas publicadas en Geoserver que no estaban
+        registradas, y se eliminan del registro las que ya no existen ni en PostGIS ni
+        en Geoserver.
+
+        Args:
+            published (List[str]): Nombres de las capas publicadas en Geoserver.
+            started_at (datetime): Instante previo a la obtención del listado (ver
+                `clock_timestamp`).
+
+        Returns:
+            dict: Nombres de las capas corregidas ("published" y "unpublished"),
+                registradas ("registered") y eliminadas del registro ("removed").
+
+        """
+        published = list(published)
+        with self.engine.begin() as connection:
+            changed = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    UPDATE {self.relation('layer_registry')} AS lr
+                    SET published = lr.name = ANY(:published), reconciled_at = now()
+                    FROM {self.relation('layer_registry')} AS previous
+                    WHERE previous.id = lr.id
+                    AND lr.updated_at < :started_at
+                    RETURNING lr.name, previous.published, lr.published
+                    """
+                ),
+                {"published": published, "started_at": started_at},
+            ).fetchall()
+            registered = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    INSERT INTO {self.relation('layer_registry')}
+                        (name, in_postgis, published, reconciled_at)
+                    SELECT name, false, true, now()
+                    FROM unnest(CAST(:published AS varchar[])) AS name
+                    ON CONFLICT (name) DO NOTHING
+                    RETURNING name
+                    """
+                ),
+                {"published": published},
+            ).fetchall()
+            removed = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    DELETE FROM {self.relation('layer_registry')}
+                    WHERE NOT in_postgis AND published IS FALSE
+                    RETURNING name
+                    """
+                )
+            ).fetchall()
+        return {
+            "published": sorted(
+                name for name, before, after in changed if after and before is not True
+            ),
+            "unpublished": sorted(
+                name
+                for name, before, after in changed
+                if not after and before is not False
+            ),
+            "registered": sorted(row[0] for row in registered),
+            "removed": sorted(row[0] for row in removed),
+        }
+
+    def stream_view(
+        self,
+        layer: str,
+        columns: str = "*",
+        chunksize: Optional[int] = None,
+    ) -> Generator[list, None, None]:
+        """
+        Recorre las filas de una vista utilizando un cursor del lado del servidor.
+
+        Las filas se obtienen en fragmentos, por lo que la memoria utilizada es
+        constante sin importar el tamaño de la capa.
+
+        Args:
+            layer (str): Nombre de la vista.
+            columns (str): Expresión SQL de columnas a seleccionar, donde la vista
+                se referencia con el alias `view` (por defecto: "*").
+            chunksize (Optional[int]): Cantidad de filas por fragmento
+                (por defecto: el configurado en el objeto).
+
+        Yields:
+            list: Fragmento de filas de la vista.
+
+        Raises:
+            Exception: Si la vista no existe.
+
+        """
+        if layer not in self.list_views():
+            raise Exception(f"View '{layer}' doesn't exist!")
+        with self.read_engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(
+                sqlalchemy.text(f"SELECT {columns} FROM {self.relation(layer)} AS view")
+            )
+            for partition in result.partitions(chunksize or self._stream_chunksize):
+                yield partition
+
+    def list_view_columns(self, layer: str, geometries: bool = True) -> list:
+        """
+        Obtiene una lista de nombres de columnas de una vista.
+
+        Args:
+            layer (str): Nombre de la vista.
+            geometries (bool): Especifica si se incluyen las columnas de tipo
+                geometría (por defecto: True).
+
+        Returns:
+            list: Lista de nombres de columnas.
+
+        """
+        return [
+            column["name"]
+            for column in sqlalchemy.inspect(self.read_engine).get_columns(
+                layer, schema=self.schema
+            )
+            if geometries or not isinstance(column["type"], Geometry)
+        ]
+
+    def tile(
+        self,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        extent: int = 4096,
+        buffer: int = 64,
+        geometry_col: str = "geometry",
+        render_col: Optional[str] = None,
+    ) -> bytes:
+        """
+        Genera un Mapbox Vector Tile de una vista con `ST_AsMVT`.
+
+        El filtro sobre la envolvente de la tesela se expresa en el sistema de
+        coordenadas de la capa, de modo que pueda resolverse con el índice GIST
+        de la columna de geometría.
+
+        La lectura se resuelve en una réplica si hay alguna disponible.
+
+        Args:
+            layer (str): Nombre de la vista.
+            z (int): Nivel de zoom.
+            x (int): Columna de la tesela.
+            y (int): Fila de la tesela.
+            extent (int): Tamaño de la tesela en unidades de MVT (por defecto: 4096).
+            buffer (int): Margen de recorte en unidades de MVT (por defecto: 64).
+            geometry_col (str): Nombre de la columna que contiene la geometría
+                utilizada para filtrar (por defecto: "geometry").
+            render_col (Optional[str]): Nombre de la columna que contiene la geometría
+                a codificar, ej: una versión generalizada (por defecto: `geometry_col`).
+
+        Returns:
+            bytes: Tesela codificada en formato MVT.
+
+        Raises:
+            Exception: Si la vista no existe.
+
+        """
+        if layer not in self.list_views():
+            raise Exception(f"View '{layer}' doesn't exist!")
+        attributes = "".join(
+            f", view.{self.quote(column)}"
+            for column in self.list_view_columns(layer, geometries=False)
+        )
+        with self.read_connection() as connection:
+            tile = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    WITH bounds AS (
+                        SELECT
+                            ST_TileEnvelope(:z, :x, :y) AS tile,
+                            ST_Transform(
+                                ST_TileEnvelope(:z, :x, :y, margin => :margin), :srid
+                            ) AS filter
+                    ),
+                    mvtgeom AS (
+                        SELECT
+                            ST_AsMVTGeom(
+                                ST_Transform(
+                                    ST_Force2D(view.{self.quote(render_col or geometry_col)}), 3857
+                                ),
+                                bounds.tile,
+                                :extent,
+                                :buffer
+                            ) AS mvt_geometry{attributes}
+                        FROM {self.relation(layer)} AS view, bounds
+                        WHERE view.{self.quote(geometry_col)} && bounds.filter
+                    )
+                    SELECT ST_AsMVT(mvtgeom.*, :layer, :extent, 'mvt_geometry')
+                    FROM mvtgeom
+                    """
+                ),
+                {
+                    "z": z,
+                    "x": x,
+                    "y": y,
+                    "margin": buffer / extent,
+                    "srid": self.coordsysid,
+                    "extent": extent,
+                    "buffer": buffer,
+                    "layer": layer,
+                },
+            ).scalar()
+        return bytes(tile or b"")
+
+    def aggregate(
+        self,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        method: Literal["grid", "hex", "cluster"] = "grid",
+        cells: int = 32,
+        geometry_col: str = "geometry",
+    ) -> dict:
+        """
+        Agrega las geometrías de una vista dentro de una tesela, para representar capas
+        de muchos elementos en zooms bajos.
+
+        Cada geometría se reduce a un punto (`ST_PointOnSurface`) en Web Mercator, que
+        se cuenta solo en la tesela que lo contiene, y se agrupa según el método:
+            - "grid": celdas cuadradas (`ST_SnapToGrid`); cada grupo se representa con
+              el centroide de sus puntos.
+            - "hex": celdas hexagonales (`ST_HexagonGrid`); cada grupo se representa con
+              el polígono de su celda. Un punto sobre el borde entre dos celdas se
+              cuenta solo en la de menor índice (i, j).
+            - "cluster": grupos de celdas cuadradas contiguas (`ST_ClusterDBSCAN`); cada
+              grupo se representa con el centroide ponderado de sus celdas. Se agrupan
+              celdas y no puntos para acotar el costo en capas de muchos elementos.
+
+        La lectura se resuelve en una réplica si hay alguna disponible.
+
+        Args:
+            layer (str): Nombre de la vista.
+            z (int): Nivel de zoom.
+            x (int): Columna de la tesela.
+            y (int): Fila de la tesela.
+            method (Literal["grid", "hex", "cluster"]): Método de agregación
+                (por defecto: "grid").
+            cells (int): Cantidad de celdas por lado de la tesela (por defecto: 32).
+            geometry_col (str): Nombre de la columna que contiene la geometría
+                (por defecto: "geometry").
+
+        Returns:
+            dict: FeatureCollection GeoJSON (EPSG:4326) con la cantidad de geometrías
+                de cada grupo en la propiedad `count`.
+
+        Raises:
+            Exception: Si la vista no existe.
+            ValueError: Si el método no es válido.
+
+        """
+        if layer not in self.list_views():
+            raise Exception(f"View '{layer}' doesn't exist!")
+        snapped = """
+            SELECT
+                count(*) AS count,
+                ST_Centroid(ST_Collect(points.point)) AS geometry
+            FROM points, bounds
+            GROUP BY ST_SnapToGrid(
+                points.point, ST_XMin(bounds.tile), ST_YMin(bounds.tile), bounds.size, bounds.size
+            )
+        """
+        if method == "grid":
+            groups = snapped
+        elif method == "hex":
+            groups = """
+                SELECT count(*) AS count, cells.geometry
+                FROM (
+                    SELECT DISTINCT ON (points.id) hex.geom AS geometry
+                    FROM bounds
+                        CROSS JOIN ST_HexagonGrid(bounds.size, bounds.tile) AS hex
+                        JOIN points ON ST_Intersects(hex.geom, points.point)
+                    ORDER BY points.id, hex.i, hex.j
+                ) AS cells
+                GROUP BY cells.geometry
+            """
+        elif method == "cluster":
+            groups = f"""
+                SELECT
+                    sum(cells.count) AS count,
+                    ST_Point(
+                        sum(ST_X(cells.geometry) * cells.count) / sum(cells.count),
+                        sum(ST_Y(cells.geometry) * cells.count) / sum(cells.count),
+                        3857
+                    ) AS geometry
+                FROM (
+                    SELECT
+                        snapped.*,
+                        ST_ClusterDBSCAN(snapped.geometry, eps => bounds.size, minpoints => 1)
+                            OVER () AS cluster
+                    FROM ({snapped}) AS snapped, bounds
+                ) AS cells
+                GROUP BY cells.cluster
+            """
+        else:
+            raise ValueError(
+                f"Aggregation method must be grid, hex or cluster, not {method}."
+            )
+        with self.read_connection() as connection:
+            rows = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    WITH bounds AS (
+                        SELECT
+                            ST_TileEnvelope(:z, :x, :y) AS tile,
+                            ST_Transform(ST_TileEnvelope(:z, :x, :y), :srid) AS filter,
+                            (ST_XMax(ST_TileEnvelope(:z, :x, :y))
+                                - ST_XMin(ST_TileEnvelope(:z, :x, :y))) / :cells AS size
+                    ),
+                    points AS (
+                        SELECT row_number() OVER () AS id, candidates.point
+                        FROM (
+                            SELECT
+                                ST_Transform(
+                                    ST_PointOnSurface(ST_Force2D(view.{self.quote(geometry_col)})), 3857
+                                ) AS point
+                            FROM {self.relation(layer)} AS view, bounds
+                            WHERE view.{self.quote(geometry_col)} && bounds.filter
+                        ) AS candidates, bounds
+                        -- Envolvente semiabierta: un punto sobre el borde entre dos
+                        -- teselas se cuenta solo en una (salvo en el borde del mundo).
+                        WHERE ST_X(candidates.point) >= ST_XMin(bounds.tile)
+                            AND ST_Y(candidates.point) >= ST_YMin(bounds.tile)
+                            AND (ST_X(candidates.point) < ST_XMax(bounds.tile)
+                                OR :last_column)
+                            AND (ST_Y(candidates.point) < ST_YMax(bounds.tile)
+                                OR :first_row)
+                    ),
+                    groups AS ({groups})
+                    SELECT groups.count, ST_AsGeoJSON(ST_Transform(groups.geometry, 4326))
+                    FROM groups
+                    """
+                ),
+                {
+                    "z": z,
+                    "x": x,
+                    "y": y,
+                    "srid": self.coordsysid,
+                    "cells": cells,
+                    "last_column": x == 2**z - 1,
+                    "first_row": y == 0,
+                },
+            ).fetchall()
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": json.loads(geometry),
+                    "properties": {"count": int(count)},
+                }
+                for count, geometry in rows
+            ],
+        }
+
+    def bbox(self, layer: str, geometry_col: str = "geometry") -> dict:
+        """
+        Obtiene los límites de las geometrías de una vista.
+
+        La consulta no se prepara (ver `execute_prepared`): su texto incluye el nombre
+        de la vista, por lo que cada vista requeriría su propia sentencia.
+
+        Args:
+            layer (str): Nombre de la vista.
+            geometry_col (str): Nombre de la columna que contiene la geometría
+                (por defecto: "geometry").
+
+        Returns:
+            dict: Límites de las geometrías (None si la vista está vacía).
+
+        """
+        with self.read_connection() as connection:
+            extent = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    SELECT
+                        ST_XMin(extent), ST_XMax(extent),
+                        ST_YMin(extent), ST_YMax(extent)
+                    FROM (
+                        SELECT ST_Extent(view.{self.quote(geometry_col)}) AS extent
+                        FROM {self.relation(layer)} AS view
+                    ) AS bounds
+                    """
+                )
+            ).fetchone()
+        return dict(zip(["minx", "maxx", "miny", "maxy"], extent))
+
+    def query_layer_geometries(
+        self,
+        layer: str,
+        bbox: Optional[List[float]] = None,
+        intersects: Optional[str] = None,
+        filters: Optional[dict] = None,
+        metadata: Optional[dict] = None,
+    ) -> sqlalchemy.orm.Query:
+        """
+        Construye una consulta sobre las geometrías de una capa.
+
+        La consulta devuelve el id, nombre, descripción y geometría (GeoJSON) de cada
+        geometría junto con los atributos de su batch, ordenada por id de geometría
+        para permitir paginación por clave (keyset).
+
+        Args:
+            layer (str): Nombre de la capa.
+            bbox (Optional[List[float]]): Envolvente [minx, miny, maxx, maxy] en el
+                sistema de coordenadas de la capa.
+            intersects (Optional[str]): Geometría en formato WKT o GeoJSON con la que
+                deben intersectar los resultados.
+            filters (Optional[dict]): Valores exactos de atributos de Batches (ej:
+                provincia).
+            metadata (Optional[dict]): Objeto JSON que debe estar contenido en la
+                metadata de Batches (operador @>, resuelto con el índice GIN).
+
+        Returns:
+            sqlalchemy.orm.Query: Consulta sin paginar.
+
+        """
+        query = (
+            self.read_session.query(
+                Geometries.id,
+                Geometries.name,
+                Geometries.description,
+                func.ST_AsGeoJSON(Geometries.geometry).label("geojson"),
+                Batches,
+            )
+            .join(Batches, Geometries.batch_id == Batches.id)
+            .join(Layers, Batches.layer_id == Layers.id)
+            .filter(Layers.name == layer)
+        )
+        if bbox:
+            query = query.filter(
+                Geometries.geometry.intersects(
+                    func.ST_MakeEnvelope(*bbox, self.coordsysid)
+                )
+            )
+        if intersects:
+            geometry = (
+                func.ST_SetSRID(func.ST_GeomFromGeoJSON(intersects), self.coordsysid)
+                if intersects.strip().startswith("{")
+                else func.ST_GeomFromText(intersects, self.coordsysid)
+            )
+            query = query.filter(func.ST_Intersects(Geometries.geometry, geometry))
+        for key, value in (filters or {}).items():
+            query = query.filter(getattr(Batches, key) == value)
+        if metadata:
+            query = query.filter(Batches.json.contains(metadata))
+        return query.order_by(Geometries.id)
+
+    def count(
+        self, query: sqlalchemy.orm.Query, exact_limit: int = 10000
+    ) -> Tuple[int, bool]:
+        """
+        Cuenta las filas de una consulta utilizando la estimación del planificador.
+
+        Si la estimación no supera `exact_limit` se realiza un conteo exacto; en caso
+        contrario se devuelve la estimación, evitando recorrer la tabla completa.
+
+        Args:
+            query (sqlalchemy.orm.Query): Consulta a contar.
+            exact_limit (int): Máxima cantidad estimada de filas para la cual se
+                realiza un conteo exacto (por defecto: 10000).
+
+        Returns:
+            Tuple[int, bool]: Cantidad de filas y si se trata de una estimación.
+
+        """
+        plan = query.session.execute(Explain(query.order_by(None).statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate > exact_limit:
+            return estimate, True
+        return query.order_by(None).count(), False
+
+    def filter_by_metadata(
+        self,
+        model: Union[Type[Batches], Type[Logs]],
+        metadata: dict,
+        after: int = 0,
+        limit: int = 100,
+    ) -> list:
+        """
+        Busca registros cuya metadata contenga un objeto JSON.
+
+        La búsqueda utiliza el operador de contención de JSONB (@>), que se resuelve
+        con el índice GIN de la columna `json`. Los resultados se paginan por id.
+
+        Args:
+            model (Union[Type[Batches], Type[Logs]]): Tabla en la que buscar.
+            metadata (dict): Objeto JSON que debe estar contenido en la metadata.
+            after (int): Último id de la página anterior (por defecto: 0).
+            limit (int): Tamaño de la página (por defecto: 100).
+
+        Returns:
+            list: Registros encontrados, ordenados por id.
+
+        """
+        return (
+            self.read_session.query(model)
+            .filter(model.json.contains(metadata), model.id > after)
+            .order_by(model.id)
+            .limit(limit)
+            .all()
+        )
+
+    def list_batch_layers(self, ids: Union[int, List[int]]) -> list:
+        """
+        Obtiene los nombres de las capas a las que pertenecen una serie de batches.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de batches.
+
+        Returns:
+            list: Lista de nombres de capas.
+
+        """
+        if isinstance(ids, int):
+            ids = [ids]
+        with self.engine.connect() as connection:
+            return [
+                row[0]
+                for row in connection.execute(
+                    sqlalchemy.text(
+                        f"""
+                        SELECT DISTINCT la.name
+                        FROM {self.relation('layers')} AS la
+                            JOIN {self.relation('batches')} AS ba ON la.id = ba.layer_id
+                        WHERE ba.id = ANY(:ids)
+                        """
+                    ),
+                    {"ids": ids},
+                )
+            ]
+
+    def list_geometry_layers(self, ids: Union[int, List[int]]) -> list:
+        """
+        Obtiene los nombres de las capas a las que pertenecen una serie de geometrías.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de geometrías.
+
+        Returns:
+            list: Lista de nombres de capas.
+
+        """
+        if isinstance(ids, int):
+            ids = [ids]
+        with self.engine.connect() as connection:
+            return [
+                row[0]
+                for row in connection.execute(
+                    sqlalchemy.text(
+                        f"""
+                        SELECT DISTINCT la.name
+                        FROM {self.relation('layers')} AS la
+                            JOIN {self.relation('batches')} AS ba ON la.id = ba.layer_id
+                            JOIN {self.relation('geometries')} AS ge ON ba.id = ge.batch_id
+                        WHERE ge.id = ANY(:ids)
+                        """
+                    ),
+                    {"ids": ids},
+                )
+            ]
+
+    def batch_extents(self, ids: Union[int, List[int]], srids: List[int]) -> dict:
+        """
+        Obtiene la extensión de las geometrías de una serie de batches, por capa.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de batches.
+            srids (List[int]): SRIDs en los que se expresa cada extensión.
+
+        Returns:
+            dict: Extensión por capa y SRID, con las claves "minx", "miny", "maxx" y
+                "maxy". Las capas sin geometrías se omiten.
+
+        """
+        return self._extents(column="ba.id", ids=ids, srids=srids)
+
+    def geometry_extents(self, ids: Union[int, List[int]], srids: List[int]) -> dict:
+        """
+        Obtiene la extensión de una serie de geometrías, por capa.
+
+        Args:
+            ids (Union[int, List[int]]): ID o lista de IDs de geometrías.
+            srids (List[int]): SRIDs en los que se expresa cada extensión.
+
+        Returns:
+            dict: Extensión por capa y SRID, con las claves "minx", "miny", "maxx" y
+                "maxy".
+
+        """
+        return self._extents(column="ge.id", ids=ids, srids=srids)
+
+    def _extents(
+        self, column: str, ids: Union[int, List[int]], srids: List[int]
+    ) -> dict:
+        if isinstance(ids, int):
+            ids = [ids]
+        extents = {}
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    WITH extents AS (
+                        SELECT
+                            la.name AS layer,
+                            ST_SetSRID(ST_Extent(ge.geometry)::geometry, :srid) AS extent
+                        FROM {self.relation('layers')} AS la
+                            JOIN {self.relation('batches')} AS ba ON la.id = ba.layer_id
+                            JOIN {self.relation('geometries')} AS ge ON ba.id = ge.batch_id
+                        WHERE {column} = ANY(:ids)
+                        GROUP BY la.name
+                    )
+                    SELECT
+                        layer,
+                        srid,
+                        ST_XMin(box),
+                        ST_YMin(box),
+                        ST_XMax(box),
+                        ST_YMax(box)
+                    FROM extents
+                        CROSS JOIN unnest(CAST(:srids AS integer[])) AS srid
+                        CROSS JOIN LATERAL (
+                            SELECT Box2D(ST_Transform(extent, srid)) AS box
+                        ) AS transformed
+                    """
+                ),
+                {"ids": ids, "srids": list(srids), "srid": self.coordsysid},
+            )
+            for layer, srid, minx, miny, maxx, maxy in rows:
+                extents.setdefault(layer, {})[srid] = {
+                    "minx": minx,
+                    "miny": miny,
+                    "maxx": maxx,
+                    "maxy": maxy,
+                }
+        return extents
+
+    # Partición que recibe los logs de los meses sin partición propia (ej: si la
+    # tarea de mantenimiento no se ejecutó a tiempo), para no rechazar inserciones.
+    LOG_DEFAULT_PARTITION = "logs_default"
+
+    @staticmethod
+    def log_partition_name(month: date) -> str:
+        return f"logs_{month:%Y_%m}"
+
+    def create_log_partitions(
+        self,
+        since: Optional[date] = None,
+        months_ahead: int = int(getattr(settings, "LOGS_PARTITIONS_AHEAD", 3)),
+        connection: Optional[sqlalchemy.engine.Connection] = None,
+    ) -> List[str]:
+        """
+        Crea las particiones mensuales de logs que falten, desde el mes de `since`
+        hasta `months_ahead` meses posteriores al actual.
+
+        Los logs del mes que hayan quedado en la partición por defecto se mueven a la
+        nueva partición antes de vincularla, ya que PostgreSQL no permite crear una
+        partición cuyo rango tenga filas en la partición por defecto.
+
+        Args:
+            since (Optional[date]): Fecha del primer mes a crear (por defecto: hoy).
+            months_ahead (int): Cantidad de meses futuros a crear por adelantado
+                (por defecto: 3).
+            connection (Optional[Connection]): Conexión con una transacción abierta
+                (ej: la de una migración de Alembic). Si no se proporciona, se abre una.
+
+        Returns:
+            List[str]: Nombres de las particiones creadas.
+
+        """
+        self.pin()
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self.create_log_partitions(
+                    since=since, months_ahead=months_ahead, connection=connection
+                )
+        month = add_months(since or date.today(), 0)
+        until = add_months(date.today(), months_ahead)
+        default = sqlalchemy.inspect(connection).has_table(
+            self.LOG_DEFAULT_PARTITION, schema=self.schema
+        )
+        created = []
+        while month <= until:
+            name = self.log_partition_name(month)
+            if not sqlalchemy.inspect(connection).has_table(name, schema=self.schema):
+                bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+                if default:
+                    connection.execute(
+                        sqlalchemy.text(
+                            f"""
+                            CREATE TABLE {self.relation(name)}
+                            (LIKE {self.relation('logs')} INCLUDING DEFAULTS)
+                            """
+                        )
+                    )
+                    connection.execute(
+                        sqlalchemy.text(
+                            f"""
+                            WITH moved AS (
+                                DELETE FROM {self.relation(self.LOG_DEFAULT_PARTITION)}
+                                WHERE created_at >= :starts_at
+                                AND created_at < :ends_at
+                                RETURNING *
+                            )
+                            INSERT INTO {self.relation(name)} SELECT * FROM moved
+                            """
+                        ),
+                        {"starts_at": month, "ends_at": add_months(month, 1)},
+                    )
+                    connection.execute(
+                        sqlalchemy.text(
+                            f"""
+                            ALTER TABLE {self.relation('logs')}
+                            ATTACH PARTITION {self.relation(name)} FOR VALUES {bounds}
+                            """
+                        )
+                    )
+                else:
+                    connection.execute(
+                        sqlalchemy.text(
+                            f"""
+                            CREATE TABLE {self.relation(name)}
+                            PARTITION OF {self.relation('logs')}
+                            FOR VALUES {bounds}
+                            """
+                        )
+                    )
+                created.append(name)
+            connection.execute(
+                sqlalchemy.text(
+                    f"""
+                    INSERT INTO {self.relation('log_partitions')} (name, starts_at, ends_at)
+                    VALUES (:name, :starts_at, :ends_at)
+                    ON CONFLICT (name) DO NOTHING
+                    """
+                ),
+                {"name": name, "starts_at": month, "ends_at": add_months(month, 1)},
+            )
+            month = add_months(month, 1)
+        return created
+
+    def register_log_partitions(
+        self, connection: Optional[sqlalchemy.engine.Connection] = None
+    ) -> None:
+        """
+        Registra el primer ID de log de cada partición iniciada que aún no lo tenga.
+
+        Args:
+            connection (Optional[Connection]): Conexión con una transacción abierta.
+                Si no se proporciona, se abre una.
+
+        """
+        self.pin()
+        if connection is None:
+            with self.engine.begin() as connection:
+                return self.register_log_partitions(connection=connection)
+        connection.execute(
+            sqlalchemy.text(
+                f"""
+                UPDATE {self.relation('log_partitions')} AS lp
+                SET first_id = (
+                    SELECT min(lo.id) FROM {self.relation('logs')} AS lo
+                    WHERE lo.created_at >= lp.starts_at
+                    AND lo.created_at < lp.ends_at
+                ),
+                updated_at = now()
+                WHERE lp.first_id IS NULL
+                AND lp.archive IS NULL
+                AND lp.starts_at <= now()
+                """
+            )
+        )
+
+    def archive_log_partitions(
+        self,
+        retention_months: int = int(getattr(settings, "LOGS_RETENTION_MONTHS", 12)),
+        archive_dir: str = getattr(
+            settings,
+            "LOGS_ARCHIVE_DIR",
+            os.path.join(getattr(settings, "TEMP_BASE", "/tmp"), "logs"),
+        ),
+    ) -> List[str]:
+        """
+        Archiva las particiones de logs anteriores al período de retención.
+
+        Cada partición se vuelca a un archivo CSV comprimido (`<partición>.csv.gz`)
+        dentro de `archive_dir` y luego se desvincula de la tabla y se elimina. Su
+        registro en `log_partitions` se conserva con la ruta del archivo.
+
+        Args:
+            retention_months (int): Cantidad de meses completos a conservar, además
+                del actual (por defecto: 12).
+            archive_dir (str): Directorio en el que se guardan los archivos.
+
+        Returns:
+            List[str]: Rutas de los archivos generados.
+
+        """
+        self.pin()
+        cutoff = add_months(date.today(), -retention_months)
+        partitions = (
+            self.session.query(LogPartitions)
+            .filter(LogPartitions.ends_at <= cutoff, LogPartitions.archive.is_(None))
+            .order_by(LogPartitions.starts_at)
+            .all()
+        )
+        os.makedirs(archive_dir, exist_ok=True)
+        archives = []
+        for partition in partitions:
+            path = os.path.join(archive_dir, f"{partition.name}.csv.gz")
+            handle, temp_path = tempfile.mkstemp(dir=archive_dir)
+            connection = self.engine.raw_connection()
+            try:
+                with os.fdopen(handle, "wb") as writer:
+                    with gzip.GzipFile(fileobj=writer, mode="wb") as compressed:
+                        connection.cursor().copy_expert(
+                            f"COPY {self.relation(partition.name)} "
+                            "TO STDOUT WITH (FORMAT csv, HEADER)",
+                            compressed,
+                        )
+                os.replace(temp_path, path)
+            finally:
+                connection.close()
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            with self.engine.begin() as transaction:
+                transaction.execute(
+                    sqlalchemy.text(
+                        f"""
+                        ALTER TABLE {self.relation('logs')}
+                        DETACH PARTITION {self.relation(partition.name)}
+                        """
+                    )
+                )
+                transaction.execute(
+                    sqlalchemy.text(f"DROP TABLE {self.relation(partition.name)}")
+                )
+            partition.archive = path
+            self.session.commit()
+            archives.append(path)
+        return archives
+
+    def maintain_log_partitions(self) -> dict:
+        """
+        Mantenimiento periódico de las particiones de logs: crea las particiones
+        futuras (y las de los meses con logs en la partición por defecto), registra el
+        primer ID de las iniciadas y archiva las vencidas.
+
+        Returns:
+            dict: Particiones creadas y archivos generados.
+
+        """
+        since = None
+        if self.LOG_DEFAULT_PARTITION in self.list_tables():
+            with self.engine.connect() as connection:
+                since = connection.execute(
+                    sqlalchemy.text(
+                        f"""
+                        SELECT min(created_at)::date
+                        FROM {self.relation(self.LOG_DEFAULT_PARTITION)}
+                        """
+                    )
+                ).scalar()
+        created = self.create_log_partitions(
+            since=min(since, date.today()) if since else None
+        )
+        self.register_log_partitions()
+        archived = self.archive_log_partitions()
+        return {"created": created, "archived": archived}
+
+    def log_partition_window(
+        self, id: int, session: Optional[sqlalchemy.orm.Session] = None
+    ) -> Optional[Tuple[date, date]]:
+        """
+        Estima el rango de `created_at` de un log a partir de su ID.
+
+        Args:
+            id (int): ID del log.
+            session (Optional[Session]): Sesión a utilizar (por defecto: la principal).
+
+        Returns:
+            Optional[Tuple[date, date]]: Inicio y fin del mes de la partición que
+                contiene al ID, o None si no puede determinarse.
+
+        """
+        partition = (
+            (session or self.session)
+            .query(LogPartitions.starts_at, LogPartitions.ends_at)
+            .filter(LogPartitions.first_id <= id, LogPartitions.archive.is_(None))
+            .order_by(LogPartitions.first_id.desc())
+            .first()
+        )
+        return tuple(partition) if partition else None
+
+    def get_log(
+        self, id: Union[int, Logs], session: Optional[sqlalchemy.orm.Session] = None
+    ) -> Logs:
+        """
+        Obtiene un log por su ID.
+
+        Si es posible, la búsqueda se acota al mes de la partición que contiene al ID
+        para que PostgreSQL descarte el resto de las particiones. Como el ID y la fecha
+        de creación pueden no coincidir en el límite entre meses, si el log no se
+        encuentra en ese rango se busca en todas las particiones.
+
+        Args:
+            id (Union[int, Logs]): ID del log o un objeto Logs.
+            session (Optional[Session]): Sesión a utilizar (por defecto: la principal,
+                que es la que utilizan los procesos para actualizar su propio log).
+
+        Returns:
+            Logs: Log correspondiente, o None si no existe.
+
+        """
+        if not isinstance(id, int):
+            return id
+        session = session or self.session
+        query = session.query(Logs).filter(Logs.id == id)
+        window = self.log_partition_window(id, session=session)
+        if window:
+            log = query.filter(
+                Logs.created_at >= window[0], Logs.created_at < window[1]
+            ).first()
+            if log:
+                return log
+        return query.first()
+
+    def get_log_record(self, id: int) -> dict:
+        """
+        Obtiene el registro de un registro de registro de la base de datos.
+
+        La lectura se resuelve en una réplica si hay alguna disponible.
+
+        Args:
+            id (int): ID del registro.
+
+        Returns:
+            dict: Registro correspondiente al ID proporcionado.
+        """
+        return getattr(self.get_log(id=id, session=self.read_session), "record", None)
+
+    def get_last_log_record(
+        self, endpoint: str, finished: bool = True
+    ) -> Optional[dict]:
+        """
+        Obtiene el registro del último proceso de un endpoint.
+
+        La lectura se resuelve en una réplica si hay alguna disponible.
+
+        Args:
+            endpoint (str): Endpoint del proceso.
+            finished (bool): Omite los procesos recibidos o en curso (estados 200 y
+                205) (por defecto: True).
+
+        Returns:
+            Optional[dict]: Registro del proceso, con su ID, o None si no hay ninguno.
+        """
+        query = self.read_session.query(Logs).filter(Logs.endpoint == endpoint)
+        if finished:
+            query = query.filter(Logs.status.notin_([200, 205]))
+        log = query.order_by(Logs.id.desc()).first()
+        return {"id": log.id, **log.record} if log else None
+
+    def get_batch(
+        self,
+        id: Union[int, Batches],
+        session: Optional[sqlalchemy.orm.Session] = None,
+    ) -> Batches:
+        if not isinstance(id, int):
+            return id
+        return (session or self.session).query(Batches).get(id)
+
+    def get_batch_record(self, id: int) -> dict:
+        """
+        Obtiene el registro de un registro de batch de la base de datos.
+
+        Args:
+            id (int): ID del batch.
+
+        Returns:
+            dict: Registro correspondiente al ID proporcionado.
+        """
+        return getattr(self.get_batch(id=id, session=self.read_session), "record", None)
+
+    def get_batch_geometries(
+        self, id: int, after: int = 0, limit: int = 100
+    ) -> Optional[dict]:
+        """
+        Obtiene una página de los IDs de geometrías de un batch.
+
+        Args:
+            id (int): ID del batch.
+            after (int): Último id de la página anterior.
+            limit (int): Tamaño de la página.
+
+        Returns:
+            Optional[dict]: IDs de geometrías y el id a utilizar para la página
+                siguiente, o None si el batch no existe.
+        """
+        batch = self.get_batch(id=id, session=self.read_session)
+        if batch is None:
+            return None
+        ids = batch.geometry_ids(after=after, limit=limit)
+        return {
+            "batch": id,
+            "geometries": ids,
+            "next": ids[-1] if len(ids) == limit else None,
+        }
+
+    def get_layer(
+        self, id: Optional[int] = None, name: Optional[str] = None
+    ) -> Optional[Layers]:
+        """
+        Devuelve el objeto de una capa existente.
+
+        Args:
+            id (int, opcional): ID de la capa a buscar.
+            name (str, opcional): Nombre de la capa a buscar.
+
+        Returns:
+            Layers o None: Objeto de la capa si se encuentra,
+                o None si no se encuentra ninguna coincidencia.
+        """
+        if id:
+            return self.session.query(Layers).get(id) if isinstance(id, int) else id
+        elif name:
+            return self.session.query(Layers).filter_by(name=name).first()
+        else:
+            return None
+
+    def get_or_create_layer(
+        self, id: Optional[int] = None, name: Optional[str] = None
+    ) -> Layers:
         """
         Devuelve el objeto de una capa existente o la crea en caso de no existir.
 
@@ -556,3 +2548,17 @@ class PostGIS:
             Layers: Objeto de la capa existente o recién creada.
         """
         return self.get_layer(id=id, name=name) or Layers(name=name)
+
+
+def _dispose_inherited_engines() -> None:
+    """
+    Descarta, sin cerrarlas, las conexiones de los motores heredados del proceso padre
+    al crear un proceso con fork, para que el hijo no las utilice ni las cierre.
+    """
+    for key, engine in list(PostGIS._engines.items()):
+        if key[0] != os.getpid():
+            engine.dispose(close=False)
+            del PostGIS._engines[key]
+
+
+os.register_at_fork(after_in_child=_dispose_inherited_engines)